@@ -0,0 +1,75 @@
+"""
+Provide shared helpers for benchmark timing, reporting and baseline comparison.
+"""
+
+import json
+import math
+import platform
+import time
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from pathlib import Path
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    errors: int
+    ops_per_second: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of already sorted values using the nearest-rank method."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(name: str, durations: list[float], elapsed: float, errors: int = 0) -> BenchmarkResult:
+    """
+    Build a result from per-operation durations and the wall-clock time of the whole run, both in seconds.
+    """
+    durations_ms = sorted(duration * 1000 for duration in durations)
+    return BenchmarkResult(
+        name=name,
+        iterations=len(durations),
+        errors=errors,
+        ops_per_second=round(len(durations) / elapsed, 2) if elapsed else 0.0,
+        mean_ms=round(sum(durations_ms) / len(durations_ms), 4) if durations_ms else 0.0,
+        p50_ms=round(percentile(durations_ms, 50), 4),
+        p95_ms=round(percentile(durations_ms, 95), 4),
+        p99_ms=round(percentile(durations_ms, 99), 4),
+    )
+
+
+def write_report(suite: str, results: list[BenchmarkResult], output: str | None) -> dict:
+    report = {
+        'suite': suite,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': [asdict(result) for result in results],
+    }
+    content = json.dumps(report, indent=2)
+    if output:
+        Path(output).write_text(content + '\n')
+    else:
+        print(content)
+    return report
+
+
+def print_table(results: list[BenchmarkResult]) -> None:
+    print(f'{"benchmark":<40} {"ops/s":>12} {"p50 ms":>10} {"p95 ms":>10} {"p99 ms":>10} {"errors":>7}')
+    for result in results:
+        print(
+            f'{result.name:<40} {result.ops_per_second:>12.2f} {result.p50_ms:>10.4f} '
+            f'{result.p95_ms:>10.4f} {result.p99_ms:>10.4f} {result.errors:>7}'
+        )
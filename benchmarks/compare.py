@@ -0,0 +1,63 @@
+"""
+Compare a benchmark report against a saved baseline.
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json [--threshold 0.1]
+
+Exits with status 1 if any benchmark's throughput dropped, or its p50/p99 latency grew, by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# (metric, True if higher is better)
+METRICS = (
+    ('ops_per_second', True),
+    ('p50_ms', False),
+    ('p99_ms', False),
+)
+
+
+def load_results(path: str) -> dict[str, dict]:
+    report = json.loads(Path(path).read_text())
+    return {result['name']: result for result in report['results']}
+
+
+def compare(baseline: dict[str, dict], current: dict[str, dict], threshold: float) -> list[str]:
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f'{name:<40} new benchmark')
+            continue
+
+        for metric, higher_is_better in METRICS:
+            if not base[metric]:
+                continue
+            change = (result[metric] - base[metric]) / base[metric]
+            regressed = change < -threshold if higher_is_better else change > threshold
+            marker = ' REGRESSION' if regressed else ''
+            print(f'{name:<40} {metric:<15} {base[metric]:>12.4f} -> {result[metric]:>12.4f} ({change:+.1%}){marker}')
+            if regressed:
+                regressions.append(f'{name}.{metric}')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare a benchmark report against a baseline.')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Allowed relative change, 0.1 means 10%%.')
+    args = parser.parse_args()
+
+    regressions = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+    if regressions:
+        print(f'\n{len(regressions)} regression(s): {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Micro-benchmarks for the CPU-bound building blocks of the auth endpoints.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.micro [--iterations 10000] [--output micro.json]
+"""
+
+import argparse
+import secrets
+import time
+import uuid
+from datetime import datetime
+from typing import Callable
+
+from benchmarks.common import (
+    BenchmarkResult,
+    print_table,
+    summarize,
+    write_report,
+)
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from auth_service.core.responses import PydanticJSONResponse
+from auth_service.core.security import (
+    access_token_cache,
+    create_access_token,
+    create_hash,
+    decode_access_token,
+    hash_password,
+    verify_password,
+)
+from auth_service.models import User
+from auth_service.schemas.custom_types import (
+    PasswordStr,
+    PhoneStr,
+)
+from auth_service.schemas.dto.auth import TokenPairDTO
+from auth_service.schemas.http.auth import TokenPairSchema
+from auth_service.schemas.http.users import UserSchema
+from auth_service.services.opaque_access_tokens import (
+    OPAQUE_ACCESS_TOKEN_PREFIX,
+    OpaqueAccessTokenStore,
+)
+
+PASSWORD = 'Pwd12345!'
+# bcrypt is orders of magnitude slower than everything else, so it gets far fewer iterations.
+HASHING_ITERATIONS = 20
+
+
+def measure(name: str, func: Callable[[], object], iterations: int, setup: Callable[[], None] | None = None):
+    durations = []
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        started_at = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started_at)
+    # Setup is excluded, so throughput is derived from the measured calls only.
+    return summarize(name, durations, elapsed=sum(durations))
+
+
+def render_with_response_model(model: type[BaseModel], content: dict | BaseModel) -> bytes:
+    """
+    Render a response the way FastAPI does for a `response_model` route.
+
+    The content is validated against the model, dumped to JSON-able data and serialized with `json.dumps`.
+    """
+    validated = model.model_validate(content)
+    return JSONResponse(validated.model_dump(mode='json')).body
+
+
+def make_opaque_access_token(user_id: uuid.UUID) -> tuple[OpaqueAccessTokenStore, str]:
+    """Put an opaque token into a fresh token table the way a committed sign-in does, without the database."""
+    store = OpaqueAccessTokenStore(enabled=True, shards=16, maxsize=100_000)
+    token = OPAQUE_ACCESS_TOKEN_PREFIX + secrets.token_urlsafe(32)
+    claims = decode_access_token(create_access_token(user_id=user_id))
+    store.add(token, claims)
+    return store, token
+
+
+def run(iterations: int) -> list[BenchmarkResult]:
+    user_id = uuid.uuid4()
+    access_token = create_access_token(user_id=user_id)
+    hashed_password = hash_password(PASSWORD)
+    now = datetime.now()
+    user = User(
+        id=user_id,
+        first_name='John',
+        last_name='Wilson',
+        phone='48547475446',
+        hashed_password=hashed_password,
+        is_active=True,
+        is_phone_verified=False,
+        created_at=now,
+        updated_at=now,
+    )
+    user_schema = UserSchema.model_validate(user)
+    token_pair = TokenPairDTO(access_token=access_token, refresh_token=uuid.uuid4().hex)
+    opaque_token_store, opaque_access_token = make_opaque_access_token(user_id)
+
+    return [
+        measure('create_access_token', lambda: create_access_token(user_id=user_id), iterations),
+        measure(
+            'decode_access_token.uncached',
+            lambda: decode_access_token(access_token),
+            iterations,
+            setup=access_token_cache.clear,
+        ),
+        measure('decode_access_token.cached', lambda: decode_access_token(access_token), iterations),
+        measure(
+            'opaque_access_token.create',
+            lambda: create_hash(OPAQUE_ACCESS_TOKEN_PREFIX + secrets.token_urlsafe(32)),
+            iterations,
+        ),
+        measure('opaque_access_token.lookup', lambda: opaque_token_store.lookup(opaque_access_token), iterations),
+        measure('hash_password', lambda: hash_password(PASSWORD), HASHING_ITERATIONS),
+        measure('verify_password', lambda: verify_password(PASSWORD, hashed_password), HASHING_ITERATIONS),
+        measure('PhoneStr._validate', lambda: PhoneStr._validate('+48 (071) 555-55-55'), iterations),
+        measure('PasswordStr._validate', lambda: PasswordStr._validate(PASSWORD), iterations),
+        measure('UserSchema.from_orm_to_json', lambda: UserSchema.model_validate(user).model_dump_json(), iterations),
+        measure('UserSchema.to_json', user_schema.model_dump_json, iterations),
+        measure(
+            'UserSchema.response.json_dumps',
+            lambda: render_with_response_model(UserSchema, user_schema),
+            iterations,
+        ),
+        measure('UserSchema.response.pydantic_core', lambda: PydanticJSONResponse(user_schema).body, iterations),
+        measure(
+            'TokenPairSchema.response.json_dumps',
+            # sign-in used to dump the pair to a dict, which FastAPI then validated against the response model.
+            lambda: render_with_response_model(TokenPairSchema, token_pair.model_dump()),
+            iterations,
+        ),
+        measure(
+            'TokenPairSchema.response.pydantic_core',
+            lambda: PydanticJSONResponse(
+                TokenPairSchema.model_construct(
+                    access_token=token_pair.access_token,
+                    refresh_token=token_pair.refresh_token,
+                )
+            ).body,
+            iterations,
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run micro-benchmarks.')
+    parser.add_argument('--iterations', type=int, default=10_000)
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    write_report('micro', results, args.output)
+    if args.output:
+        print_table(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Scenario load tests that drive the auth endpoints through the ASGI app against a local Postgres.
+
+The database from the regular settings (`POSTGRES_*` variables) must be migrated. Every run registers its users under a
+random phone prefix and deletes them afterwards.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.scenarios [--requests 200] [--concurrency 20] [--access-token-mode opaque]
+        [--output scenarios.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from typing import (
+    Awaitable,
+    Callable,
+)
+
+import httpx
+from benchmarks.common import (
+    BenchmarkResult,
+    print_table,
+    summarize,
+    write_report,
+)
+from sqlalchemy import delete
+
+from auth_service.core.config import settings
+from auth_service.core.database import async_engine
+from auth_service.core.security import password_hash_executor
+from auth_service.main import application
+from auth_service.models import User
+from auth_service.services.opaque_access_tokens import opaque_access_token_store
+from auth_service.services.sign_in_throttle import sign_in_throttle
+
+PASSWORD = 'Pwd12345!'
+
+
+async def run_scenario(
+    name: str,
+    requests: int,
+    concurrency: int,
+    make_request: Callable[[int], Awaitable[httpx.Response]],
+) -> BenchmarkResult:
+    """
+    Send `requests` requests from `concurrency` concurrent workers; the i-th request is built by `make_request(i)`.
+    """
+    durations: list[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker() -> None:
+        nonlocal errors
+        while (i := next(counter)) < requests:
+            started_at = time.perf_counter()
+            try:
+                response = await make_request(i)
+                failed = not response.is_success
+            except Exception:  # noqa: B902
+                failed = True
+            durations.append(time.perf_counter() - started_at)
+            errors += failed
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(name, durations, elapsed=time.perf_counter() - started_at, errors=errors)
+
+
+async def run(requests: int, concurrency: int, access_token_mode: str) -> list[BenchmarkResult]:
+    # Every request comes from the same client address, which the per-IP sign-in limit would reject.
+    sign_in_throttle.enabled = False
+    opaque_access_token_store.enabled = access_token_mode == 'opaque'
+    phone_prefix = f'97{random.randint(0, 9999):04d}'
+    phones = [f'{phone_prefix}{i:06d}' for i in range(requests)]
+    token_pairs: list[dict] = [{} for _ in range(requests)]
+    refreshed_token_pairs: list[dict] = [{} for _ in range(requests)]
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=application), base_url='http://benchmark') as client:
+
+        async def sign_up(i: int) -> httpx.Response:
+            return await client.post(
+                '/api/v1/sign-up',
+                json={'first_name': 'Bench', 'last_name': 'User', 'phone': phones[i], 'password': PASSWORD},
+            )
+
+        async def sign_in(i: int) -> httpx.Response:
+            response = await client.post('/api/v1/sign-in', json={'phone': phones[i], 'password': PASSWORD})
+            token_pairs[i] = response.json()
+            return response
+
+        async def me(i: int) -> httpx.Response:
+            access_token = token_pairs[i].get('access_token')
+            return await client.get('/api/v1/me', headers={'Authorization': f'Bearer {access_token}'})
+
+        async def refresh(i: int) -> httpx.Response:
+            response = await client.post('/api/v1/refresh', json={'refresh_token': token_pairs[i].get('refresh_token')})
+            refreshed_token_pairs[i] = response.json()
+            return response
+
+        async def logout(i: int) -> httpx.Response:
+            refresh_token = refreshed_token_pairs[i].get('refresh_token')
+            return await client.post('/api/v1/logout', json={'refresh_token': refresh_token})
+
+        try:
+            return [
+                await run_scenario('sign-up', requests, concurrency, sign_up),
+                await run_scenario('sign-in', requests, concurrency, sign_in),
+                await run_scenario('me', requests, concurrency, me),
+                await run_scenario('refresh', requests, concurrency, refresh),
+                await run_scenario('logout', requests, concurrency, logout),
+            ]
+        finally:
+            async with async_engine.begin() as connection:
+                await connection.execute(delete(User).where(User.phone.startswith(phone_prefix)))
+            await async_engine.dispose()
+            password_hash_executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run scenario load tests against the ASGI app.')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario.')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument(
+        '--access-token-mode',
+        choices=('jwt', 'opaque'),
+        default=settings.access_token_mode,
+        help='Kind of access tokens issued on sign-in and refresh, and so verified by /me.',
+    )
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests, args.concurrency, args.access_token_mode))
+    write_report('scenarios', results, args.output)
+    if args.output:
+        print_table(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Add refresh_tokens.created_at index
+
+Revision ID: 9b1e7d3a5c21
+Revises: 4c49328e52af
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1e7d3a5c21'
+down_revision = '4c49328e52af'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so the live table keeps accepting writes while the index is created.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_refresh_tokens_created_at'),
+            'refresh_tokens',
+            ['created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_refresh_tokens_created_at'),
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,38 @@
+"""Add opaque_access_tokens
+
+Revision ID: a5c9e3f7b214
+Revises: f4d8a3b6c912
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5c9e3f7b214'
+down_revision = 'f4d8a3b6c912'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'opaque_access_tokens',
+        sa.Column('token_digest', sa.LargeBinary(length=32), nullable=False),
+        sa.Column('jti', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('session_id', sa.UUID(), nullable=True),
+        sa.Column('iat', sa.BigInteger(), nullable=False),
+        sa.Column('exp', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('token_digest'),
+    )
+    op.create_index(op.f('ix_opaque_access_tokens_exp'), 'opaque_access_tokens', ['exp'], unique=False)
+    op.create_index(op.f('ix_opaque_access_tokens_user_id'), 'opaque_access_tokens', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_opaque_access_tokens_user_id'), table_name='opaque_access_tokens')
+    op.drop_index(op.f('ix_opaque_access_tokens_exp'), table_name='opaque_access_tokens')
+    op.drop_table('opaque_access_tokens')
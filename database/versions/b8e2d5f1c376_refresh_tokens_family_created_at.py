@@ -0,0 +1,28 @@
+"""Add refresh_tokens.family_created_at
+
+Revision ID: b8e2d5f1c376
+Revises: a5c9e3f7b214
+Create Date: 2026-10-18 19:00:00.000000
+
+The column is added without a default first, so existing rows stay NULL (their session start is taken from
+`created_at`) instead of all getting the time of the migration; new rows get the default afterwards.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2d5f1c376'
+down_revision = 'a5c9e3f7b214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('family_created_at', sa.DateTime(), nullable=True))
+    op.alter_column('refresh_tokens', 'family_created_at', server_default=sa.text('CURRENT_TIMESTAMP'))
+
+
+def downgrade() -> None:
+    op.drop_column('refresh_tokens', 'family_created_at')
@@ -0,0 +1,70 @@
+"""Store refresh token digests as BYTEA
+
+Revision ID: c3f8a2d4e6b1
+Revises: 9b1e7d3a5c21
+Create Date: 2026-10-18 13:00:00.000000
+
+Expand step of the hex -> BYTEA migration: adds `token_digest` next to the hex `hashed_token` column and backfills it
+in small batches. The application dual-writes and dual-reads both columns while `REFRESH_TOKEN_LEGACY_DIGEST` is on;
+the contract step (c9f3e6a2d418: dropping `hashed_token`, making `token_digest` NOT NULL) runs once every replica has it
+off.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a2d4e6b1'
+down_revision = '9b1e7d3a5c21'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('token_digest', sa.LargeBinary(length=32), nullable=True))
+    op.alter_column('refresh_tokens', 'hashed_token', existing_type=sa.String(length=128), nullable=True)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_refresh_tokens_token_digest'),
+            'refresh_tokens',
+            ['token_digest'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+        # Every batch commits on its own, so the backfill never holds row locks for long.
+        while True:
+            result = op.get_bind().execute(
+                sa.text(
+                    """
+                    UPDATE refresh_tokens SET token_digest = decode(hashed_token, 'hex')
+                    WHERE id IN (
+                        SELECT id FROM refresh_tokens
+                        WHERE token_digest IS NULL AND hashed_token IS NOT NULL
+                        LIMIT :batch_size
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    """
+                ),
+                {'batch_size': BACKFILL_BATCH_SIZE},
+            )
+            if result.rowcount == 0:
+                break
+
+
+def downgrade() -> None:
+    op.execute("UPDATE refresh_tokens SET hashed_token = encode(token_digest, 'hex') WHERE hashed_token IS NULL")
+    op.alter_column('refresh_tokens', 'hashed_token', existing_type=sa.String(length=128), nullable=False)
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_refresh_tokens_token_digest'),
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+        )
+
+    op.drop_column('refresh_tokens', 'token_digest')
@@ -0,0 +1,59 @@
+"""Drop refresh_tokens.hashed_token
+
+Revision ID: c9f3e6a2d418
+Revises: b8e2d5f1c376
+Create Date: 2026-10-18 20:00:00.000000
+
+Contract step of the hex -> BYTEA migration started in c3f8a2d4e6b1: backfills the digest of rows written since,
+makes `token_digest` NOT NULL and drops `hashed_token` together with its unique index. Replicas running with
+`REFRESH_TOKEN_LEGACY_DIGEST` on still read and write `hashed_token`, so the migration refuses to run while the flag is
+on; flip it off on every replica first.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from auth_service.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f3e6a2d418'
+down_revision = 'b8e2d5f1c376'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    if settings.refresh_token_legacy_digest:
+        raise RuntimeError('Turn REFRESH_TOKEN_LEGACY_DIGEST off on every replica before dropping `hashed_token`')
+
+    with op.get_context().autocommit_block():
+        while True:
+            result = op.get_bind().execute(
+                sa.text(
+                    """
+                    UPDATE refresh_tokens SET token_digest = decode(hashed_token, 'hex')
+                    WHERE id IN (
+                        SELECT id FROM refresh_tokens
+                        WHERE token_digest IS NULL AND hashed_token IS NOT NULL
+                        LIMIT :batch_size
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    """
+                ),
+                {'batch_size': BACKFILL_BATCH_SIZE},
+            )
+            if result.rowcount == 0:
+                break
+
+    op.alter_column('refresh_tokens', 'token_digest', existing_type=sa.LargeBinary(length=32), nullable=False)
+    op.drop_column('refresh_tokens', 'hashed_token')
+
+
+def downgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('hashed_token', sa.String(length=128), nullable=True))
+    op.execute("UPDATE refresh_tokens SET hashed_token = encode(token_digest, 'hex')")
+    op.create_unique_constraint('refresh_tokens_hashed_token_key', 'refresh_tokens', ['hashed_token'])
+    op.alter_column('refresh_tokens', 'token_digest', existing_type=sa.LargeBinary(length=32), nullable=True)
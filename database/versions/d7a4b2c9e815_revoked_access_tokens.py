@@ -0,0 +1,34 @@
+"""Add revoked_access_tokens
+
+Revision ID: d7a4b2c9e815
+Revises: c3f8a2d4e6b1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a4b2c9e815'
+down_revision = 'c3f8a2d4e6b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'revoked_access_tokens',
+        sa.Column('jti', sa.UUID(), nullable=False),
+        sa.Column('exp', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('jti'),
+    )
+    op.create_index(op.f('ix_revoked_access_tokens_exp'), 'revoked_access_tokens', ['exp'], unique=False)
+    op.create_index(op.f('ix_revoked_access_tokens_created_at'), 'revoked_access_tokens', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_revoked_access_tokens_created_at'), table_name='revoked_access_tokens')
+    op.drop_index(op.f('ix_revoked_access_tokens_exp'), table_name='revoked_access_tokens')
+    op.drop_table('revoked_access_tokens')
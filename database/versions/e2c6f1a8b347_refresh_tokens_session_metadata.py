@@ -0,0 +1,30 @@
+"""Add session metadata to refresh_tokens
+
+Revision ID: e2c6f1a8b347
+Revises: d7a4b2c9e815
+Create Date: 2026-10-18 15:00:00.000000
+
+Nullable columns without defaults, so adding them does not rewrite the table.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c6f1a8b347'
+down_revision = 'd7a4b2c9e815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('user_agent', sa.String(length=256), nullable=True))
+    op.add_column('refresh_tokens', sa.Column('ip_address', sa.String(length=45), nullable=True))
+    op.add_column('refresh_tokens', sa.Column('last_used_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('refresh_tokens', 'last_used_at')
+    op.drop_column('refresh_tokens', 'ip_address')
+    op.drop_column('refresh_tokens', 'user_agent')
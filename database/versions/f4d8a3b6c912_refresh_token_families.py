@@ -0,0 +1,54 @@
+"""Add refresh token families and rotated token tombstones
+
+Revision ID: f4d8a3b6c912
+Revises: e2c6f1a8b347
+Create Date: 2026-10-18 16:00:00.000000
+
+`family_id` is left NULL on existing rows, which are treated as their own family, so nothing is backfilled.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4d8a3b6c912'
+down_revision = 'e2c6f1a8b347'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('family_id', sa.UUID(), nullable=True))
+    op.create_table(
+        'rotated_refresh_tokens',
+        sa.Column('digest_prefix', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('family_id', sa.UUID(), nullable=False),
+        sa.Column('rotated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('digest_prefix'),
+    )
+    op.create_index(
+        op.f('ix_rotated_refresh_tokens_rotated_at'), 'rotated_refresh_tokens', ['rotated_at'], unique=False
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_refresh_tokens_family_id'),
+            'refresh_tokens',
+            ['family_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_refresh_tokens_family_id'),
+            table_name='refresh_tokens',
+            postgresql_concurrently=True,
+        )
+
+    op.drop_index(op.f('ix_rotated_refresh_tokens_rotated_at'), table_name='rotated_refresh_tokens')
+    op.drop_table('rotated_refresh_tokens')
+    op.drop_column('refresh_tokens', 'family_id')
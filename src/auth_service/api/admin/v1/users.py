@@ -0,0 +1,74 @@
+import tempfile
+from typing import (
+    Annotated,
+    AsyncIterator,
+    Literal,
+)
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Request,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth_service.api.dependencies import require_admin
+from auth_service.core.database import (
+    UnitOfWork,
+    get_database_session,
+)
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.services.phone_filter import (
+    PhoneFilter,
+    get_phone_filter,
+)
+from auth_service.services.sign_in_negative_cache import (
+    SignInNegativeCache,
+    get_sign_in_negative_cache,
+)
+from auth_service.services.user_import import (
+    UserImportService,
+    iter_lines,
+    read_chunks,
+)
+
+router = APIRouter(prefix='/users', tags=['Admin'], dependencies=[Depends(require_admin)])
+
+# Bodies up to this size are buffered in memory, larger ones in a temporary file.
+IMPORT_BODY_MEMORY_SIZE = 8 * 1024 * 1024
+
+
+@router.post('/import', response_class=StreamingResponse)
+async def import_users(
+    request: Request,
+    # Request scope keeps the session open while the report is streamed, i.e. for the whole import.
+    session: Annotated[AsyncSession, Depends(get_database_session, scope='request')],
+    phone_filter: Annotated[PhoneFilter, Depends(get_phone_filter)],
+    negative_cache: Annotated[SignInNegativeCache, Depends(get_sign_in_negative_cache)],
+    file_format: Literal['csv', 'jsonl'] = 'csv',
+):
+    """
+    Import users from a CSV or JSONL request body and stream the report as JSON lines while the import runs.
+
+    Every failed row is reported as soon as it is known, and the `imported`/`failed` totals after every committed
+    chunk; the last line is the final report. The body is received in full first, since the server stops reading the
+    request once the response has started.
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=IMPORT_BODY_MEMORY_SIZE)
+    async for chunk in request.stream():
+        body.write(chunk)
+    body.seek(0)
+
+    service = UserImportService(
+        auth_repository=AuthRepository(unit_of_work=UnitOfWork(session=session)),
+        phone_filter=phone_filter,
+        negative_cache=negative_cache,
+    )
+
+    async def report() -> AsyncIterator[str]:
+        with body:
+            async for item in service.import_users(lines=iter_lines(read_chunks(body)), file_format=file_format):
+                yield item.model_dump_json() + '\n'
+
+    return StreamingResponse(report(), media_type='application/x-ndjson')
@@ -1,3 +1,4 @@
+import secrets
 import uuid
 from typing import Annotated
 
@@ -12,12 +13,23 @@ from fastapi.security import (
     HTTPBearer,
 )
 
-from auth_service.core.security import decode_access_token
+from auth_service.core.config import settings
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.schemas.dto.auth import JwtSchema
+from auth_service.services.opaque_access_tokens import (
+    OpaqueAccessTokenStore,
+    get_opaque_access_token_store,
+)
+from auth_service.services.session_activity import session_activity
 
 security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user_id(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]) -> uuid.UUID:
+async def get_access_token(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    token_store: Annotated[OpaqueAccessTokenStore, Depends(get_opaque_access_token_store)],
+    auth_repository: Annotated[AuthRepository, Depends()],
+) -> JwtSchema:
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -26,9 +38,49 @@ async def get_current_user_id(credentials: Annotated[HTTPAuthorizationCredential
 
     auth_token = credentials.credentials
     try:
-        jwt_token = decode_access_token(token=auth_token)
-        return jwt_token.sub
+        jwt_token = await token_store.decode(auth_token, repo=auth_repository)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token expired')
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid token')
+
+    if jwt_token.sid is not None:
+        session_activity.touch(jwt_token.sid)
+    return jwt_token
+
+
+async def get_current_user_id(access_token: Annotated[JwtSchema, Depends(get_access_token)]) -> uuid.UUID:
+    return access_token.sub
+
+
+async def get_optional_access_token(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    token_store: Annotated[OpaqueAccessTokenStore, Depends(get_opaque_access_token_store)],
+    auth_repository: Annotated[AuthRepository, Depends()],
+) -> JwtSchema | None:
+    """Return the verified access token, or None if there is no valid one."""
+    if credentials is None:
+        return None
+
+    try:
+        return await token_store.decode(credentials.credentials, repo=auth_repository)
+    except jwt.InvalidTokenError:
+        return None
+
+
+def _require_api_token(credentials: HTTPAuthorizationCredentials | None, api_token: str) -> None:
+    """Let only callers presenting `api_token` through; with no token configured the endpoint does not exist."""
+    if not api_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Not Found')
+    if credentials is None or not secrets.compare_digest(credentials.credentials, api_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Forbidden')
+
+
+async def require_admin(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]) -> None:
+    _require_api_token(credentials, settings.admin_api_token)
+
+
+async def require_introspection_client(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+) -> None:
+    _require_api_token(credentials, settings.introspection_api_token)
@@ -0,0 +1,23 @@
+"""
+Provide implementation of the metrics controller.
+"""
+
+from fastapi import (
+    APIRouter,
+    Response,
+)
+
+from auth_service.core.metrics import (
+    metrics_directory,
+    registry,
+)
+
+router = APIRouter(prefix='/metrics', tags=['Metrics'], include_in_schema=False)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@router.get('')
+async def metrics() -> Response:
+    content = metrics_directory.render() if metrics_directory is not None else registry.render()
+    return Response(content=content, media_type=CONTENT_TYPE)
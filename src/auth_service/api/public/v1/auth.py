@@ -4,12 +4,25 @@ from typing import Annotated
 from fastapi import (
     APIRouter,
     Depends,
+    Request,
+    Response,
     status,
 )
 
-from auth_service.api.dependencies import get_current_user_id
+from auth_service.api.dependencies import (
+    get_current_user_id,
+    get_optional_access_token,
+    require_introspection_client,
+)
+from auth_service.core.responses import PydanticJSONResponse
+from auth_service.schemas.dto.auth import (
+    JwtSchema,
+    TokenPairDTO,
+)
 from auth_service.schemas.dto.users import UserCreateDTO
 from auth_service.schemas.http.auth import (
+    IntrospectRequestSchema,
+    IntrospectResponseSchema,
     LogoutRequestSchema,
     RefreshTokenRequestSchema,
     SignInRequestSchema,
@@ -18,10 +31,22 @@ from auth_service.schemas.http.auth import (
 )
 from auth_service.schemas.http.users import UserSchema
 from auth_service.services.auth_service import AuthService
+from auth_service.services.token_introspection import TokenIntrospectionService
 
 router = APIRouter(prefix='', tags=['Auth'])
 
 
+def _client_ip(request: Request) -> str | None:
+    return request.client.host if request.client else None
+
+
+def _token_pair_response(token_pair: TokenPairDTO) -> PydanticJSONResponse:
+    # The tokens were just issued by the service, so the response model is built without validating them again.
+    return PydanticJSONResponse(
+        TokenPairSchema.model_construct(access_token=token_pair.access_token, refresh_token=token_pair.refresh_token)
+    )
+
+
 @router.post('/sign-up', status_code=status.HTTP_201_CREATED)
 async def sign_up(
     data: SignUpRequestSchema,
@@ -34,10 +59,16 @@ async def sign_up(
 @router.post('/sign-in', response_model=TokenPairSchema)
 async def sign_in(
     data: SignInRequestSchema,
+    request: Request,
     service: Annotated[AuthService, Depends()],
 ):
-    token_data = await service.issue_token_pair(phone=data.phone, password=data.password)
-    return TokenPairSchema.model_dump(token_data)
+    token_pair = await service.issue_token_pair(
+        phone=data.phone,
+        password=data.password,
+        client_ip=_client_ip(request),
+        user_agent=request.headers.get('user-agent'),
+    )
+    return _token_pair_response(token_pair)
 
 
 @router.get('/me', response_model=UserSchema)
@@ -45,21 +76,42 @@ async def get_user_profile(
     user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
     service: Annotated[AuthService, Depends()],
 ):
-    return await service.get_user_by_id(user_id=user_id)
+    profile = await service.get_user_profile(user_id=user_id)
+    return Response(content=profile, media_type='application/json')
 
 
 @router.post('/refresh', response_model=TokenPairSchema)
 async def refresh(
     data: RefreshTokenRequestSchema,
+    request: Request,
     service: Annotated[AuthService, Depends()],
 ):
-    return await service.refresh_tokens(refresh_token=data.refresh_token)
+    token_pair = await service.refresh_tokens(
+        refresh_token=data.refresh_token,
+        client_ip=_client_ip(request),
+        user_agent=request.headers.get('user-agent'),
+    )
+    return _token_pair_response(token_pair)
 
 
 @router.post('/logout')
 async def logout(
     data: LogoutRequestSchema,
+    access_token: Annotated[JwtSchema | None, Depends(get_optional_access_token)],
     service: Annotated[AuthService, Depends()],
 ):
-    await service.delete_refresh_token(refresh_token=data.refresh_token)
+    await service.delete_refresh_token(refresh_token=data.refresh_token, access_token=access_token)
     return {'detail': 'Logged out successfully'}
+
+
+@router.post(
+    '/introspect',
+    response_model=IntrospectResponseSchema,
+    dependencies=[Depends(require_introspection_client)],
+)
+async def introspect(
+    data: IntrospectRequestSchema,
+    service: Annotated[TokenIntrospectionService, Depends()],
+):
+    tokens = await service.introspect(tokens=data.tokens, include_user=data.include_user)
+    return PydanticJSONResponse(IntrospectResponseSchema.model_construct(tokens=tokens))
@@ -0,0 +1,38 @@
+import uuid
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+)
+
+from auth_service.api.dependencies import get_access_token
+from auth_service.core.config import settings
+from auth_service.core.responses import PydanticJSONResponse
+from auth_service.schemas.dto.auth import JwtSchema
+from auth_service.schemas.http.sessions import SessionPageSchema
+from auth_service.services.auth_service import AuthService
+
+router = APIRouter(prefix='/sessions', tags=['Sessions'])
+
+
+@router.get('', response_model=SessionPageSchema)
+async def get_sessions(
+    access_token: Annotated[JwtSchema, Depends(get_access_token)],
+    service: Annotated[AuthService, Depends()],
+    limit: Annotated[int, Query(ge=1, le=settings.sessions_page_max_size)] = 20,
+    after: uuid.UUID | None = None,
+):
+    page = await service.get_sessions(access_token=access_token, limit=limit, after=after)
+    return PydanticJSONResponse(page)
+
+
+@router.delete('')
+async def delete_sessions(
+    access_token: Annotated[JwtSchema, Depends(get_access_token)],
+    service: Annotated[AuthService, Depends()],
+    keep_current: bool = False,
+):
+    deleted = await service.delete_sessions(access_token=access_token, keep_current=keep_current)
+    return {'detail': 'Sessions revoked', 'revoked': deleted}
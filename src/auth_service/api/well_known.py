@@ -0,0 +1,28 @@
+"""
+Provide implementation of the well-known metadata controllers.
+"""
+
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Header,
+    Response,
+    status,
+)
+
+from auth_service.core.config import settings
+from auth_service.core.security import jwt_key_set
+
+router = APIRouter(prefix='/.well-known', tags=['Well-known'])
+
+
+@router.get('/jwks.json')
+async def jwks(if_none_match: Annotated[str | None, Header()] = None) -> Response:
+    headers = {
+        'ETag': jwt_key_set.jwks_etag,
+        'Cache-Control': f'public, max-age={settings.jwks_cache_max_age}',
+    }
+    if if_none_match == jwt_key_set.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=jwt_key_set.jwks_json, media_type='application/json', headers=headers)
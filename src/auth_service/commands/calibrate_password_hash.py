@@ -0,0 +1,87 @@
+"""
+Find the password hash cost that makes one verification take about the target time on this host.
+
+Run it on the production hardware; the result is printed as settings to put into the environment.
+
+Usage:
+    python -m auth_service.commands.calibrate_password_hash [--scheme bcrypt|argon2] [--target-ms 250]
+"""
+
+import argparse
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from auth_service.core.config import settings
+from auth_service.core.security import (
+    PASSWORD_HASH_SCHEMES,
+    make_password_context,
+)
+
+PASSWORD = 'calibration-Pwd12345!'
+BCRYPT_ROUNDS_RANGE = range(4, 32)
+ARGON2_TIME_COST_RANGE = range(1, 33)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Calibrate the password hash cost.')
+    parser.add_argument('--scheme', choices=PASSWORD_HASH_SCHEMES, default=settings.password_hash_scheme)
+    parser.add_argument('--target-ms', type=float, default=250, help='Target duration of one verification.')
+    parser.add_argument(
+        '--argon2-memory-cost',
+        type=int,
+        default=settings.password_argon2_memory_cost,
+        help='Fixed argon2 memory cost in KiB; only the time cost is calibrated.',
+    )
+    parser.add_argument('--samples', type=int, default=5)
+    return parser.parse_args()
+
+
+def measure_verify(context: CryptContext, samples: int) -> float:
+    """Return the median verification time in milliseconds."""
+    hashed_password = context.hash(PASSWORD)
+    durations = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        context.verify(PASSWORD, hashed_password)
+        durations.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(durations)
+
+
+def calibrate(args: argparse.Namespace) -> dict[str, int]:
+    """Raise the cost step by step and return the first parameters that reach the target."""
+    costs = BCRYPT_ROUNDS_RANGE if args.scheme == 'bcrypt' else ARGON2_TIME_COST_RANGE
+    parameters: dict[str, int] = {}
+    for cost in costs:
+        parameters = {
+            'password_bcrypt_rounds': cost if args.scheme == 'bcrypt' else settings.password_bcrypt_rounds,
+            'password_argon2_time_cost': cost if args.scheme == 'argon2' else settings.password_argon2_time_cost,
+            'password_argon2_memory_cost': args.argon2_memory_cost,
+        }
+        context = make_password_context(
+            scheme=args.scheme,
+            bcrypt_rounds=parameters['password_bcrypt_rounds'],
+            argon2_time_cost=parameters['password_argon2_time_cost'],
+            argon2_memory_cost=parameters['password_argon2_memory_cost'],
+            argon2_parallelism=settings.password_argon2_parallelism,
+        )
+        duration = measure_verify(context, args.samples)
+        print(f'{args.scheme} cost={cost}: {duration:.1f} ms')
+        if duration >= args.target_ms:
+            break
+    return parameters
+
+
+def main(args: argparse.Namespace) -> None:
+    parameters = calibrate(args)
+    print(f'PASSWORD_HASH_SCHEME={args.scheme}')
+    if args.scheme == 'bcrypt':
+        print(f'PASSWORD_BCRYPT_ROUNDS={parameters["password_bcrypt_rounds"]}')
+    else:
+        print(f'PASSWORD_ARGON2_TIME_COST={parameters["password_argon2_time_cost"]}')
+        print(f'PASSWORD_ARGON2_MEMORY_COST={parameters["password_argon2_memory_cost"]}')
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -0,0 +1,46 @@
+"""
+Generate an access token signing key and print it with its public key and `kid`.
+
+Usage:
+    python -m auth_service.commands.generate_signing_key [--algorithm EdDSA|ES256]
+"""
+
+import argparse
+
+from cryptography.hazmat.primitives.asymmetric import (
+    ec,
+    ed25519,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+
+from auth_service.core.signing_keys import JwtKeySet
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Generate an access token signing key.')
+    parser.add_argument('--algorithm', choices=['EdDSA', 'ES256'], default='EdDSA')
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.algorithm == 'EdDSA':
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+
+    private_pem = private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()).decode()
+    public_pem = private_key.public_key().public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo).decode()
+    key_set = JwtKeySet(secret='', signing_key=private_pem)
+
+    print(f'kid: {key_set.kid}')
+    print(f'JWT_SIGNING_KEY:\n{private_pem}')
+    print(f'Public key (for JWT_PUBLIC_KEYS):\n{public_pem}')
+
+
+if __name__ == '__main__':
+    main(parse_args())
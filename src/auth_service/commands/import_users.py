@@ -0,0 +1,90 @@
+"""
+Import users from a CSV or JSONL file and write the rows that failed to a JSONL report as the import goes.
+
+CSV input needs a header with `first_name`, `last_name`, `phone` and either `password` or `hashed_password`; JSONL
+lines are objects with the same keys.
+
+Usage:
+    python -m auth_service.commands.import_users users.csv [--format csv|jsonl] [--report errors.jsonl]
+        [--chunk-size 1000] [--hash-workers 4]
+"""
+
+import argparse
+import asyncio
+import logging
+import pathlib
+from typing import AsyncIterator
+
+from auth_service.core.config import settings
+from auth_service.core.database import (
+    AsyncSessionLocal,
+    UnitOfWork,
+    async_engine,
+)
+from auth_service.core.executors import BoundedProcessExecutor
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.schemas.http.users import UserImportReportSchema
+from auth_service.services.phone_filter import phone_filter
+from auth_service.services.sign_in_negative_cache import sign_in_negative_cache
+from auth_service.services.user_import import (
+    IMPORT_FORMATS,
+    UserImportService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Import users from a CSV or JSONL file.')
+    parser.add_argument('path', type=pathlib.Path)
+    parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension.')
+    parser.add_argument('--report', type=pathlib.Path, help='Write failed rows here as JSONL.')
+    parser.add_argument('--chunk-size', type=int, default=settings.user_import_chunk_size)
+    parser.add_argument('--hash-workers', type=int, default=settings.user_import_hash_workers)
+    return parser.parse_args()
+
+
+async def read_lines(path: pathlib.Path) -> AsyncIterator[str]:
+    with path.open(encoding='utf-8-sig', newline='') as file:
+        for line in file:
+            yield line.rstrip('\n')
+
+
+async def main(args: argparse.Namespace) -> None:
+    file_format = args.format or args.path.suffix.lstrip('.').lower()
+    if file_format not in IMPORT_FORMATS:
+        raise SystemExit(f'Unknown input format {file_format!r}, pass --format')
+
+    hash_executor = BoundedProcessExecutor(workers=args.hash_workers, queue_size=0, wait=True)
+    report = UserImportReportSchema()
+    # Failed rows are written as they come, so the report covers every committed chunk even if the run breaks off.
+    report_file = args.report.open('w') if args.report else None
+    try:
+        async with AsyncSessionLocal() as session:
+            service = UserImportService(
+                auth_repository=AuthRepository(unit_of_work=UnitOfWork(session=session)),
+                phone_filter=phone_filter,
+                negative_cache=sign_in_negative_cache,
+            )
+            async for item in service.import_users(
+                lines=read_lines(args.path),
+                file_format=file_format,
+                hash_executor=hash_executor,
+                chunk_size=args.chunk_size,
+            ):
+                if isinstance(item, UserImportReportSchema):
+                    report = item
+                elif report_file is not None:
+                    report_file.write(item.model_dump_json() + '\n')
+                    report_file.flush()
+    finally:
+        if report_file is not None:
+            report_file.close()
+        hash_executor.shutdown()
+        await async_engine.dispose()
+        print(f'Imported {report.imported} users, {report.failed} rows failed')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,41 @@
+"""
+Purge expired refresh tokens once and exit.
+
+Usage:
+    python -m auth_service.commands.purge_refresh_tokens [--batch-size 1000] [--batch-pause 0.1]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from auth_service.core.config import settings
+from auth_service.core.database import async_engine
+from auth_service.services.refresh_token_sweeper import RefreshTokenSweeper
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Purge expired refresh tokens.')
+    parser.add_argument('--batch-size', type=int, default=settings.refresh_token_sweeper_batch_size)
+    parser.add_argument('--batch-pause', type=float, default=settings.refresh_token_sweeper_batch_pause)
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> None:
+    sweeper = RefreshTokenSweeper(
+        engine=async_engine,
+        batch_size=args.batch_size,
+        batch_pause=args.batch_pause,
+        interval=0,
+    )
+    try:
+        await sweeper.run_once()
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,41 @@
+"""
+Provide implementation of a Bloom filter.
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Set membership with false positives but no false negatives, in a fixed bit array.
+
+    The bit array and the number of hash functions are sized for `capacity` items at `error_rate`; past the capacity
+    the false positive rate grows.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.count = 0
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, item: str) -> list[int]:
+        # Kirsch-Mitzenmacher double hashing: k positions from the two halves of one digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8]), int.from_bytes(digest[8:]) | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
@@ -0,0 +1,127 @@
+"""
+Provide implementation of in-process caches.
+"""
+
+import abc
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Generic,
+    Hashable,
+    TypeVar,
+)
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    size: int
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU mapping whose entries also expire at a per-entry deadline.
+
+    The cache is meant to be used from a single event loop and is not thread-safe.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.time) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, size=len(self._entries))
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None) -> None:
+        """
+        Store the value until `expires_at` or for `ttl` seconds, whichever comes first.
+        """
+        if self.maxsize <= 0:
+            return
+
+        deadline = self._timer() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        self._entries[key] = (deadline, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class CacheBackend(abc.ABC):
+    """
+    Async key-value store for already serialized values.
+
+    The in-memory backend is the default; a shared store such as Redis only has to implement these three methods.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int) -> None:
+        self._cache: TTLCache[str, bytes] = TTLCache(maxsize=maxsize, ttl=math.inf)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._cache.set(key, value, expires_at=time.time() + ttl)
+
+    async def delete(self, key: str) -> None:
+        self._cache.pop(key)
@@ -1,37 +1,131 @@
 import logging
+import time
 from typing import (
     Annotated,
+    Any,
     AsyncGenerator,
+    Awaitable,
+    Callable,
 )
 
 from fastapi import Depends
+from sqlalchemy import (
+    Engine,
+    event,
+)
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
 )
 from sqlalchemy.orm import (
+    Session,
     declarative_base,
     sessionmaker,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from auth_service.core.config import settings
+from auth_service.core.metrics import (
+    DB_POOL_CHECKOUT_DURATION,
+    DB_QUERY_DURATION,
+    Gauge,
+    registry,
+    timed,
+)
+from auth_service.core.replicas import ReplicaSet
 
 logger = logging.getLogger(__name__)
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited for a connection.
+    """
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_DURATION.observe(time.perf_counter() - started_at)
+
+
 async_engine = create_async_engine(
     settings.async_database_url,
     echo=settings.database_log_queries,
     pool_pre_ping=True,
     future=True,
-    pool_size=settings.database_pool_max_size,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.database_pool_size,
     max_overflow=0,
     pool_timeout=settings.database_pool_timeout,
 )
 
+replica_set = ReplicaSet(
+    engines=[
+        create_async_engine(
+            url,
+            echo=settings.database_log_queries,
+            pool_pre_ping=True,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.database_replica_pool_size,
+            max_overflow=0,
+            pool_timeout=settings.database_pool_timeout,
+        )
+        for url in settings.async_database_replica_urls
+    ],
+    health_check_interval=settings.database_replica_health_check_interval,
+    health_check_timeout=settings.database_replica_health_check_timeout,
+)
+
+registry.register(Gauge('db_pool_size', 'Configured primary pool size.', callback=lambda: async_engine.pool.size()))
+registry.register(
+    Gauge(
+        'db_pool_checked_out',
+        'Primary pool connections currently in use.',
+        callback=lambda: async_engine.pool.checkedout(),
+    )
+)
+registry.register(
+    Gauge(
+        'db_pool_checked_in',
+        'Idle connections in the primary pool.',
+        callback=lambda: async_engine.pool.checkedin(),
+    )
+)
+
+
+class RoutingSession(Session):
+    """
+    Send statements marked with the `use_replica` execution option to a healthy read replica.
+
+    Everything else goes to the primary, unless an explicit `bind` is given. Once the session has written anything, all
+    further reads stay on the primary too, so a request always reads its own writes.
+    """
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, bind: Any = None, **kw: Any):
+        if self._flushing or getattr(clause, 'is_dml', False):
+            self.info['has_writes'] = True
+            return async_engine.sync_engine
+
+        if bind is not None:
+            return bind
+
+        if clause is None or self.info.get('has_writes') or not clause.get_execution_options().get('use_replica'):
+            return async_engine.sync_engine
+
+        replica = replica_set.choose()
+        return replica.sync_engine if replica is not None else async_engine.sync_engine
+
+    def replica_bind(self, clause: Any) -> Engine | None:
+        """Return the replica `clause` would be read from, or None if it would go to the primary."""
+        bind = self.get_bind(clause=clause)
+        return None if bind is async_engine.sync_engine else bind
+
+
 AsyncSessionLocal = sessionmaker(
-    bind=async_engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autoflush=False,
 )
@@ -39,14 +133,72 @@ AsyncSessionLocal = sessionmaker(
 
 async def get_database_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        except Exception:
-            await session.rollback()
-            logger.exception('DB transaction failed')
-            raise
+        yield session
 
 
 ModelBaseDeclarative = declarative_base()
 
-DatabaseSession = Annotated[AsyncSession, Depends(get_database_session)]
+DatabaseSession = Annotated[AsyncSession, Depends(get_database_session, scope='function')]
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_changed_instances(session: Session, flush_context: Any) -> None:
+    session.info.setdefault('changed_instances', []).extend([*session.dirty, *session.deleted])
+
+
+CommitHook = Callable[[list[Any]], Awaitable[None]]
+
+
+class UnitOfWork:
+    """
+    Request-scoped transaction boundary.
+
+    Repositories only stage changes on `session`; the request commits once when it finishes successfully and rolls
+    back otherwise. `flush` is the explicit opt-in for the rare path that must reach the database before the commit,
+    e.g. to surface a unique constraint violation while it can still be handled.
+
+    Commit hooks run after a successful commit with the ORM instances that were updated or deleted in it.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._commit_hooks: list[CommitHook] = []
+
+    def on_commit(self, hook: CommitHook) -> None:
+        self._commit_hooks.append(hook)
+
+    @timed(DB_QUERY_DURATION, method='UnitOfWork.flush')
+    async def flush(self) -> None:
+        await self.session.flush()
+
+    @timed(DB_QUERY_DURATION, method='UnitOfWork.commit')
+    async def commit(self) -> None:
+        if self.session.in_transaction():
+            await self.session.commit()
+
+        changed_instances = self.session.info.pop('changed_instances', [])
+        for hook in self._commit_hooks:
+            try:
+                await hook(changed_instances)
+            except Exception:  # noqa: B902
+                logger.exception('Commit hook failed')
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+        self.session.info.pop('changed_instances', None)
+
+
+async def get_unit_of_work(session: DatabaseSession) -> AsyncGenerator[UnitOfWork, None]:
+    unit_of_work = UnitOfWork(session=session)
+    try:
+        yield unit_of_work
+    except Exception:
+        await unit_of_work.rollback()
+        logger.exception('DB transaction failed')
+        raise
+
+    await unit_of_work.commit()
+
+
+# Function scope makes the commit happen before the response is sent, so a failed commit is reported to the client.
+DatabaseUnitOfWork = Annotated[UnitOfWork, Depends(get_unit_of_work, scope='function')]
@@ -4,7 +4,37 @@ class BaseApiError(Exception):
         message: str,
         status_code: int = 400,
         error_code: str | None = None,
+        headers: dict[str, str] | None = None,
     ):
         self.message = message
         self.status_code = status_code
         self.error_code = error_code
+        self.headers = headers
+
+
+class ServiceOverloadedError(BaseApiError):
+    def __init__(
+        self,
+        message: str = 'Service is overloaded, try again later',
+        retry_after: int = 1,
+    ):
+        super().__init__(
+            message=message,
+            status_code=503,
+            error_code='service_overloaded',
+            headers={'Retry-After': str(retry_after)},
+        )
+
+
+class TooManyRequestsError(BaseApiError):
+    def __init__(
+        self,
+        message: str = 'Too many requests, try again later',
+        retry_after: int = 1,
+    ):
+        super().__init__(
+            message=message,
+            status_code=429,
+            error_code='too_many_requests',
+            headers={'Retry-After': str(retry_after)},
+        )
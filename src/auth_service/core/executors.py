@@ -0,0 +1,92 @@
+"""
+Provide a bounded process pool for CPU-bound work that must not block the event loop.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    TypeVar,
+)
+
+from auth_service.core.errors import ServiceOverloadedError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def _noop() -> None:
+    return None
+
+
+class BoundedProcessExecutor:
+    """
+    Run picklable callables on a lazily created process pool with a bounded backlog.
+
+    At most `workers + queue_size` calls may be in flight at once; any call above that limit is rejected with
+    `ServiceOverloadedError` instead of queueing without bound behind the busy workers. With `wait`, it waits for a
+    free slot instead, for batch work such as imports that must not fail halfway through.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        retry_after: int = 1,
+        initializer: Callable[[], None] | None = None,
+        wait: bool = False,
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self._initializer = initializer
+        self._pool: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._slots = asyncio.Semaphore(workers + queue_size) if wait else None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def start(self) -> None:
+        """
+        Spawn every worker up front so the first requests don't pay for process start-up and initialization.
+        """
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, _noop) for _ in range(self.workers)))
+        logger.info('Process executor started with %s workers', self.workers)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._slots is not None:
+            async with self._slots:
+                return await self._run(func, *args)
+
+        if self._pending >= self.workers + self.queue_size:
+            raise ServiceOverloadedError(retry_after=self.retry_after)
+        return await self._run(func, *args)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_pool(), func, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=self._initializer,
+            )
+        return self._pool
@@ -0,0 +1,364 @@
+"""
+Provide a minimal in-process metrics registry rendered in the Prometheus text exposition format.
+"""
+
+import abc
+import asyncio
+import bisect
+import functools
+import inspect
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+)
+
+from auth_service.core.config import settings
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames: tuple[str, ...], labelvalues: tuple[str, ...], *extra: str) -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, labelvalues)]
+    pairs.extend(label for label in extra if label)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
+
+
+class Metric(abc.ABC):
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> list[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}',
+        ]
+
+    def render(self) -> list[str]:
+        return [*self.header(), *self.samples()]
+
+    def samples(self, extra_label: str = '') -> list[str]:
+        """Render the sample lines, adding `extra_label` (e.g. `worker="12"`) to each."""
+        return self._samples(extra_label)
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def _samples(self, extra_label: str) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """
+    Counter that is either incremented explicitly or, with `callback`, read at scrape time.
+    """
+
+    type_name = 'counter'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self, extra_label: str) -> list[str]:
+        if self._callback is not None:
+            return [f'{self.name}{_format_labels((), (), extra_label)} {_format_value(self._callback())}']
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key, extra_label)} {_format_value(value)}'
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """
+    Gauge that is either set explicitly or, with `callback`, read at scrape time.
+    """
+
+    type_name = 'gauge'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+    def _samples(self, extra_label: str) -> list[str]:
+        if self._callback is not None:
+            return [f'{self.name}{_format_labels((), (), extra_label)} {_format_value(self._callback())}']
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key, extra_label)} {_format_value(value)}'
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(Metric):
+    type_name = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        self._bucket_counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        bucket_counts = self._bucket_counts.get(key)
+        if bucket_counts is None:
+            bucket_counts = self._bucket_counts[key] = [0] * len(self.buckets)
+        bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: Any) -> int:
+        return sum(self._bucket_counts.get(self._key(labels), ()))
+
+    def _samples(self, extra_label: str) -> list[str]:
+        samples = []
+        for key, bucket_counts in self._bucket_counts.items():
+            labels = _format_labels(self.labelnames, key, extra_label)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(self.labelnames, key, extra_label, f'le="{_format_value(bound)}"')
+                samples.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            samples.append(f'{self.name}_sum{labels} {_format_value(self._sums[key])}')
+            samples.append(f'{self.name}_count{labels} {cumulative}')
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register[M: Metric](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return self.render_samples([self.samples()])
+
+    def samples(self, extra_label: str = '') -> dict[str, list[str]]:
+        """The sample lines of every metric by metric name, e.g. to be rendered by another process."""
+        return {name: metric.samples(extra_label) for name, metric in self._metrics.items()}
+
+    def render_samples(self, samples: list[dict[str, list[str]]]) -> str:
+        """Render several `samples` results, e.g. of all workers of a server, under one header per metric."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            for process_samples in samples:
+                lines.extend(process_samples.get(metric.name, ()))
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsDirectory:
+    """
+    Share the metrics of all workers of a multi-process server through files in one directory.
+
+    Every worker writes its samples, labelled `worker="<pid>"`, to `<path>/<pid>.json` every `interval` seconds and
+    again right before it answers a scrape. The answer holds the samples of every live worker, so a scrape gives the
+    whole server whichever worker accepts it; aggregate with `sum without (worker)`. Files of workers that are gone
+    are removed by the next scrape.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float) -> None:
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+
+    def _file(self, pid: int) -> Path:
+        return self.path / f'{pid}.json'
+
+    def write(self) -> None:
+        pid = os.getpid()
+        tmp_file = self.path / f'{pid}.tmp'
+        tmp_file.write_text(json.dumps(self.registry.samples(f'worker="{pid}"')))
+        # Readers see either the previous or the new file, never a partly written one.
+        os.replace(tmp_file, self._file(pid))
+
+    def remove(self) -> None:
+        self._file(os.getpid()).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove the files of a previous run; called by the server before it starts the workers."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        for file in self.path.glob('*.json'):
+            file.unlink(missing_ok=True)
+
+    def render(self) -> str:
+        self.write()
+        samples = []
+        for file in self.path.glob('*.json'):
+            if not _process_exists(int(file.stem)):
+                file.unlink(missing_ok=True)
+                continue
+            try:
+                samples.append(json.loads(file.read_text()))
+            except FileNotFoundError:  # the worker shut down meanwhile
+                continue
+        return self.registry.render_samples(samples)
+
+    async def run_forever(self) -> None:
+        try:
+            while True:
+                self.write()
+                await asyncio.sleep(self.interval)
+        finally:
+            self.remove()
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that counts HTTP requests and observes their latency per route template.
+
+    Requests that match no route are labelled `<unmatched>`, so arbitrary paths cannot blow up the label cardinality.
+    """
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: dict) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope.
+            route = scope.get('route')
+            route_path = getattr(route, 'path', '<unmatched>')
+            HTTP_REQUESTS.inc(method=scope['method'], route=route_path, status=status_code)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started_at, method=scope['method'], route=route_path)
+
+
+def timed(histogram: Histogram, **labels: Any):
+    """
+    Decorate a function or coroutine function to observe its duration in seconds.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started_at = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - started_at, **labels)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started_at, **labels)
+
+        return wrapper
+
+    return decorator
+
+
+registry = MetricsRegistry()
+
+metrics_directory = (
+    MetricsDirectory(registry, path=settings.metrics_multiprocess_dir, interval=settings.metrics_multiprocess_interval)
+    if settings.metrics_multiprocess_dir
+    else None
+)
+
+HTTP_REQUESTS = registry.register(
+    Counter('http_requests_total', 'HTTP requests by route and status.', ['method', 'route', 'status'])
+)
+HTTP_REQUEST_DURATION = registry.register(
+    Histogram('http_request_duration_seconds', 'HTTP request latency by route.', ['method', 'route'])
+)
+PASSWORD_HASH_DURATION = registry.register(
+    Histogram(
+        'password_hash_duration_seconds',
+        'Password hash/verify latency including executor queueing.',
+        ['operation'],
+        buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0),
+    )
+)
+JWT_DURATION = registry.register(
+    Histogram(
+        'jwt_duration_seconds',
+        'Access token encode/decode latency.',
+        ['operation'],
+        buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+    )
+)
+DB_QUERY_DURATION = registry.register(
+    Histogram('db_query_duration_seconds', 'Database time per repository method.', ['method'])
+)
+DB_POOL_CHECKOUT_DURATION = registry.register(
+    Histogram('db_pool_checkout_duration_seconds', 'Time spent waiting for a pooled database connection.')
+)
@@ -0,0 +1,152 @@
+"""
+Provide implementation of sliding-window rate limiting and exponential lockout.
+"""
+
+import abc
+import math
+import time
+import zlib
+from typing import Callable
+
+from auth_service.core.cache import TTLCache
+
+
+class CounterStore(abc.ABC):
+    """
+    Expiring integer counters shared by rate limiters.
+
+    The in-memory store is the default; a shared store such as Redis only has to implement these four methods
+    (`INCR` + `EXPIRE`, `GET`, `SET EX`, `DEL`).
+    """
+
+    @abc.abstractmethod
+    async def increment(self, key: str, ttl: float) -> int:
+        """Increment the counter, starting it at zero with `ttl` seconds to live if it does not exist."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> int:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: int, ttl: float) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryCounterStore(CounterStore):
+    """
+    Counters in a fixed number of bounded LRU shards, so a flood of distinct keys evicts old counters shard by shard
+    instead of growing without limit.
+    """
+
+    def __init__(self, shards: int, maxsize: int, timer: Callable[[], float] = time.time) -> None:
+        self._timer = timer
+        self._shards: list[TTLCache[str, tuple[float, int]]] = [
+            TTLCache(maxsize=max(maxsize // shards, 1), ttl=math.inf, timer=timer) for _ in range(shards)
+        ]
+
+    def _shard(self, key: str) -> TTLCache[str, tuple[float, int]]:
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    async def increment(self, key: str, ttl: float) -> int:
+        shard = self._shard(key)
+        entry = shard.get(key)
+        expires_at, value = entry if entry is not None else (self._timer() + ttl, 0)
+        shard.set(key, (expires_at, value + 1), expires_at=expires_at)
+        return value + 1
+
+    async def get(self, key: str) -> int:
+        entry = self._shard(key).get(key)
+        return entry[1] if entry is not None else 0
+
+    async def set(self, key: str, value: int, ttl: float) -> None:
+        expires_at = self._timer() + ttl
+        self._shard(key).set(key, (expires_at, value), expires_at=expires_at)
+
+    async def delete(self, key: str) -> None:
+        self._shard(key).pop(key)
+
+
+class SlidingWindowLimiter:
+    """
+    Allow `limit` hits per `window` seconds per key.
+
+    The sliding window is approximated from two fixed-window counters: the previous window's count weighted by how much
+    of it still overlaps the sliding window, plus the current window's count.
+    """
+
+    def __init__(
+        self,
+        store: CounterStore,
+        name: str,
+        limit: int,
+        window: int,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self._timer = timer
+
+    async def hit(self, key: str) -> int | None:
+        """
+        Record a hit.
+
+        Returns:
+            None if the hit is allowed, otherwise the number of seconds to wait.
+        """
+        now = self._timer()
+        window_index, elapsed = divmod(now, self.window)
+        current = await self.store.increment(f'{self.name}:{key}:{int(window_index)}', ttl=self.window * 2)
+        previous = await self.store.get(f'{self.name}:{key}:{int(window_index) - 1}')
+        if previous * (1 - elapsed / self.window) + current <= self.limit:
+            return None
+        return max(math.ceil(self.window - elapsed), 1)
+
+
+class Lockout:
+    """
+    Lock a key out after `threshold` consecutive failures, doubling the lockout with every further failure.
+
+    Failures are forgotten `reset_after` seconds after the first one or on `reset`.
+    """
+
+    def __init__(
+        self,
+        store: CounterStore,
+        name: str,
+        threshold: int,
+        base_duration: int,
+        max_duration: int,
+        reset_after: int,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.name = name
+        self.threshold = threshold
+        self.base_duration = base_duration
+        self.max_duration = max_duration
+        self.reset_after = reset_after
+        self._timer = timer
+
+    async def retry_after(self, key: str) -> int | None:
+        """Return the seconds left in the key's lockout, or None if it is not locked out."""
+        locked_until = await self.store.get(f'{self.name}:{key}:locked-until')
+        remaining = locked_until - self._timer()
+        return math.ceil(remaining) if remaining > 0 else None
+
+    async def record_failure(self, key: str) -> None:
+        failures = await self.store.increment(f'{self.name}:{key}:failures', ttl=self.reset_after)
+        if failures < self.threshold:
+            return
+
+        duration = min(self.base_duration * 2 ** (failures - self.threshold), self.max_duration)
+        await self.store.set(f'{self.name}:{key}:locked-until', int(self._timer() + duration), ttl=duration)
+
+    async def reset(self, key: str) -> None:
+        await self.store.delete(f'{self.name}:{key}:failures')
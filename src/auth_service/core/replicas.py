@@ -0,0 +1,65 @@
+"""
+Provide implementation of read replica pools with health checking.
+"""
+
+import asyncio
+import itertools
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaSet:
+    """
+    Round-robin over the healthy read replicas, each with its own connection pool.
+
+    A replica is taken out of rotation as soon as a health check fails and put back once a check succeeds again. With
+    no healthy replica `choose` returns None and callers fall back to the primary.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], health_check_interval: float, health_check_timeout: float) -> None:
+        self.engines = engines
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._healthy = dict.fromkeys(engines, True)
+        self._counter = itertools.count()
+
+    @property
+    def healthy_engines(self) -> list[AsyncEngine]:
+        return [engine for engine in self.engines if self._healthy[engine]]
+
+    def choose(self) -> AsyncEngine | None:
+        engines = self.healthy_engines
+        if not engines:
+            return None
+        return engines[next(self._counter) % len(engines)]
+
+    async def check_health(self) -> None:
+        for engine in self.engines:
+            try:
+                await asyncio.wait_for(self._ping(engine), timeout=self.health_check_timeout)
+            except Exception:  # noqa: B902
+                if self._healthy[engine]:
+                    logger.warning('Read replica %s is unhealthy, routing its reads to the primary', engine.url)
+                self._healthy[engine] = False
+            else:
+                if not self._healthy[engine]:
+                    logger.info('Read replica %s is healthy again', engine.url)
+                self._healthy[engine] = True
+
+    async def run_health_checks(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_check_interval)
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+    @staticmethod
+    async def _ping(engine: AsyncEngine) -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text('SELECT 1'))
@@ -0,0 +1,20 @@
+"""
+Provide implementation of the JSON response rendered by pydantic-core.
+"""
+
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core's serializer instead of `json.dumps`.
+
+    The output is the same compact UTF-8 JSON, but pydantic models, UUIDs and datetimes are serialized natively in Rust.
+    Passing a model instance directly skips FastAPI's `response_model` validation and its `jsonable_encoder` pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
@@ -0,0 +1,69 @@
+"""
+Provide implementation of the in-memory set of revoked access token ids.
+"""
+
+import time
+import uuid
+from typing import Callable
+
+
+class RevokedJtiSet:
+    """
+    Revoked access token ids, kept only until the tokens expire.
+
+    Each jti is stored as a 64-bit int taken from its random bits, and an expiry wheel of `bucket_seconds` wide buckets
+    drops it shortly after its token's `exp`, so memory is bounded by one access token lifetime of revocations. Both
+    `add` and the membership check are O(1) amortized and do no I/O.
+
+    The set is meant to be used from a single event loop and is not thread-safe.
+    """
+
+    def __init__(self, bucket_seconds: int = 10, timer: Callable[[], float] = time.time) -> None:
+        self.bucket_seconds = bucket_seconds
+        self._timer = timer
+        self._digests: set[int] = set()
+        self._buckets: dict[int, list[int]] = {}
+        self._next_bucket = self._bucket(timer())
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def __contains__(self, jti: uuid.UUID) -> bool:
+        self._expire()
+        return self._digest(jti) in self._digests
+
+    def add(self, jti: uuid.UUID, exp: int) -> None:
+        self._expire()
+        bucket = self._bucket(exp)
+        if bucket < self._next_bucket:
+            return
+
+        digest = self._digest(jti)
+        self._digests.add(digest)
+        self._buckets.setdefault(bucket, []).append(digest)
+
+    def clear(self) -> None:
+        self._digests.clear()
+        self._buckets.clear()
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    @staticmethod
+    def _digest(jti: uuid.UUID) -> int:
+        return jti.int & 0xFFFFFFFFFFFFFFFF
+
+    def _expire(self) -> None:
+        current_bucket = self._bucket(self._timer())
+        if current_bucket <= self._next_bucket:
+            return
+
+        if not self._buckets:
+            self._next_bucket = current_bucket
+            return
+
+        # A bucket is dropped once the clock has moved past it entirely, i.e. every token in it has expired.
+        while self._next_bucket < current_bucket:
+            for digest in self._buckets.pop(self._next_bucket, ()):
+                self._digests.discard(digest)
+            self._next_bucket += 1
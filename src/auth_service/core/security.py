@@ -1,20 +1,128 @@
 import hashlib
+import secrets
 import time
 import uuid
 
 import jwt
 from passlib.context import CryptContext
 
+from auth_service.core.cache import TTLCache
 from auth_service.core.config import settings
+from auth_service.core.executors import BoundedProcessExecutor
+from auth_service.core.metrics import (
+    JWT_DURATION,
+    PASSWORD_HASH_DURATION,
+    Counter,
+    Gauge,
+    registry,
+    timed,
+)
+from auth_service.core.revocation import RevokedJtiSet
+from auth_service.core.signing_keys import JwtKeySet
 from auth_service.schemas.dto.auth import JwtSchema
 
-_pwd_context = CryptContext(
-    schemes=['bcrypt'],
-    deprecated='auto',
+PASSWORD_HASH_SCHEMES = ('bcrypt', 'argon2')
+
+
+def make_password_context(
+    scheme: str,
+    bcrypt_rounds: int,
+    argon2_time_cost: int,
+    argon2_memory_cost: int,
+    argon2_parallelism: int,
+) -> CryptContext:
+    """
+    Build a context that hashes with `scheme` and still verifies hashes of the other supported schemes.
+
+    Hashes of another scheme or with different cost parameters are reported as needing an update.
+    """
+    if scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f'Unsupported password hash scheme: {scheme}')
+
+    return CryptContext(
+        schemes=[scheme, *(other for other in PASSWORD_HASH_SCHEMES if other != scheme)],
+        deprecated='auto',
+        bcrypt__rounds=bcrypt_rounds,
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+_pwd_context = make_password_context(
+    scheme=settings.password_hash_scheme,
+    bcrypt_rounds=settings.password_bcrypt_rounds,
+    argon2_time_cost=settings.password_argon2_time_cost,
+    argon2_memory_cost=settings.password_argon2_memory_cost,
+    argon2_parallelism=settings.password_argon2_parallelism,
+)
+
+
+def _prewarm_password_worker() -> None:
+    """Load the password hash backend in a pool worker before it serves real requests."""
+    _pwd_context.hash('prewarm')
+
+
+password_hash_executor = BoundedProcessExecutor(
+    workers=settings.password_hash_workers,
+    queue_size=settings.password_hash_queue_size,
+    retry_after=settings.password_hash_retry_after,
+    initializer=_prewarm_password_worker,
+)
+
+jwt_key_set = JwtKeySet(
+    secret=settings.jwt_secret,
+    signing_key=settings.jwt_signing_key,
+    public_keys=settings.jwt_public_keys,
+    accept_secret=settings.jwt_secret_verification,
+)
+
+# Verified access tokens keyed by the raw token, plus a jti index so a revoked token can be evicted.
+access_token_cache: TTLCache[str, JwtSchema] = TTLCache(
+    maxsize=settings.access_token_cache_size,
+    ttl=settings.access_token_cache_ttl,
+)
+_access_token_cache_keys: TTLCache[uuid.UUID, str] = TTLCache(
+    maxsize=settings.access_token_cache_size,
+    ttl=settings.access_token_cache_ttl,
+)
+
+PASSWORD_REHASHES = registry.register(
+    Counter('password_rehashes_total', 'Outdated password hashes upgraded on sign-in.')
+)
+# Checked on every decode, including cache hits; filled from the database and kept in sync across processes.
+revoked_access_tokens = RevokedJtiSet()
+
+registry.register(
+    Gauge(
+        'revoked_access_tokens',
+        'Revoked access tokens that have not expired yet.',
+        callback=lambda: len(revoked_access_tokens),
+    )
+)
+registry.register(
+    Gauge(
+        'password_hash_executor_pending',
+        'Password hash/verify calls running or queued on the executor.',
+        callback=lambda: password_hash_executor.pending,
+    )
+)
+registry.register(
+    Counter(
+        'access_token_cache_hits_total', 'Verified access token cache hits.', callback=lambda: access_token_cache.hits
+    )
+)
+registry.register(
+    Counter(
+        'access_token_cache_misses_total',
+        'Verified access token cache misses.',
+        callback=lambda: access_token_cache.misses,
+    )
 )
 
 
-def create_access_token(user_id: uuid.UUID) -> str:
+@timed(JWT_DURATION, operation='encode')
+def create_access_token(user_id: uuid.UUID, session_id: uuid.UUID | None = None) -> str:
     now = int(time.time())
     payload = JwtSchema(
         sub=user_id,
@@ -22,24 +130,37 @@ def create_access_token(user_id: uuid.UUID) -> str:
         iat=now,
         exp=now + settings.access_token_life_time,
         token_type='access',
+        sid=session_id,
     )
-    return jwt.encode(
-        payload.model_dump(mode='json'),
-        settings.jwt_secret,
-        algorithm='HS256',
-    )
+    return jwt_key_set.sign(payload.model_dump(mode='json', exclude_none=True))
 
 
 def create_refresh_token() -> str:
     return uuid.uuid4().hex
 
 
+class AccessTokenRevokedError(jwt.InvalidTokenError):
+    """The access token is valid but was revoked; `token` holds its verified claims."""
+
+    def __init__(self, token: JwtSchema) -> None:
+        super().__init__('Token revoked')
+        self.token = token
+
+
+@timed(JWT_DURATION, operation='decode')
 def decode_access_token(token: str) -> JwtSchema:
+    cached_token = access_token_cache.get(token)
+    if cached_token is not None:
+        if cached_token.jti in revoked_access_tokens:
+            raise AccessTokenRevokedError(cached_token)
+        return cached_token
+
     try:
+        verification_key = jwt_key_set.verification_key(token)
         payload = jwt.decode(
             token,
-            settings.jwt_secret,
-            algorithms=['HS256'],
+            verification_key.key,
+            algorithms=[verification_key.algorithm],
             options={
                 'require': ['exp', 'iat', 'sub', 'jti', 'iss'],
                 'verify_exp': True,
@@ -51,13 +172,44 @@ def decode_access_token(token: str) -> JwtSchema:
     if payload.get('iss') != 'auth-service':
         raise jwt.InvalidTokenError('Invalid token issuer')
 
-    return JwtSchema.model_validate(payload)
+    jwt_token = JwtSchema.model_validate(payload)
+    if jwt_token.jti in revoked_access_tokens:
+        raise AccessTokenRevokedError(jwt_token)
+    access_token_cache.set(token, jwt_token, expires_at=jwt_token.exp)
+    _access_token_cache_keys.set(jwt_token.jti, token, expires_at=jwt_token.exp)
+    return jwt_token
+
+
+def evict_access_token(jti: uuid.UUID) -> None:
+    """Drop a revoked access token from the verified token cache."""
+    token = _access_token_cache_keys.pop(jti)
+    if token is not None:
+        access_token_cache.pop(token)
+
+
+def revoke_access_token(jti: uuid.UUID, exp: int) -> None:
+    """Reject the access token in this process from now on, without waiting for it to expire."""
+    revoked_access_tokens.add(jti, exp)
+    evict_access_token(jti)
 
 
 def hash_password(password: str) -> str:
     return _pwd_context.hash(password)
 
 
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash a batch of passwords in one executor call, so bulk imports pay the inter-process overhead once."""
+    return [_pwd_context.hash(password) for password in passwords]
+
+
+def is_password_hash(value: str) -> bool:
+    """Check that the value is a hash of a scheme the password context can verify."""
+    try:
+        return _pwd_context.identify(value, required=False) is not None
+    except ValueError:
+        return False
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Check if hash of plain_password matches hashed_password.
@@ -75,6 +227,64 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
-def create_hash(value: str) -> str:
-    """Return SHA-256 hash of the given string."""
-    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify the password and rehash it if the stored hash uses an outdated scheme or cost.
+
+    Returns:
+        Whether the password matches, and the new hash if the stored one should be replaced.
+    """
+    try:
+        return _pwd_context.verify_and_update(plain_password, hashed_password)
+    except Exception:  # noqa: B902
+        return False, None
+
+
+@timed(PASSWORD_HASH_DURATION, operation='hash')
+async def hash_password_async(password: str) -> str:
+    """Hash the password on the password hash executor without blocking the event loop."""
+    return await password_hash_executor.run(hash_password, password)
+
+
+@timed(PASSWORD_HASH_DURATION, operation='verify')
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify the password on the password hash executor without blocking the event loop."""
+    return await password_hash_executor.run(verify_password, plain_password, hashed_password)
+
+
+@timed(PASSWORD_HASH_DURATION, operation='verify')
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify the password on the password hash executor, rehashing an outdated hash in the same worker call.
+    """
+    verified, new_hashed_password = await password_hash_executor.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
+    if new_hashed_password is not None:
+        PASSWORD_REHASHES.inc()
+    return verified, new_hashed_password
+
+
+_dummy_password_hash: str | None = None
+
+
+async def prepare_dummy_password_hash() -> str:
+    """Hash a random password once with the current scheme and cost, so dummy verifies cost as much as real ones."""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = await hash_password_async(secrets.token_urlsafe(16))
+    return _dummy_password_hash
+
+
+async def verify_dummy_password_async(plain_password: str) -> bool:
+    """
+    Spend a real verify on the password hash executor for a user that does not exist.
+
+    Unknown phones then take as long to reject as wrong passwords, which hides whether a phone is registered.
+    """
+    return await verify_password_async(plain_password, await prepare_dummy_password_hash())
+
+
+def create_hash(value: str) -> bytes:
+    """Return the raw 32-byte SHA-256 digest of the given string."""
+    return hashlib.sha256(value.encode('utf-8')).digest()
@@ -0,0 +1,124 @@
+"""
+Provide implementation of the access token signing key set.
+"""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Iterable,
+)
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import (
+    ec,
+    ed25519,
+)
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from jwt.algorithms import (
+    ECAlgorithm,
+    OKPAlgorithm,
+)
+
+HMAC_ALGORITHM = 'HS256'
+
+
+@dataclass(frozen=True)
+class VerificationKey:
+    kid: str | None
+    algorithm: str
+    key: Any
+
+
+def _algorithm_for(key: Any) -> str:
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return 'EdDSA'
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and key.curve.name == 'secp256r1':
+        return 'ES256'
+    raise ValueError('Access token signing keys must be Ed25519 or EC P-256 keys')
+
+
+def _public_jwk(public_key: Any, algorithm: str) -> dict:
+    algorithm_class = OKPAlgorithm if algorithm == 'EdDSA' else ECAlgorithm
+    return algorithm_class.to_jwk(public_key, as_dict=True)
+
+
+def jwk_thumbprint(jwk: dict) -> str:
+    """Return the RFC 7638 thumbprint of a public JWK, used as its `kid`."""
+    members = {name: jwk[name] for name in ('crv', 'kty', 'x', 'y') if name in jwk}
+    digest = hashlib.sha256(json.dumps(members, separators=(',', ':'), sort_keys=True).encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+class JwtKeySet:
+    """
+    Keys that sign and verify access tokens, and the JWKS document that publishes the public ones.
+
+    With a PEM `signing_key`, tokens are signed with EdDSA or ES256 (chosen by the key type) and carry the key's
+    thumbprint as `kid`, so resource servers can verify them offline against the JWKS. `public_keys` are accepted for
+    verification and published too: keep the previous key there until its last tokens expire, and publish the next key
+    there at least one JWKS max-age before it starts signing.
+
+    Without a signing key, tokens are signed with HS256 and the shared secret, and the JWKS is empty. `accept_secret`
+    keeps HS256 tokens without a `kid` valid after switching to a signing key, for the length of the migration.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        signing_key: str = '',
+        public_keys: Iterable[str] = (),
+        accept_secret: bool = False,
+    ) -> None:
+        self._verification_keys: dict[str | None, VerificationKey] = {}
+        self._jwks: dict[str, dict] = {}
+
+        if signing_key:
+            private_key = load_pem_private_key(signing_key.encode(), password=None)
+            verification_key = self._add_public_key(private_key.public_key())
+            self.algorithm = verification_key.algorithm
+            self.kid: str | None = verification_key.kid
+            self._signing_key: Any = private_key
+        else:
+            self.algorithm = HMAC_ALGORITHM
+            self.kid = None
+            self._signing_key = secret
+
+        if not signing_key or accept_secret:
+            self._verification_keys[None] = VerificationKey(kid=None, algorithm=HMAC_ALGORITHM, key=secret)
+
+        for public_key in public_keys:
+            self._add_public_key(load_pem_public_key(public_key.encode()))
+
+        self.jwks_json = json.dumps({'keys': list(self._jwks.values())}, separators=(',', ':')).encode()
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_json).hexdigest()[:32]}"'
+
+    def _add_public_key(self, public_key: Any) -> VerificationKey:
+        algorithm = _algorithm_for(public_key)
+        jwk = _public_jwk(public_key, algorithm)
+        kid = jwk_thumbprint(jwk)
+        self._jwks[kid] = {**jwk, 'kid': kid, 'alg': algorithm, 'use': 'sig'}
+        verification_key = self._verification_keys[kid] = VerificationKey(kid=kid, algorithm=algorithm, key=public_key)
+        return verification_key
+
+    def sign(self, payload: dict) -> str:
+        headers = {'kid': self.kid} if self.kid is not None else None
+        return jwt.encode(payload, self._signing_key, algorithm=self.algorithm, headers=headers)
+
+    def verification_key(self, token: str) -> VerificationKey:
+        """
+        Pick the key for the token's `kid`; the algorithm comes from the key, never from the token header.
+
+        Raises:
+            jwt.InvalidTokenError: The token is malformed or signed with an unknown key.
+        """
+        kid = jwt.get_unverified_header(token).get('kid')
+        verification_key = self._verification_keys.get(kid) if isinstance(kid, str | None) else None
+        if verification_key is None:
+            raise jwt.InvalidTokenError('Unknown signing key')
+        return verification_key
@@ -0,0 +1,75 @@
+"""
+Provide implementation of single-flight coalescing of concurrent identical calls.
+"""
+
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    TypeVar,
+)
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Let concurrent calls with the same key share one in-flight call and its result.
+
+    The first caller for a key runs the call; callers that arrive while it is running wait for its result instead of
+    running their own. A waiter that has not got the result after `timeout` seconds, or whose leader failed or was
+    cancelled, runs the call itself, so coalescing never adds an error or more than `timeout` of latency. Results are
+    handed to every waiter as they are, so they must not be mutated.
+
+    The group is meant to be used from a single event loop and is not thread-safe.
+    """
+
+    def __init__(self, timeout: float, enabled: bool = True) -> None:
+        self.timeout = timeout
+        self.enabled = enabled
+        self._calls: dict[K, asyncio.Future[V]] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        self.calls += 1
+        if not self.enabled:
+            return await func()
+
+        while (call := self._calls.get(key)) is not None:
+            try:
+                result = await asyncio.wait_for(asyncio.shield(call), self.timeout)
+            except TimeoutError:
+                self.timeouts += 1
+                return await func()
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise  # this waiter was cancelled, not the leader
+                continue
+
+            self.coalesced += 1
+            return result
+
+        return await self._lead(key, func)
+
+    async def _lead(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        call: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result = await func()
+        except BaseException:
+            # Waiters retry on their own rather than share an error they might not run into.
+            call.cancel()
+            raise
+        finally:
+            del self._calls[key]
+
+        call.set_result(result)
+        return result
@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 import logging
 
 from fastapi import (
@@ -5,16 +7,72 @@ from fastapi import (
     FastAPI,
     status,
 )
-from fastapi.responses import JSONResponse
 
+from auth_service.api.admin.v1.users import router as admin_users_router
 from auth_service.api.health import router as health_router
+from auth_service.api.metrics import router as metrics_router
 from auth_service.api.public.v1.auth import router as auth_router
+from auth_service.api.public.v1.sessions import router as sessions_router
+from auth_service.api.well_known import router as well_known_router
 from auth_service.core.config import settings
+from auth_service.core.database import (
+    async_engine,
+    replica_set,
+)
 from auth_service.core.errors import BaseApiError
+from auth_service.core.metrics import (
+    MetricsMiddleware,
+    metrics_directory,
+)
+from auth_service.core.responses import PydanticJSONResponse
+from auth_service.core.security import (
+    password_hash_executor,
+    prepare_dummy_password_hash,
+)
+from auth_service.services.access_token_revocation import access_token_revocation_sync
+from auth_service.services.phone_filter import build_phone_filter
+from auth_service.services.refresh_token_batcher import refresh_token_insert_batcher
+from auth_service.services.refresh_token_sweeper import refresh_token_sweeper
+from auth_service.services.session_activity import session_activity
+from auth_service.services.user_import import user_import_hash_executor
 
 logger = logging.getLogger(__name__)
 
 
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    await password_hash_executor.start()
+    if settings.sign_in_uniform_latency:
+        await prepare_dummy_password_hash()
+    try:
+        await access_token_revocation_sync.poll()
+    except Exception:  # noqa: B902
+        logger.exception('Failed to load revoked access tokens')
+    background_tasks = [
+        asyncio.create_task(access_token_revocation_sync.run_forever()),
+        asyncio.create_task(session_activity.run_forever()),
+    ]
+    if metrics_directory is not None:
+        background_tasks.append(asyncio.create_task(metrics_directory.run_forever()))
+    if replica_set.engines:
+        background_tasks.append(asyncio.create_task(replica_set.run_health_checks()))
+    if settings.phone_filter_enabled:
+        background_tasks.append(asyncio.create_task(build_phone_filter()))
+    if settings.refresh_token_sweeper_enabled:
+        background_tasks.append(asyncio.create_task(refresh_token_sweeper.run_forever()))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await refresh_token_insert_batcher.close()
+    await replica_set.dispose()
+    await async_engine.dispose()
+    password_hash_executor.shutdown()
+    user_import_hash_executor.shutdown()
+
+
 def create_application() -> FastAPI:
     """
     Create an application.
@@ -22,31 +80,40 @@ def create_application() -> FastAPI:
     Returns:
         The application as `FastAPI`.
     """
-    app = FastAPI(debug=settings.debug)
+    app = FastAPI(debug=settings.debug, lifespan=lifespan, default_response_class=PydanticJSONResponse)
+    app.add_middleware(MetricsMiddleware)
 
     @app.exception_handler(BaseApiError)
     async def base_api_error_handler(request, exc: BaseApiError):
-        return JSONResponse(
+        return PydanticJSONResponse(
             status_code=exc.status_code,
             content={
                 'details': exc.message,
                 'error_code': exc.error_code,
             },
+            headers=exc.headers,
         )
 
     @app.exception_handler(Exception)
     async def internal_error_handler(request, exc: Exception):
         logger.error('Unhandled exception', exc_info=True)
-        return JSONResponse(
+        return PydanticJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={'details': 'Server error'},
         )
 
     v1_router = APIRouter(prefix='/api/v1')
     v1_router.include_router(auth_router)
+    v1_router.include_router(sessions_router)
+
+    admin_v1_router = APIRouter(prefix='/api/admin/v1')
+    admin_v1_router.include_router(admin_users_router)
 
     app.include_router(health_router)
+    app.include_router(metrics_router)
+    app.include_router(well_known_router)
     app.include_router(v1_router)
+    app.include_router(admin_v1_router)
 
     return app
 
@@ -1,7 +1,15 @@
-from auth_service.models.m2m import RefreshToken
+from auth_service.models.m2m import (
+    OpaqueAccessToken,
+    RefreshToken,
+    RevokedAccessToken,
+    RotatedRefreshToken,
+)
 from auth_service.models.users import User
 
 __all__ = (
+    'OpaqueAccessToken',
     'RefreshToken',
+    'RevokedAccessToken',
+    'RotatedRefreshToken',
     'User',
 )
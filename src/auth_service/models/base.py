@@ -24,6 +24,7 @@ class BaseModel(ModelBaseDeclarative):
 
 class BaseTimestampModel(BaseModel):
     __abstract__ = True
+    __mapper_args__ = {'eager_defaults': True}  # fetch server-side timestamps with RETURNING on flush
 
     created_at: Mapped[datetime] = mapped_column(
         server_default=func.current_timestamp(),
@@ -3,7 +3,9 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     ForeignKey,
+    LargeBinary,
     String,
     func,
 )
@@ -14,8 +16,11 @@ from sqlalchemy.orm import (
 )
 
 from auth_service.core.config import settings
+from auth_service.core.database import ModelBaseDeclarative
 from auth_service.models.base import BaseModel
 
+USER_AGENT_MAX_LENGTH = 256
+
 
 class RefreshToken(BaseModel):
     __tablename__ = 'refresh_tokens'
@@ -25,11 +30,90 @@ class RefreshToken(BaseModel):
         ForeignKey('users.id', ondelete='CASCADE'),
         index=True,
     )
-    hashed_token: Mapped[str] = mapped_column(String(128), unique=True)
+    # Nullable only while rows from before the BYTEA migration may lack it.
+    token_digest: Mapped[bytes] = mapped_column(
+        LargeBinary(32),
+        index=True,
+        unique=True,
+        nullable=settings.refresh_token_legacy_digest,
+    )
+    if settings.refresh_token_legacy_digest:
+        # Hex digest column, mapped only while `refresh_token_legacy_digest` is on; dropped by the contract migration.
+        legacy_hashed_token: Mapped[str | None] = mapped_column('hashed_token', String(128), unique=True)
     created_at: Mapped[datetime] = mapped_column(
         server_default=func.current_timestamp(),
+        index=True,
     )
+    # Shared by a sign-in's token and all its rotations; NULL on pre-family tokens, whose family is their own id.
+    family_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), index=True)
+    # When the family's first token was issued, carried over on every rotation; NULL on tokens from before it was kept.
+    family_created_at: Mapped[datetime | None] = mapped_column(server_default=func.current_timestamp())
+    # Session metadata, carried over to the replacement token on every rotation.
+    user_agent: Mapped[str | None] = mapped_column(String(USER_AGENT_MAX_LENGTH))
+    ip_address: Mapped[str | None] = mapped_column(String(45))
+    last_used_at: Mapped[datetime | None] = mapped_column()
 
     @property
     def is_expired(self) -> bool:
         return int(self.created_at.timestamp()) < time.time() - settings.refresh_token_life_time
+
+    @property
+    def session_id(self) -> uuid.UUID:
+        """The family is the session: its id stays the same while the token is rotated."""
+        return self.family_id or self.id
+
+    @property
+    def session_created_at(self) -> datetime:
+        return self.family_created_at or self.created_at
+
+
+class RevokedAccessToken(ModelBaseDeclarative):
+    """Access token revoked before its expiry; kept only until `exp`, after which the token is rejected anyway."""
+
+    __tablename__ = 'revoked_access_tokens'
+
+    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    exp: Mapped[int] = mapped_column(BigInteger, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.current_timestamp(),
+        index=True,
+    )
+
+
+class RotatedRefreshToken(ModelBaseDeclarative):
+    """
+    Tombstone of a rotated refresh token, so presenting it again can be told apart from presenting an unknown token.
+
+    Only the first 8 bytes of the digest are kept: a tombstone is looked up on the reuse path alone, and a rotated
+    token is expired anyway once its tombstone is older than the refresh token lifetime, so rows are purged then.
+    """
+
+    __tablename__ = 'rotated_refresh_tokens'
+
+    digest_prefix: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    family_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
+    rotated_at: Mapped[datetime] = mapped_column(
+        server_default=func.current_timestamp(),
+        index=True,
+    )
+
+
+class OpaqueAccessToken(ModelBaseDeclarative):
+    """
+    Opaque access token, looked up by the SHA-256 digest of the token on a miss of the in-process token table.
+
+    Carries the same claims as a JWT access token; revoked like one through `revoked_access_tokens`, by `jti`.
+    """
+
+    __tablename__ = 'opaque_access_tokens'
+
+    token_digest: Mapped[bytes] = mapped_column(LargeBinary(32), primary_key=True)
+    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey('users.id', ondelete='CASCADE'),
+        index=True,
+    )
+    session_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    iat: Mapped[int] = mapped_column(BigInteger)
+    exp: Mapped[int] = mapped_column(BigInteger, index=True)
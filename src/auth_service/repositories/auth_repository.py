@@ -1,21 +1,215 @@
+import time
 import uuid
+from datetime import (
+    datetime,
+    timedelta,
+)
+from typing import Hashable
 
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Engine,
+    Float,
+    LargeBinary,
+    Row,
+    Select,
+    String,
+    any_,
+    bindparam,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    table,
+    text,
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    UUID,
+    insert as pg_insert,
+)
 from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
+from uuid6 import uuid7
 
-from auth_service.models.m2m import RefreshToken
+from auth_service.core.config import settings
+from auth_service.core.database import RoutingSession
+from auth_service.core.metrics import (
+    DB_QUERY_DURATION,
+    Counter,
+    registry,
+    timed,
+)
+from auth_service.core.single_flight import SingleFlight
+from auth_service.models.m2m import (
+    USER_AGENT_MAX_LENGTH,
+    OpaqueAccessToken,
+    RefreshToken,
+    RevokedAccessToken,
+    RotatedRefreshToken,
+)
 from auth_service.models.users import User
 from auth_service.repositories.base import BaseRepository
 from auth_service.schemas.dto.users import UserCreateData
 
 
+def _refresh_token_expiry_cutoff():
+    """Tokens created at or before this moment are expired."""
+    return func.current_timestamp() - timedelta(seconds=settings.refresh_token_life_time)
+
+
+def _refresh_token_reuse_grace_cutoff():
+    """Tokens rotated after this moment are still in their reuse grace period."""
+    return func.current_timestamp() - timedelta(seconds=settings.refresh_token_reuse_grace_period)
+
+
+def _refresh_token_digest_matches(token_digest: bytes) -> ColumnElement[bool]:
+    if settings.refresh_token_legacy_digest:
+        # Rows written before the BYTEA migration (or by not yet upgraded replicas) only have the hex digest.
+        return or_(RefreshToken.token_digest == token_digest, RefreshToken.legacy_hashed_token == token_digest.hex())
+    return RefreshToken.token_digest == token_digest
+
+
+def _digest_prefix(token_digest: bytes) -> int:
+    """The key of a rotated token's tombstone: the first 8 digest bytes as a signed BIGINT."""
+    return int.from_bytes(token_digest[:8], 'big', signed=True)
+
+
+def _truncate_user_agent(user_agent: str | None) -> str | None:
+    return user_agent[:USER_AGENT_MAX_LENGTH] if user_agent is not None else None
+
+
+def new_refresh_token_values(
+    user_id: uuid.UUID,
+    token_digest: bytes,
+    user_agent: str | None = None,
+    ip_address: str | None = None,
+) -> dict:
+    """Column values of a refresh token that starts a new session and token family."""
+    token_id = uuid7()
+    values = {
+        'id': token_id,
+        'family_id': token_id,
+        'user_id': user_id,
+        'token_digest': token_digest,
+        'user_agent': _truncate_user_agent(user_agent),
+        'ip_address': ip_address,
+    }
+    if settings.refresh_token_legacy_digest:
+        values['legacy_hashed_token'] = token_digest.hex()
+    return values
+
+
+def _session_id() -> ColumnElement[uuid.UUID]:
+    return func.coalesce(RefreshToken.family_id, RefreshToken.id)
+
+
+def _opaque_access_token_select(*columns: ColumnElement) -> Select:
+    revoked = exists().where(RevokedAccessToken.jti == OpaqueAccessToken.jti)
+    return select(
+        *columns,
+        OpaqueAccessToken.jti,
+        OpaqueAccessToken.user_id,
+        OpaqueAccessToken.session_id,
+        OpaqueAccessToken.iat,
+        OpaqueAccessToken.exp,
+        revoked.label('revoked'),
+    )
+
+
+# Postgres NOTIFY channel that carries `<jti>:<exp>` for every committed access token revocation.
+REVOKED_ACCESS_TOKENS_CHANNEL = 'revoked_access_tokens'
+
+_USER_IMPORT_COLUMNS = ['id', 'first_name', 'last_name', 'phone', 'hashed_password', 'is_phone_verified', 'is_active']
+
+
+# Concurrent lookups of the same user on the same replica, e.g. the parallel calls of a waking mobile client or a
+# sign-in retry storm, share one query. Replica reads may lag anyway, so sharing a result a few ms old changes nothing;
+# reads on the primary are never shared, since they may see the reading session's own uncommitted writes.
+user_by_id_lookups: SingleFlight[tuple[Engine, uuid.UUID], dict | None] = SingleFlight(
+    timeout=settings.single_flight_timeout,
+    enabled=settings.single_flight_enabled,
+)
+user_by_phone_lookups: SingleFlight[tuple[Engine, str], dict | None] = SingleFlight(
+    timeout=settings.single_flight_timeout,
+    enabled=settings.single_flight_enabled,
+)
+
+for _name, _lookups in (('get_user_by_id', user_by_id_lookups), ('get_user_by_phone', user_by_phone_lookups)):
+    registry.register(
+        Counter(
+            f'db_{_name}_coalesced_total',
+            f'`{_name}` calls served by a concurrent identical query instead of their own.',
+            callback=lambda lookups=_lookups: lookups.coalesced,
+        )
+    )
+    registry.register(
+        Counter(
+            f'db_{_name}_coalesce_timeouts_total',
+            f'`{_name}` calls that gave up waiting for a concurrent identical query and ran their own.',
+            callback=lambda lookups=_lookups: lookups.timeouts,
+        )
+    )
+
+
 class AuthRepository(BaseRepository):
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_user_by_phone')
     async def get_user_by_phone(self, phone_number: str) -> User | None:
-        result = await self.session.execute(select(User).where(User.phone == phone_number))
-        return result.scalar_one_or_none()
+        return await self._get_user(user_by_phone_lookups, phone_number, User.phone == phone_number)
 
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_user_by_id')
     async def get_user_by_id(self, user_id: uuid.UUID) -> User | None:
-        result = await self.session.execute(select(User).where(User.id == user_id))
-        return result.scalar_one_or_none()
+        return await self._get_user(user_by_id_lookups, user_id, User.id == user_id)
+
+    async def _get_user(self, lookups: SingleFlight, key: Hashable, condition: ColumnElement[bool]) -> User | None:
+        statement = select(User).where(condition).execution_options(use_replica=True)
+        session = self.session.sync_session
+        replica = session.replica_bind(statement) if isinstance(session, RoutingSession) else None
+        if replica is None:
+            result = await self.session.execute(statement)
+            return result.scalar_one_or_none()
+
+        user = await lookups.do((replica, key), lambda: self._select_user_snapshot(statement, replica))
+        return await self._attach_user(user)
+
+    async def _select_user_snapshot(self, statement: Select, replica: Engine) -> dict | None:
+        """Load one user from `replica` and return its column values, which concurrent lookups can share safely."""
+        result = await self.session.execute(statement, bind_arguments={'bind': replica})
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+        return {column.key: getattr(user, column.key) for column in User.__mapper__.column_attrs}
+
+    async def _attach_user(self, snapshot: dict | None) -> User | None:
+        """
+        Return this session's instance of a shared user snapshot without a query, so callers may modify it as usual.
+        """
+        if snapshot is None:
+            return None
+
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await self.session.merge(user, load=False)
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_user_statuses')
+    async def get_user_statuses(self, user_ids: list[uuid.UUID]) -> dict[uuid.UUID, Row]:
+        """
+        Load the active and verified flags of many users in one query.
+
+        Returns:
+            `(id, is_active, is_phone_verified)` rows by user id; missing users are left out.
+        """
+        # A single array parameter keeps one prepared statement for any number of ids, unlike IN (...).
+        result = await self.session.execute(
+            select(User.id, User.is_active, User.is_phone_verified)
+            .where(User.id == any_(literal(user_ids, ARRAY(UUID(as_uuid=True)))))
+            .execution_options(use_replica=True)
+        )
+        return {row.id: row for row in result}
 
     async def create_user(self, data: UserCreateData) -> User:
         user = User(
@@ -25,23 +219,407 @@ class AuthRepository(BaseRepository):
             hashed_password=data.hashed_password,
         )
         self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
         return user
 
-    async def create_refresh_token(self, user_id: uuid.UUID, hashed_token: str):
-        self.session.add(
-            RefreshToken(
+    @timed(DB_QUERY_DURATION, method='AuthRepository.insert_user_if_phone_free')
+    async def insert_user_if_phone_free(self, data: UserCreateData) -> User | None:
+        """
+        Insert the user in one statement, doing nothing if the phone is taken.
+
+        Returns:
+            The new user, or None if the phone is already registered.
+        """
+        result = await self.session.scalars(
+            pg_insert(User)
+            .values(
+                first_name=data.first_name,
+                last_name=data.last_name,
+                phone=data.phone,
+                hashed_password=data.hashed_password,
+            )
+            .on_conflict_do_nothing(index_elements=[User.phone])
+            .returning(User)
+        )
+        return result.one_or_none()
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_registered_phones')
+    async def get_registered_phones(self, phones: list[str]) -> set[str]:
+        result = await self.session.scalars(select(User.phone).where(User.phone.in_(phones)))
+        return set(result)
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.copy_users')
+    async def copy_users(self, users: list[UserCreateData]) -> set[str]:
+        """
+        Bulk insert users: COPY them into a temporary table, then move them over skipping taken phones.
+
+        Returns:
+            The phones of the inserted users.
+        """
+        await self.session.execute(
+            text('CREATE TEMPORARY TABLE users_import (LIKE users INCLUDING DEFAULTS) ON COMMIT DROP')
+        )
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            'users_import',
+            records=[
+                (uuid7(), user.first_name, user.last_name, user.phone, user.hashed_password, False, True)
+                for user in users
+            ],
+            columns=_USER_IMPORT_COLUMNS,
+        )
+        result = await self.session.scalars(
+            pg_insert(User)
+            .from_select(
+                _USER_IMPORT_COLUMNS,
+                select(*map(column, _USER_IMPORT_COLUMNS)).select_from(table('users_import')),
+            )
+            .on_conflict_do_nothing(index_elements=[User.phone])
+            .returning(User.phone)
+        )
+        inserted_phones = set(result)
+        await self.session.execute(text('DROP TABLE users_import'))
+        return inserted_phones
+
+    async def update_user_password(self, user: User, hashed_password: str) -> None:
+        user.hashed_password = hashed_password
+
+    async def create_refresh_token(
+        self,
+        user_id: uuid.UUID,
+        token_digest: bytes,
+        user_agent: str | None = None,
+        ip_address: str | None = None,
+    ) -> uuid.UUID:
+        """Stage a new refresh token and return its id, which also identifies the session."""
+        token = RefreshToken(
+            **new_refresh_token_values(
                 user_id=user_id,
-                hashed_token=hashed_token,
+                token_digest=token_digest,
+                user_agent=user_agent,
+                ip_address=ip_address,
             )
         )
-        await self.session.commit()
+        self.session.add(token)
+        return token.id
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.insert_refresh_tokens')
+    async def insert_refresh_tokens(self, values: list[dict]) -> None:
+        """Insert many refresh tokens, built by `new_refresh_token_values`, in one multi-row INSERT."""
+        await self.session.execute(insert(RefreshToken), values)
 
-    async def get_refresh_token(self, hashed_token: str) -> RefreshToken | None:
-        result = await self.session.execute(select(RefreshToken).where(RefreshToken.hashed_token == hashed_token))
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_refresh_token')
+    async def get_refresh_token(self, token_digest: bytes) -> RefreshToken | None:
+        result = await self.session.execute(select(RefreshToken).where(_refresh_token_digest_matches(token_digest)))
         return result.scalar_one_or_none()
 
+    @timed(DB_QUERY_DURATION, method='AuthRepository.delete_refresh_token')
     async def delete_refresh_token(self, token: RefreshToken) -> None:
         await self.session.delete(token)
-        await self.session.commit()
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.rotate_refresh_token')
+    async def rotate_refresh_token(
+        self,
+        token_digest: bytes,
+        new_token_digest: bytes,
+        user_agent: str | None = None,
+        ip_address: str | None = None,
+    ) -> Row | None:
+        """
+        Atomically consume an unexpired refresh token and store its replacement.
+
+        Both happen in one `WITH ... DELETE ... RETURNING` statement, so a token can be rotated only once even under
+        concurrent requests. The replacement joins the consumed token's family and keeps its session metadata, updated
+        with the given client's, and is marked as used now. The same statement leaves a tombstone of the consumed
+        token, so replaying it later is recognized as reuse.
+
+        Returns:
+            `(user_id, family_id)` of the replacement, the family id being the session id, or None if the token does
+            not exist or has expired.
+        """
+        consumed_token = (
+            delete(RefreshToken)
+            .where(
+                _refresh_token_digest_matches(token_digest),
+                RefreshToken.created_at > _refresh_token_expiry_cutoff(),
+            )
+            .returning(
+                RefreshToken.user_id,
+                func.coalesce(RefreshToken.family_id, RefreshToken.id).label('family_id'),
+                func.coalesce(RefreshToken.family_created_at, RefreshToken.created_at).label('family_created_at'),
+                RefreshToken.user_agent,
+                RefreshToken.ip_address,
+            )
+            .cte('consumed_token')
+        )
+        tombstone = (
+            pg_insert(RotatedRefreshToken)
+            .from_select(
+                ['digest_prefix', 'family_id'],
+                select(literal(_digest_prefix(token_digest), BigInteger()), consumed_token.c.family_id),
+            )
+            # A prefix collision with a live tombstone must not fail the rotation; the older tombstone wins.
+            .on_conflict_do_nothing()
+            .cte('tombstone')
+        )
+        columns = {
+            'id': literal(uuid7(), UUID(as_uuid=True)),
+            'family_id': consumed_token.c.family_id,
+            'family_created_at': consumed_token.c.family_created_at,
+            'user_id': consumed_token.c.user_id,
+            'token_digest': literal(new_token_digest, LargeBinary()),
+            'user_agent': func.coalesce(
+                literal(_truncate_user_agent(user_agent), String()),
+                consumed_token.c.user_agent,
+            ),
+            'ip_address': func.coalesce(literal(ip_address, String()), consumed_token.c.ip_address),
+            'last_used_at': func.current_timestamp(),
+        }
+        if settings.refresh_token_legacy_digest:
+            columns['hashed_token'] = literal(new_token_digest.hex(), String())
+        result = await self.session.execute(
+            insert(RefreshToken)
+            .add_cte(tombstone)
+            .from_select(list(columns), select(*columns.values()))
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+        )
+        return result.one_or_none()
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.revoke_rotated_refresh_token_family')
+    async def revoke_rotated_refresh_token_family(self, token_digest: bytes) -> Row | None:
+        """
+        If the token was already rotated, delete every token of its family in one statement.
+
+        A token rotated less than `refresh_token_reuse_grace_period` seconds ago is left alone: that is a client that
+        retried or raced its own refresh, e.g. on a flaky mobile connection, and the winner's new token must survive.
+
+        Returns:
+            `(user_id, family_id)` of the revoked family, or None if the token has no tombstone older than the grace
+            period or the family is empty.
+        """
+        family = (
+            select(RotatedRefreshToken.family_id)
+            .where(
+                RotatedRefreshToken.digest_prefix == _digest_prefix(token_digest),
+                RotatedRefreshToken.rotated_at <= _refresh_token_reuse_grace_cutoff(),
+            )
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.family_id == family)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.first()
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.purge_expired_rotated_refresh_tokens')
+    async def purge_expired_rotated_refresh_tokens(self, limit: int) -> int:
+        """
+        Delete up to `limit` tombstones of tokens that would have expired by now, oldest first.
+
+        Returns:
+            The number of deleted tombstones.
+        """
+        expired_tombstones = (
+            select(RotatedRefreshToken.digest_prefix)
+            .where(RotatedRefreshToken.rotated_at <= _refresh_token_expiry_cutoff())
+            .order_by(RotatedRefreshToken.rotated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            delete(RotatedRefreshToken)
+            .where(RotatedRefreshToken.digest_prefix.in_(expired_tombstones))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_sessions')
+    async def get_sessions(self, user_id: uuid.UUID, limit: int, after: uuid.UUID | None = None) -> list[RefreshToken]:
+        """
+        Return a page of the user's unexpired refresh tokens, one per session, newest session first.
+
+        Keyset pagination on the session id, which is kept through rotations: family ids are UUIDv7 and so ordered by
+        the session's start, and `after` is the last session id of the previous page.
+        """
+        query = select(RefreshToken).where(
+            RefreshToken.user_id == user_id,
+            RefreshToken.created_at > _refresh_token_expiry_cutoff(),
+        )
+        if after is not None:
+            query = query.where(_session_id() < after)
+        result = await self.session.scalars(query.order_by(_session_id().desc()).limit(limit))
+        return list(result)
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.delete_sessions')
+    async def delete_sessions(self, user_id: uuid.UUID, keep_id: uuid.UUID | None = None) -> int:
+        """
+        Delete all the user's refresh tokens, except the one of session `keep_id`, in one statement.
+
+        Returns:
+            The number of deleted tokens.
+        """
+        query = delete(RefreshToken).where(RefreshToken.user_id == user_id)
+        if keep_id is not None:
+            # Access tokens issued before sessions were keyed by family carry the token id as their session id.
+            query = query.where(_session_id() != keep_id, RefreshToken.id != keep_id)
+        result = await self.session.execute(query.execution_options(synchronize_session=False))
+        return result.rowcount
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.update_sessions_last_used')
+    async def update_sessions_last_used(self, last_used: dict[uuid.UUID, float]) -> int:
+        """
+        Set `last_used_at` of many sessions' refresh tokens in one statement, from Unix timestamps by session id.
+
+        Returns:
+            The number of updated tokens; sessions deleted in the meantime are skipped.
+        """
+        result = await self.session.execute(
+            text("""
+                UPDATE refresh_tokens SET last_used_at = used.at
+                FROM (
+                    SELECT id, to_timestamp(at)::timestamp AS at FROM unnest(:ids, :timestamps) AS used(id, at)
+                ) AS used
+                WHERE (refresh_tokens.family_id = used.id OR refresh_tokens.id = used.id)
+                AND (refresh_tokens.last_used_at IS NULL OR refresh_tokens.last_used_at < used.at)
+                """).bindparams(
+                bindparam('ids', list(last_used), type_=ARRAY(UUID(as_uuid=True))),
+                bindparam('timestamps', list(last_used.values()), type_=ARRAY(Float())),
+            )
+        )
+        return result.rowcount
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.purge_expired_refresh_tokens')
+    async def purge_expired_refresh_tokens(self, limit: int) -> int:
+        """
+        Delete up to `limit` expired refresh tokens, oldest first, walking the `created_at` index.
+
+        Rows locked by concurrent requests are skipped and picked up by a later batch.
+
+        Returns:
+            The number of deleted tokens.
+        """
+        expired_tokens = (
+            select(RefreshToken.id)
+            .where(RefreshToken.created_at <= _refresh_token_expiry_cutoff())
+            .order_by(RefreshToken.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            delete(RefreshToken).where(RefreshToken.id.in_(expired_tokens)).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.revoke_access_token')
+    async def revoke_access_token(self, jti: uuid.UUID, exp: int) -> None:
+        """
+        Store the revocation and, in the same statement, notify every listening process once the transaction commits.
+        """
+        revoked_token = (
+            pg_insert(RevokedAccessToken)
+            .values(jti=jti, exp=exp)
+            .on_conflict_do_nothing()
+            .returning(RevokedAccessToken.jti)
+            .cte('revoked_token')
+        )
+        await self.session.execute(
+            select(func.pg_notify(REVOKED_ACCESS_TOKENS_CHANNEL, f'{jti}:{exp}')).select_from(revoked_token)
+        )
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_revoked_access_tokens')
+    async def get_revoked_access_tokens(self, created_after: datetime | None = None) -> list[Row]:
+        """
+        Returns:
+            `(jti, exp, created_at)` of revocations whose tokens have not expired, optionally only the newer ones.
+        """
+        query = select(RevokedAccessToken.jti, RevokedAccessToken.exp, RevokedAccessToken.created_at).where(
+            RevokedAccessToken.exp > int(time.time())
+        )
+        if created_after is not None:
+            query = query.where(RevokedAccessToken.created_at > created_after)
+        result = await self.session.execute(query)
+        return list(result)
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.purge_expired_revoked_access_tokens')
+    async def purge_expired_revoked_access_tokens(self) -> int:
+        result = await self.session.execute(
+            delete(RevokedAccessToken)
+            .where(RevokedAccessToken.exp <= int(time.time()))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def create_opaque_access_token(
+        self,
+        token_digest: bytes,
+        jti: uuid.UUID,
+        user_id: uuid.UUID,
+        session_id: uuid.UUID | None,
+        iat: int,
+        exp: int,
+    ) -> None:
+        self.session.add(
+            OpaqueAccessToken(
+                token_digest=token_digest,
+                jti=jti,
+                user_id=user_id,
+                session_id=session_id,
+                iat=iat,
+                exp=exp,
+            )
+        )
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_opaque_access_token')
+    async def get_opaque_access_token(self, token_digest: bytes) -> Row | None:
+        """
+        Look the token up by its primary key, on the primary so a token issued a moment ago by another process is found.
+
+        Returns:
+            `(jti, user_id, session_id, iat, exp, revoked)`, or None if there is no such token.
+        """
+        result = await self.session.execute(
+            _opaque_access_token_select().where(OpaqueAccessToken.token_digest == token_digest)
+        )
+        return result.one_or_none()
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.get_opaque_access_tokens')
+    async def get_opaque_access_tokens(self, token_digests: list[bytes]) -> dict[bytes, Row]:
+        """
+        Look many tokens up by their primary keys in one query, on the primary like `get_opaque_access_token`.
+
+        Returns:
+            `(token_digest, jti, user_id, session_id, iat, exp, revoked)` rows by digest; unknown tokens are left out.
+        """
+        result = await self.session.execute(
+            _opaque_access_token_select(OpaqueAccessToken.token_digest).where(
+                OpaqueAccessToken.token_digest == any_(literal(token_digests, ARRAY(LargeBinary())))
+            )
+        )
+        return {row.token_digest: row for row in result}
+
+    @timed(DB_QUERY_DURATION, method='AuthRepository.purge_expired_opaque_access_tokens')
+    async def purge_expired_opaque_access_tokens(self, limit: int) -> int:
+        """
+        Delete up to `limit` expired opaque access tokens, walking the `exp` index.
+
+        Returns:
+            The number of deleted tokens.
+        """
+        expired_tokens = (
+            select(OpaqueAccessToken.token_digest)
+            .where(OpaqueAccessToken.exp <= int(time.time()))
+            .order_by(OpaqueAccessToken.exp)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            delete(OpaqueAccessToken)
+            .where(OpaqueAccessToken.token_digest.in_(expired_tokens))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -1,6 +1,10 @@
-from auth_service.core.database import DatabaseSession
+from auth_service.core.database import DatabaseUnitOfWork
 
 
 class BaseRepository:
-    def __init__(self, session: DatabaseSession) -> None:
-        self.session = session
+    def __init__(self, unit_of_work: DatabaseUnitOfWork) -> None:
+        self.unit_of_work = unit_of_work
+        self.session = unit_of_work.session
+
+    async def flush(self) -> None:
+        await self.unit_of_work.flush()
@@ -13,6 +13,7 @@ class JwtSchema(BaseModel):
     jti: uuid.UUID
     token_type: str
     iss: str = 'auth-service'
+    sid: uuid.UUID | None = None  # the session (refresh token family) this token was issued for
 
     model_config = ConfigDict(from_attributes=True)
 
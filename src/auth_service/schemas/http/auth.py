@@ -1,4 +1,5 @@
 import re
+import uuid
 
 from pydantic import (
     BaseModel,
@@ -6,6 +7,7 @@ from pydantic import (
     field_validator,
 )
 
+from auth_service.core.config import settings
 from auth_service.schemas.custom_types import (
     PasswordStr,
     PhoneStr,
@@ -50,3 +52,21 @@ class RefreshTokenRequestSchema(BaseModel):
 
 class LogoutRequestSchema(RefreshTokenRequestSchema):
     pass
+
+
+class IntrospectRequestSchema(BaseModel):
+    tokens: list[str] = Field(min_length=1, max_length=settings.introspect_max_tokens)
+    include_user: bool = False  # also report whether each token's user is active and phone-verified
+
+
+class TokenIntrospectionSchema(BaseModel):
+    active: bool  # the token is valid, unexpired and not revoked
+    revoked: bool = False
+    sub: uuid.UUID | None = None
+    exp: int | None = None
+    user_active: bool | None = None  # with `include_user`; None if the user no longer exists
+    user_phone_verified: bool | None = None
+
+
+class IntrospectResponseSchema(BaseModel):
+    tokens: list[TokenIntrospectionSchema]  # in request order
@@ -0,0 +1,18 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SessionSchema(BaseModel):
+    id: uuid.UUID  # stays the same while the session's refresh token is rotated
+    user_agent: str | None
+    ip_address: str | None
+    created_at: datetime  # when the session started, i.e. its first refresh token was issued
+    last_used_at: datetime | None
+    current: bool = False  # the session of the access token used for this request
+
+
+class SessionPageSchema(BaseModel):
+    sessions: list[SessionSchema]
+    next_cursor: uuid.UUID | None = None  # pass as `after` to get the next page
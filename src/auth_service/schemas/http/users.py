@@ -4,8 +4,14 @@ from datetime import datetime
 from pydantic import (
     BaseModel,
     ConfigDict,
+    field_validator,
+    model_validator,
 )
 
+from auth_service.core.security import is_password_hash
+from auth_service.schemas.custom_types import PasswordStr
+from auth_service.schemas.http.auth import SignUpRequestSchema
+
 
 class UserSchema(BaseModel):
     id: uuid.UUID
@@ -18,3 +24,34 @@ class UserSchema(BaseModel):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserImportRowSchema(SignUpRequestSchema):
+    """One imported user: the sign-up fields, with either a plain password or an existing bcrypt/argon2 hash."""
+
+    password: PasswordStr | None = None
+    hashed_password: str | None = None
+
+    @field_validator('hashed_password')
+    @classmethod
+    def validate_hashed_password(cls, value: str | None) -> str | None:
+        if value is not None and not is_password_hash(value):
+            raise ValueError('Must be a bcrypt or argon2 hash')
+        return value
+
+    @model_validator(mode='after')
+    def validate_password_or_hash(self) -> 'UserImportRowSchema':
+        if (self.password is None) == (self.hashed_password is None):
+            raise ValueError('Exactly one of password and hashed_password is required')
+        return self
+
+
+class UserImportErrorSchema(BaseModel):
+    line: int
+    phone: str | None = None
+    error: str
+
+
+class UserImportReportSchema(BaseModel):
+    imported: int = 0
+    failed: int = 0
@@ -0,0 +1,173 @@
+"""
+Run the service with N uvicorn workers on uvloop and httptools.
+
+Each worker holds one `LISTEN` connection and a pool with an equal share of what is left of `DATABASE_POOL_MAX_SIZE`
+(and of `DATABASE_REPLICA_POOL_MAX_SIZE` per replica), so the whole server never holds more connections than
+configured; the settings are rejected if that leaves a worker without a pool connection. On SIGTERM or SIGINT the
+workers stop accepting connections, drain in-flight requests for up to `--graceful-timeout` seconds and close their
+database pools. With more than one worker, `METRICS_MULTIPROCESS_DIR` must be set so that `/metrics` covers all
+workers.
+
+Usage:
+    python -m auth_service.serve [--workers 4] [--host 0.0.0.0] [--port 8000] [--preload] [--graceful-timeout 30]
+        [--forwarded-allow-ips 10.0.0.0/8]
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+logger = logging.getLogger('uvicorn.error')
+
+APPLICATION = 'auth_service.main:application'
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Run the auth service.')
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument(
+        '--preload',
+        action=argparse.BooleanOptionalAction,
+        help='Import the app once and fork the workers from it, instead of importing it in every worker.',
+    )
+    parser.add_argument('--graceful-timeout', type=int)
+    parser.add_argument(
+        '--forwarded-allow-ips',
+        type=lambda value: value.split(','),
+        help='Comma-separated IPs or networks of the proxies whose X-Forwarded-For header sets the client address.',
+    )
+
+    # Every process sizes its database pools from SERVER_WORKERS when the settings are created, so the worker count
+    # goes into the environment (inherited by the workers) before the settings are imported.
+    workers = parser.parse_known_args()[0].workers
+    if workers is not None:
+        os.environ['SERVER_WORKERS'] = str(workers)
+    from auth_service.core.config import settings
+
+    parser.set_defaults(
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=settings.server_workers,
+        preload=settings.server_preload,
+        graceful_timeout=settings.server_graceful_timeout,
+        forwarded_allow_ips=settings.server_forwarded_allow_ips,
+    )
+    return parser.parse_args()
+
+
+def build_config(args: argparse.Namespace) -> uvicorn.Config:
+    return uvicorn.Config(
+        APPLICATION,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop='uvloop',
+        http='httptools',
+        lifespan='on',
+        timeout_graceful_shutdown=args.graceful_timeout,
+        # Behind a load balancer the peer is the proxy; the client address, e.g. for the per-IP sign-in limit, is taken
+        # from X-Forwarded-For of trusted proxies only, since anyone else could set the header to dodge the limit.
+        proxy_headers=True,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+    )
+
+
+class PreforkSupervisor:
+    """
+    Load the application in this process, then fork the workers from it.
+
+    Workers share the imported code and module-level state copy-on-write and skip the import on start and restart.
+    Nothing in the import opens a connection, starts a thread or creates an event loop, so forking after it is safe.
+    A worker that dies is replaced; SIGINT and SIGTERM are passed on to every worker, which shuts down gracefully.
+    """
+
+    def __init__(self, config: uvicorn.Config, workers: int) -> None:
+        self.config = config
+        self.workers = workers
+        self._pids: set[int] = set()
+        self._should_exit = False
+
+    def run(self) -> None:
+        self.config.load()
+        sock = self.config.bind_socket()
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        logger.info('Started supervisor process [%d] with %d preloaded workers', os.getpid(), self.workers)
+
+        for _ in range(self.workers):
+            self._spawn(sock)
+        while self._pids:
+            pid, status = os.waitpid(-1, 0)
+            self._pids.discard(pid)
+            if not self._should_exit:
+                logger.warning('Worker [%d] exited with code %d, restarting', pid, os.waitstatus_to_exitcode(status))
+                self._spawn(sock)
+
+        sock.close()
+        logger.info('Stopped supervisor process [%d]', os.getpid())
+
+    def _spawn(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self._pids.add(pid)
+            return
+
+        # The server installs its own handlers and re-raises the signal it stopped on; ignoring it lets us exit cleanly.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        exit_code = 0
+        try:
+            uvicorn.Server(self.config).run(sockets=[sock])
+        except BaseException:  # noqa: B902
+            logger.exception('Worker [%d] failed', os.getpid())
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _handle_exit(self, signum: int, frame) -> None:
+        self._should_exit = True
+        for pid in self._pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def main(args: argparse.Namespace) -> None:
+    from auth_service.core.config import settings
+
+    if args.workers > 1 and not settings.metrics_multiprocess_dir:
+        raise SystemExit('More than one worker needs METRICS_MULTIPROCESS_DIR, or /metrics shows a random worker only')
+    if settings.metrics_multiprocess_dir:
+        from auth_service.core.metrics import metrics_directory
+
+        metrics_directory.clear()
+
+    config = build_config(args)
+    logger.info(
+        'Database connection budget: %d connections, %d LISTEN and a pool of %d per worker',
+        settings.database_pool_max_size,
+        settings.database_listen_connections // args.workers,
+        settings.database_pool_size,
+    )
+    if args.preload and args.workers > 1:
+        PreforkSupervisor(config, workers=args.workers).run()
+        return
+
+    server = uvicorn.Server(config)
+    if args.workers > 1:
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -0,0 +1,99 @@
+"""
+Provide implementation of the revoked access token sync.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+import asyncpg
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+)
+
+from auth_service.core.config import settings
+from auth_service.core.database import (
+    UnitOfWork,
+    async_engine,
+)
+from auth_service.core.security import revoke_access_token
+from auth_service.repositories.auth_repository import (
+    REVOKED_ACCESS_TOKENS_CHANNEL,
+    AuthRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+# Revocations committed out of `created_at` order can land behind the watermark; re-reading a margin catches them.
+POLL_OVERLAP = timedelta(minutes=1)
+
+
+class AccessTokenRevocationSync:
+    """
+    Keep this process's revoked access token set in sync with the `revoked_access_tokens` table.
+
+    Revocations arrive through Postgres LISTEN/NOTIFY as soon as they commit; a periodic poll of the rows created since
+    the last one catches up on anything missed while the listening connection was down.
+    """
+
+    def __init__(self, engine: AsyncEngine, dsn: str, listen: bool, poll_interval: float) -> None:
+        self.engine = engine
+        self.dsn = dsn
+        self.listen = listen
+        self.poll_interval = poll_interval
+        self._watermark: datetime | None = None
+
+    async def poll(self) -> int:
+        """
+        Load the revocations created since the last poll, or every unexpired one on the first call.
+
+        Returns:
+            The number of loaded revocations.
+        """
+        async with AsyncSession(self.engine) as session:
+            repository = AuthRepository(unit_of_work=UnitOfWork(session=session))
+            created_after = self._watermark - POLL_OVERLAP if self._watermark is not None else None
+            rows = await repository.get_revoked_access_tokens(created_after=created_after)
+
+        for jti, exp, created_at in rows:
+            revoke_access_token(jti=jti, exp=exp)
+            if self._watermark is None or created_at > self._watermark:
+                self._watermark = created_at
+        return len(rows)
+
+    async def run_forever(self) -> None:
+        connection: asyncpg.Connection | None = None
+        try:
+            while True:
+                try:
+                    if self.listen and (connection is None or connection.is_closed()):
+                        connection = await asyncpg.connect(self.dsn)
+                        await connection.add_listener(REVOKED_ACCESS_TOKENS_CHANNEL, self._on_notification)
+                    await self.poll()
+                except Exception:  # noqa: B902
+                    logger.exception('Revoked access token sync failed')
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+    @staticmethod
+    def _on_notification(connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            jti, exp = payload.split(':')
+            revoke_access_token(jti=uuid.UUID(jti), exp=int(exp))
+        except ValueError:
+            logger.warning('Ignored malformed access token revocation %r', payload)
+
+
+access_token_revocation_sync = AccessTokenRevocationSync(
+    engine=async_engine,
+    dsn=settings.database_url,
+    listen=settings.revoked_access_tokens_listen,
+    poll_interval=settings.revoked_access_tokens_poll_interval,
+)
@@ -12,41 +12,106 @@ from sqlalchemy.exc import (
     SQLAlchemyError,
 )
 
+from auth_service.core.config import settings
+from auth_service.core.metrics import (
+    Counter,
+    registry,
+)
 from auth_service.core.security import (
     create_access_token,
     create_hash,
     create_refresh_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    revoke_access_token,
+    verify_and_update_password_async,
+    verify_dummy_password_async,
 )
 from auth_service.models import User
 from auth_service.repositories.auth_repository import AuthRepository
-from auth_service.schemas.dto.auth import TokenPairDTO
+from auth_service.schemas.dto.auth import (
+    JwtSchema,
+    TokenPairDTO,
+)
 from auth_service.schemas.dto.users import (
     UserCreateData,
     UserCreateDTO,
 )
+from auth_service.schemas.http.sessions import (
+    SessionPageSchema,
+    SessionSchema,
+)
+from auth_service.services.opaque_access_tokens import (
+    OpaqueAccessTokenStore,
+    get_opaque_access_token_store,
+)
+from auth_service.services.phone_filter import (
+    PhoneFilter,
+    get_phone_filter,
+)
+from auth_service.services.refresh_token_batcher import (
+    RefreshTokenInsertBatcher,
+    get_refresh_token_insert_batcher,
+)
+from auth_service.services.sign_in_negative_cache import (
+    SignInNegativeCache,
+    get_sign_in_negative_cache,
+)
+from auth_service.services.sign_in_throttle import (
+    SignInThrottle,
+    get_sign_in_throttle,
+)
+from auth_service.services.user_profile_cache import (
+    UserProfileCache,
+    get_user_profile_cache,
+)
 
 logger = logging.getLogger(__name__)
 
+REFRESH_TOKEN_REUSES = registry.register(
+    Counter('refresh_token_reuses_total', 'Rotated refresh tokens presented again, each revoking its family.')
+)
+
 
 class AuthService:
-    def __init__(self, auth_repository: Annotated[AuthRepository, Depends()]):
+    def __init__(
+        self,
+        auth_repository: Annotated[AuthRepository, Depends()],
+        profile_cache: Annotated[UserProfileCache, Depends(get_user_profile_cache)],
+        sign_in_throttle: Annotated[SignInThrottle, Depends(get_sign_in_throttle)],
+        negative_cache: Annotated[SignInNegativeCache, Depends(get_sign_in_negative_cache)],
+        phone_filter: Annotated[PhoneFilter, Depends(get_phone_filter)],
+        token_store: Annotated[OpaqueAccessTokenStore, Depends(get_opaque_access_token_store)],
+        token_batcher: Annotated[RefreshTokenInsertBatcher, Depends(get_refresh_token_insert_batcher)],
+    ):
         self.repo = auth_repository
+        self.profile_cache = profile_cache
+        self.sign_in_throttle = sign_in_throttle
+        self.negative_cache = negative_cache
+        self.phone_filter = phone_filter
+        self.token_store = token_store
+        self.token_batcher = token_batcher
+        self.repo.unit_of_work.on_commit(profile_cache.invalidate_changed)
 
     async def create_user(self, data: UserCreateDTO) -> User:
-        exists_user = await self.repo.get_user_by_phone(phone_number=data.phone)
-        if exists_user:
+        phone_may_exist = self.phone_filter.might_contain(data.phone)
+        if phone_may_exist and await self.repo.get_user_by_phone(phone_number=data.phone):
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='User already exists')
 
         user_create_data = UserCreateData(
             first_name=data.first_name,
             last_name=data.last_name,
             phone=data.phone,
-            hashed_password=hash_password(password=data.password),
+            hashed_password=await hash_password_async(password=data.password),
         )
         try:
-            return await self.repo.create_user(data=user_create_data)
+            if phone_may_exist:
+                user = await self.repo.create_user(data=user_create_data)
+                await self.repo.flush()  # surface the unique constraint violation here instead of at commit
+            else:
+                # The filter has never seen the phone, so skip the pre-check; the insert still guards against races.
+                user = await self.repo.insert_user_if_phone_free(data=user_create_data)
+                if user is None:
+                    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='User already exists')
         except IntegrityError:  # if a parallel request occurred
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='User already exists')
         except SQLAlchemyError:
@@ -56,6 +121,10 @@ class AuthService:
                 detail='Failed to create user',
             )
 
+        self.phone_filter.add(data.phone)
+        self.repo.unit_of_work.on_commit(self.negative_cache.discard_on_commit(data.phone))
+        return user
+
     async def get_user_by_id(self, user_id: uuid.UUID) -> User | None:
         user = await self.repo.get_user_by_id(user_id=user_id)
         if not user:
@@ -63,31 +132,116 @@ class AuthService:
 
         return user
 
-    async def issue_token_pair(self, phone: str, password: str) -> TokenPairDTO:
-        user = await self.repo.get_user_by_phone(phone)
+    async def get_user_profile(self, user_id: uuid.UUID) -> bytes:
+        """Return the user's serialized `UserSchema`, served from the profile cache when possible."""
+        profile = await self.profile_cache.get(user_id)
+        if profile is None:
+            user = await self.get_user_by_id(user_id=user_id)
+            profile = await self.profile_cache.set(user)
+
+        return profile
+
+    async def issue_token_pair(
+        self,
+        phone: str,
+        password: str,
+        client_ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> TokenPairDTO:
+        await self.sign_in_throttle.check(phone=phone, client_ip=client_ip)
+
+        user = None
+        if not await self.negative_cache.contains(phone):
+            user = await self.repo.get_user_by_phone(phone)
+            if not user:
+                await self.negative_cache.add(phone)
+
         if not user:
+            await self.sign_in_throttle.record_failure(phone)
+            if settings.sign_in_uniform_latency:
+                await verify_dummy_password_async(plain_password=password)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid credentials')
 
-        if not verify_password(plain_password=password, hashed_password=user.hashed_password):
+        verified, new_hashed_password = await verify_and_update_password_async(
+            plain_password=password,
+            hashed_password=user.hashed_password,
+        )
+        if not verified:
+            await self.sign_in_throttle.record_failure(phone)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid credentials')
 
-        return await self._generate_token_pair(user_id=user.id)
+        await self.sign_in_throttle.record_success(phone)
+        if new_hashed_password is not None:
+            # Only staged: the upgraded hash is written by the same commit as the new refresh token.
+            await self.repo.update_user_password(user=user, hashed_password=new_hashed_password)
 
-    async def refresh_tokens(self, refresh_token: str) -> TokenPairDTO:
-        hashed_refresh_token = create_hash(refresh_token)
-        token = await self.repo.get_refresh_token(hashed_token=hashed_refresh_token)
-        if not token or token.is_expired:
+        return await self._generate_token_pair(user_id=user.id, client_ip=client_ip, user_agent=user_agent)
+
+    async def refresh_tokens(
+        self,
+        refresh_token: str,
+        client_ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> TokenPairDTO:
+        new_refresh_token = create_refresh_token()
+        rotated_token = await self.repo.rotate_refresh_token(
+            token_digest=create_hash(refresh_token),
+            new_token_digest=create_hash(new_refresh_token),
+            user_agent=user_agent,
+            ip_address=client_ip,
+        )
+        if not rotated_token:
+            await self._revoke_family_on_reuse(token_digest=create_hash(refresh_token))
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid or expired refresh token')
 
-        user_id = token.user_id
+        return TokenPairDTO(
+            access_token=await self._issue_access_token(
+                user_id=rotated_token.user_id,
+                session_id=rotated_token.family_id,
+            ),
+            refresh_token=new_refresh_token,
+        )
 
-        token_pair = await self._generate_token_pair(user_id=user_id)
-        await self.repo.delete_refresh_token(token=token)
-        return token_pair
+    async def get_sessions(
+        self,
+        access_token: JwtSchema,
+        limit: int,
+        after: uuid.UUID | None = None,
+    ) -> SessionPageSchema:
+        """Return a page of the user's active sessions, newest first, marking the one `access_token` belongs to."""
+        tokens = await self.repo.get_sessions(user_id=access_token.sub, limit=limit + 1, after=after)
+        sessions = [
+            SessionSchema(
+                id=token.session_id,
+                user_agent=token.user_agent,
+                ip_address=token.ip_address,
+                created_at=token.session_created_at,
+                last_used_at=token.last_used_at,
+                current=token.session_id == access_token.sid,
+            )
+            for token in tokens[:limit]
+        ]
+        next_cursor = sessions[-1].id if len(tokens) > limit else None
+        return SessionPageSchema(sessions=sessions, next_cursor=next_cursor)
+
+    async def delete_sessions(self, access_token: JwtSchema, keep_current: bool = False) -> int:
+        """
+        Log out everywhere: delete all the user's refresh tokens, except the current session's if `keep_current`.
+
+        Access tokens of other sessions stay valid until they expire; the caller's own one is revoked with its session.
+
+        Returns:
+            The number of deleted sessions.
+        """
+        keep_id = access_token.sid if keep_current else None
+        deleted = await self.repo.delete_sessions(user_id=access_token.sub, keep_id=keep_id)
+        if keep_id is None:
+            await self._revoke_access_token(access_token)
+        return deleted
 
-    async def delete_refresh_token(self, refresh_token: str) -> None:
-        hashed_refresh_token = create_hash(refresh_token)
-        token = await self.repo.get_refresh_token(hashed_token=hashed_refresh_token)
+    async def delete_refresh_token(self, refresh_token: str, access_token: JwtSchema | None = None) -> None:
+        """Log out: delete the refresh token and, if the access token is given, revoke it everywhere."""
+        token = await self.repo.get_refresh_token(token_digest=create_hash(refresh_token))
         if not token or token.is_expired:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -95,16 +249,59 @@ class AuthService:
             )
         await self.repo.delete_refresh_token(token=token)
 
-    async def _generate_token_pair(self, user_id: uuid.UUID) -> TokenPairDTO:
-        access_token = create_access_token(user_id=user_id)
-        refresh_token = create_refresh_token()
-        hashed_refresh_token = create_hash(refresh_token)
+        if access_token is not None:
+            await self._revoke_access_token(access_token)
+
+    async def _revoke_family_on_reuse(self, token_digest: bytes) -> None:
+        """
+        A rotated token presented again means two parties hold the chain, so revoke all of its tokens, unless it was
+        rotated within the grace period, which is a retry of the same client.
+
+        Committed right away, since the request itself fails and would otherwise roll the revocation back.
+        """
+        family = await self.repo.revoke_rotated_refresh_token_family(token_digest=token_digest)
+        if family is None:
+            return
+
+        await self.repo.unit_of_work.commit()
+        REFRESH_TOKEN_REUSES.inc()
+        logger.warning('Refresh token reuse detected, revoked family %s of user %s', family.family_id, family.user_id)
+
+    async def _revoke_access_token(self, access_token: JwtSchema) -> None:
+        await self.repo.revoke_access_token(jti=access_token.jti, exp=access_token.exp)
 
-        await self.repo.create_refresh_token(
+        async def revoke_locally(changed_instances: list) -> None:
+            # Other processes learn about it from the NOTIFY sent on commit.
+            revoke_access_token(jti=access_token.jti, exp=access_token.exp)
+
+        self.repo.unit_of_work.on_commit(revoke_locally)
+
+    async def _generate_token_pair(
+        self,
+        user_id: uuid.UUID,
+        client_ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> TokenPairDTO:
+        refresh_token = create_refresh_token()
+        create = self.repo.create_refresh_token
+        if self.token_batcher.enabled:
+            # The token is committed together with those of concurrent requests instead of in this request. The batch
+            # needs a connection from the same pool, so commit what is staged (at most an upgraded password hash) and
+            # give this request's connection back first; requests holding theirs while waiting could exhaust the pool.
+            await self.repo.unit_of_work.commit()
+            create = self.token_batcher.insert
+        session_id = await create(
             user_id=user_id,
-            hashed_token=hashed_refresh_token,
+            token_digest=create_hash(refresh_token),
+            user_agent=user_agent,
+            ip_address=client_ip,
         )
         return TokenPairDTO(
-            access_token=access_token,
+            access_token=await self._issue_access_token(user_id=user_id, session_id=session_id),
             refresh_token=refresh_token,
         )
+
+    async def _issue_access_token(self, user_id: uuid.UUID, session_id: uuid.UUID) -> str:
+        if self.token_store.enabled:
+            return await self.token_store.issue(self.repo, user_id=user_id, session_id=session_id)
+        return create_access_token(user_id=user_id, session_id=session_id)
@@ -0,0 +1,263 @@
+"""
+Provide implementation of the opaque access token store.
+"""
+
+import math
+import secrets
+import time
+import uuid
+from typing import (
+    Any,
+    Callable,
+)
+
+import jwt
+from sqlalchemy import Row
+
+from auth_service.core.cache import TTLCache
+from auth_service.core.config import settings
+from auth_service.core.metrics import (
+    Counter,
+    Gauge,
+    registry,
+)
+from auth_service.core.security import (
+    AccessTokenRevokedError,
+    create_hash,
+    decode_access_token,
+    revoked_access_tokens,
+)
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.schemas.dto.auth import JwtSchema
+
+# JWTs always start with `eyJ`, so the prefix tells the two kinds of access tokens apart without a lookup.
+OPAQUE_ACCESS_TOKEN_PREFIX = 'oat_'
+
+
+def is_opaque_access_token(token: str) -> bool:
+    return token.startswith(OPAQUE_ACCESS_TOKEN_PREFIX)
+
+
+def _error_as_result(func: Callable[..., JwtSchema | None], *args: Any) -> JwtSchema | jwt.InvalidTokenError | None:
+    try:
+        return func(*args)
+    except jwt.InvalidTokenError as exc:
+        return exc
+
+
+class OpaqueAccessTokenStore:
+    """
+    Random access tokens backed by `opaque_access_tokens`, with a hot copy in a sharded in-process token table.
+
+    Issuing writes the token through to Postgres in the request's transaction and adds it to the local table once that
+    commits. Other processes pick it up from the database on their first miss with a single primary key lookup and
+    keep it until it expires or is evicted, so the common case does no I/O. Revocation goes through
+    `revoked_access_tokens` by `jti`, exactly like for JWTs, which is checked on every lookup. Tokens the database does
+    not know are rejected without a lookup for the next `unknown_ttl` seconds.
+
+    Only issuing depends on `enabled`: opaque tokens that are already out keep working when the mode is switched back.
+    The table is meant to be used from a single event loop and is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        shards: int,
+        maxsize: int,
+        unknown_maxsize: int = 10_000,
+        unknown_ttl: float = 5,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.enabled = enabled
+        self._timer = timer
+        self._shards: list[TTLCache[bytes, JwtSchema]] = [
+            TTLCache(maxsize=max(maxsize // shards, 1), ttl=math.inf, timer=timer) for _ in range(shards)
+        ]
+        # Digests the database did not know a moment ago, so made-up tokens do not cost a query each. Kept apart from
+        # the shards so a flood of them cannot evict real tokens.
+        self._unknown: TTLCache[bytes, bool] = TTLCache(maxsize=unknown_maxsize, ttl=unknown_ttl, timer=timer)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self._shards)
+
+    def _shard(self, token_digest: bytes) -> TTLCache[bytes, JwtSchema]:
+        return self._shards[token_digest[0] % len(self._shards)]
+
+    async def issue(self, repo: AuthRepository, user_id: uuid.UUID, session_id: uuid.UUID | None = None) -> str:
+        """Stage a new opaque access token in the repository's transaction and return it."""
+        token = OPAQUE_ACCESS_TOKEN_PREFIX + secrets.token_urlsafe(32)
+        token_digest = create_hash(token)
+        now = int(self._timer())
+        claims = JwtSchema(
+            sub=user_id,
+            jti=uuid.uuid4(),
+            iat=now,
+            exp=now + settings.access_token_life_time,
+            token_type='access',
+            sid=session_id,
+        )
+        await repo.create_opaque_access_token(
+            token_digest=token_digest,
+            jti=claims.jti,
+            user_id=claims.sub,
+            session_id=claims.sid,
+            iat=claims.iat,
+            exp=claims.exp,
+        )
+
+        async def add_on_commit(changed_instances: list[Any]) -> None:
+            self.add(token, claims)
+
+        repo.unit_of_work.on_commit(add_on_commit)
+        return token
+
+    def add(self, token: str, claims: JwtSchema) -> None:
+        """Put a token that is already stored in the database into the in-process table until it expires."""
+        token_digest = create_hash(token)
+        self._shard(token_digest).set(token_digest, claims, expires_at=claims.exp)
+
+    def lookup(self, token: str) -> JwtSchema | None:
+        """
+        Return the claims of an opaque token from the in-process table, or None if it is not there; never does I/O.
+
+        Raises:
+            AccessTokenRevokedError: The token was revoked.
+        """
+        token_digest = create_hash(token)
+        claims = self._shard(token_digest).get(token_digest)
+        if claims is not None and claims.jti in revoked_access_tokens:
+            raise AccessTokenRevokedError(claims)
+        return claims
+
+    async def decode(self, token: str, repo: AuthRepository) -> JwtSchema:
+        """
+        Verify an access token of either kind and return its claims; JWTs are handed to `decode_access_token`.
+
+        Raises:
+            jwt.ExpiredSignatureError: The token has expired.
+            AccessTokenRevokedError: The token was revoked.
+            jwt.InvalidTokenError: The token is unknown or malformed.
+        """
+        claims = self._decode_locally(token)
+        if claims is not None:
+            return claims
+
+        token_digest = create_hash(token)
+        return self._resolve(token, token_digest, await repo.get_opaque_access_token(token_digest=token_digest))
+
+    async def decode_many(self, tokens: list[str], repo: AuthRepository) -> list[JwtSchema | jwt.InvalidTokenError]:
+        """
+        Verify many access tokens like `decode`, loading all opaque ones missing from the table in a single query.
+
+        Returns:
+            The claims of each token, or the error `decode` would have raised for it.
+        """
+        results: list[JwtSchema | jwt.InvalidTokenError | None] = [None] * len(tokens)
+        missing: dict[bytes, list[int]] = {}
+        for index, token in enumerate(tokens):
+            results[index] = _error_as_result(self._decode_locally, token)
+            if results[index] is None:
+                missing.setdefault(create_hash(token), []).append(index)
+
+        if missing:
+            rows = await repo.get_opaque_access_tokens(list(missing))
+            for token_digest, indexes in missing.items():
+                row = rows.get(token_digest)
+                for index in indexes:
+                    results[index] = _error_as_result(self._resolve, tokens[index], token_digest, row)
+
+        return results
+
+    def _decode_locally(self, token: str) -> JwtSchema | None:
+        """
+        Verify a token without I/O; None means it is an opaque token that has to be loaded from the database.
+
+        Raises:
+            jwt.InvalidTokenError: Like `decode`.
+        """
+        if not is_opaque_access_token(token):
+            return decode_access_token(token)
+
+        claims = self.lookup(token)
+        if claims is None and self._unknown.get(create_hash(token)) is not None:
+            raise jwt.InvalidTokenError('Unknown access token')
+        return claims
+
+    def _resolve(self, token: str, token_digest: bytes, row: Row | None) -> JwtSchema:
+        """
+        Turn the database row of an opaque token into its claims and remember the outcome in memory.
+
+        Raises:
+            jwt.InvalidTokenError: Like `decode`.
+        """
+        if row is None:
+            self._unknown.set(token_digest, True)
+            raise jwt.InvalidTokenError('Unknown access token')
+
+        claims = JwtSchema(
+            sub=row.user_id,
+            jti=row.jti,
+            iat=row.iat,
+            exp=row.exp,
+            token_type='access',
+            sid=row.session_id,
+        )
+        if row.revoked:
+            # Revoked by another process whose notification has not arrived yet.
+            revoked_access_tokens.add(claims.jti, claims.exp)
+            raise AccessTokenRevokedError(claims)
+        if claims.exp <= self._timer():
+            raise jwt.ExpiredSignatureError('Signature has expired')
+
+        self.add(token, claims)
+        if claims.jti in revoked_access_tokens:
+            raise AccessTokenRevokedError(claims)
+        return claims
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+        self._unknown.clear()
+
+
+opaque_access_token_store = OpaqueAccessTokenStore(
+    enabled=settings.access_token_mode == 'opaque',
+    shards=settings.opaque_access_token_table_shards,
+    maxsize=settings.opaque_access_token_table_size,
+    unknown_maxsize=settings.opaque_access_token_unknown_cache_size,
+    unknown_ttl=settings.opaque_access_token_unknown_cache_ttl,
+)
+
+registry.register(
+    Gauge(
+        'opaque_access_tokens',
+        'Opaque access tokens held in the in-process token table.',
+        callback=lambda: len(opaque_access_token_store),
+    )
+)
+registry.register(
+    Counter(
+        'opaque_access_token_table_hits_total',
+        'Opaque access tokens resolved from the in-process token table.',
+        callback=lambda: opaque_access_token_store.hits,
+    )
+)
+registry.register(
+    Counter(
+        'opaque_access_token_table_misses_total',
+        'Opaque access tokens looked up in the database.',
+        callback=lambda: opaque_access_token_store.misses,
+    )
+)
+
+
+def get_opaque_access_token_store() -> OpaqueAccessTokenStore:
+    return opaque_access_token_store
@@ -0,0 +1,120 @@
+"""
+Provide implementation of the Bloom filter of registered phones.
+"""
+
+import logging
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from auth_service.core.bloom import BloomFilter
+from auth_service.core.config import settings
+from auth_service.core.database import (
+    async_engine,
+    replica_set,
+)
+from auth_service.core.metrics import (
+    Counter,
+    Gauge,
+    registry,
+)
+from auth_service.models import User
+
+logger = logging.getLogger(__name__)
+
+PHONE_FILTER_LOOKUPS = registry.register(
+    Counter('phone_filter_lookups_total', 'Sign-up phone filter lookups by result.', ['result'])
+)
+
+STREAM_BATCH_SIZE = 10_000
+
+
+class PhoneFilter:
+    """
+    Bloom filter of registered phones that lets sign-up skip the uniqueness pre-check for phones that are new.
+
+    Until `build` has streamed the `users.phone` column every phone "may exist", so the filter only ever saves work.
+    Phones registered by other processes after the build are missing from it; sign-ups for them are still rejected by
+    the unique constraint.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.ready = False
+        self.build_seconds = 0.0
+        self._filter = BloomFilter(capacity=capacity, error_rate=error_rate)
+
+    @property
+    def nbytes(self) -> int:
+        return self._filter.nbytes
+
+    @property
+    def count(self) -> int:
+        return self._filter.count
+
+    def might_contain(self, phone: str) -> bool:
+        if not self.enabled or not self.ready:
+            return True
+
+        result = phone in self._filter
+        PHONE_FILTER_LOOKUPS.inc(result='maybe' if result else 'absent')
+        return result
+
+    def add(self, phone: str) -> None:
+        if self.enabled:
+            self._filter.add(phone)
+
+    async def build(self, engine: AsyncEngine) -> None:
+        """Stream every registered phone into the filter, then start answering lookups."""
+        if not self.enabled:
+            return
+
+        started_at = time.monotonic()
+        async with engine.connect() as connection:
+            phones = await connection.stream_scalars(select(User.phone).execution_options(yield_per=STREAM_BATCH_SIZE))
+            async for phone in phones:
+                self._filter.add(phone)
+
+        self.build_seconds = time.monotonic() - started_at
+        self.ready = True
+        logger.info(
+            'Built the phone filter with %s phones in %.2fs, %.1f MiB',
+            self.count,
+            self.build_seconds,
+            self.nbytes / 2**20,
+        )
+        if self.count > self._filter.capacity:
+            logger.warning('The phone filter holds more phones than its capacity, raise phone_filter_capacity')
+
+
+phone_filter = PhoneFilter(
+    capacity=settings.phone_filter_capacity,
+    error_rate=settings.phone_filter_error_rate,
+    enabled=settings.phone_filter_enabled,
+)
+
+registry.register(
+    Gauge(
+        'phone_filter_build_seconds',
+        'Time the phone filter took to build.',
+        callback=lambda: phone_filter.build_seconds,
+    )
+)
+registry.register(
+    Gauge('phone_filter_bytes', 'Memory of the phone filter bit array.', callback=lambda: phone_filter.nbytes)
+)
+registry.register(
+    Gauge('phone_filter_phones', 'Phones added to the phone filter.', callback=lambda: phone_filter.count)
+)
+
+
+async def build_phone_filter() -> None:
+    try:
+        await phone_filter.build(replica_set.choose() or async_engine)
+    except Exception:  # noqa: B902
+        logger.exception('Phone filter build failed, sign-up keeps checking every phone')
+
+
+def get_phone_filter() -> PhoneFilter:
+    return phone_filter
@@ -0,0 +1,198 @@
+"""
+Provide implementation of the micro-batching refresh token writer.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+)
+
+from auth_service.core.config import settings
+from auth_service.core.database import (
+    UnitOfWork,
+    async_engine,
+)
+from auth_service.core.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    registry,
+)
+from auth_service.repositories.auth_repository import (
+    AuthRepository,
+    new_refresh_token_values,
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_TOKEN_INSERT_BATCH_SIZE = registry.register(
+    Histogram(
+        'refresh_token_insert_batch_size',
+        'Refresh tokens written per batched INSERT.',
+        buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+    )
+)
+REFRESH_TOKEN_INSERT_BATCH_WAIT = registry.register(
+    Histogram(
+        'refresh_token_insert_batch_wait_seconds',
+        'Time from queueing a refresh token until its batch was committed.',
+        buckets=(0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    )
+)
+
+
+class RefreshTokenInsertBatcher:
+    """
+    Write refresh tokens of concurrent requests together, in one multi-row INSERT and commit per batch.
+
+    A batch is written once it holds `max_batch_size` tokens or `linger` seconds after its first token was queued,
+    whichever comes first. `insert` returns only after the batch is committed, so the token is durable before the
+    client gets it. The token is committed on its own, not in the request's transaction; should the request fail
+    afterwards, the token is never handed out and is purged by the sweeper once it expires.
+
+    If a batch violates a constraint, its tokens are retried one by one so a single bad row only fails its own request.
+    The batcher is meant to be used from a single event loop and is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        bind: AsyncEngine | AsyncConnection,
+        enabled: bool,
+        max_batch_size: int,
+        linger: float,
+        timer: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.bind = bind
+        self.enabled = enabled
+        self.max_batch_size = max_batch_size
+        self.linger = linger
+        self._timer = timer
+        self._pending: list[tuple[dict, asyncio.Future[None], float]] = []
+        self._linger_task: asyncio.Task | None = None
+        self._writes: set[asyncio.Task] = set()
+        self.batches = 0
+        self.inserted = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def insert(
+        self,
+        user_id: uuid.UUID,
+        token_digest: bytes,
+        user_agent: str | None = None,
+        ip_address: str | None = None,
+    ) -> uuid.UUID:
+        """
+        Queue a new refresh token and wait until its batch is committed.
+
+        Returns:
+            The token id, which also identifies the session.
+        """
+        values = new_refresh_token_values(
+            user_id=user_id,
+            token_digest=token_digest,
+            user_agent=user_agent,
+            ip_address=ip_address,
+        )
+        written = asyncio.get_running_loop().create_future()
+        self._pending.append((values, written, self._timer()))
+        if len(self._pending) >= self.max_batch_size:
+            self._write_pending()
+        elif self._linger_task is None:
+            self._linger_task = asyncio.create_task(self._write_after_linger())
+
+        # A cancelled request must not cancel the write shared with the others.
+        await asyncio.shield(written)
+        return values['id']
+
+    async def close(self) -> None:
+        """Write what is queued and wait for all writes in flight."""
+        if self._pending:
+            self._write_pending()
+        await asyncio.gather(*self._writes, return_exceptions=True)
+
+    async def _write_after_linger(self) -> None:
+        await asyncio.sleep(self.linger)
+        self._linger_task = None
+        self._write_pending()
+
+    def _write_pending(self) -> None:
+        if self._linger_task is not None:
+            self._linger_task.cancel()
+            self._linger_task = None
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._write(batch))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write(self, batch: list[tuple[dict, asyncio.Future[None], float]]) -> None:
+        try:
+            # A savepoint keeps a failed batch from aborting the transaction of a connection given as `bind`.
+            async with AsyncSession(self.bind, join_transaction_mode='create_savepoint') as session:
+                await AuthRepository(unit_of_work=UnitOfWork(session=session)).insert_refresh_tokens(
+                    [values for values, _, _ in batch]
+                )
+                await session.commit()
+        except IntegrityError as error:
+            if len(batch) > 1:
+                for entry in batch:
+                    await self._write([entry])
+                return
+            self._fail(batch, error)
+            return
+        except Exception as error:  # noqa: B902
+            logger.exception('Failed to write a batch of %s refresh tokens', len(batch))
+            self._fail(batch, error)
+            return
+
+        written_at = self._timer()
+        self.batches += 1
+        self.inserted += len(batch)
+        REFRESH_TOKEN_INSERT_BATCH_SIZE.observe(len(batch))
+        for _, written, queued_at in batch:
+            REFRESH_TOKEN_INSERT_BATCH_WAIT.observe(written_at - queued_at)
+            written.set_result(None)
+
+    def _fail(self, batch: list[tuple[dict, asyncio.Future[None], float]], error: Exception) -> None:
+        self.failed += len(batch)
+        for _, written, _ in batch:
+            written.set_exception(error)
+
+
+refresh_token_insert_batcher = RefreshTokenInsertBatcher(
+    bind=async_engine,
+    enabled=settings.refresh_token_insert_batching,
+    max_batch_size=settings.refresh_token_insert_batch_size,
+    linger=settings.refresh_token_insert_batch_linger,
+)
+
+registry.register(
+    Gauge(
+        'refresh_token_insert_pending',
+        'Refresh tokens queued for the next batched INSERT.',
+        callback=lambda: refresh_token_insert_batcher.pending,
+    )
+)
+registry.register(
+    Counter(
+        'refresh_token_insert_failed_total',
+        'Batched refresh token inserts that failed.',
+        callback=lambda: refresh_token_insert_batcher.failed,
+    )
+)
+
+
+def get_refresh_token_insert_batcher() -> RefreshTokenInsertBatcher:
+    return refresh_token_insert_batcher
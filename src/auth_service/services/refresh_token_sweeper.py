@@ -0,0 +1,137 @@
+"""
+Provide implementation of the expired refresh token sweeper.
+"""
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import (
+    func,
+    select,
+)
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+)
+
+from auth_service.core.config import settings
+from auth_service.core.database import (
+    UnitOfWork,
+    async_engine,
+)
+from auth_service.core.metrics import (
+    Counter,
+    Gauge,
+    registry,
+)
+from auth_service.repositories.auth_repository import AuthRepository
+
+logger = logging.getLogger(__name__)
+
+# Application-wide key for the Postgres advisory lock that lets only one replica sweep at a time.
+SWEEPER_LOCK_KEY = 7310452118
+
+
+class RefreshTokenSweeper:
+    """
+    Delete expired refresh tokens in bounded batches, each in its own short transaction.
+    """
+
+    def __init__(self, engine: AsyncEngine, batch_size: int, batch_pause: float, interval: float) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.interval = interval
+        self.runs = 0
+        self.last_run_purged = 0
+        self.total_purged = 0
+
+    async def run_once(self) -> int | None:
+        """
+        Purge every expired refresh token.
+
+        Returns:
+            The number of purged tokens, or None if another process holds the sweeper lock.
+        """
+        async with self.engine.connect() as connection:
+            # A session-level lock survives the per-batch commits on this connection.
+            locked = await connection.scalar(select(func.pg_try_advisory_lock(SWEEPER_LOCK_KEY)))
+            await connection.commit()
+            if not locked:
+                logger.info('Refresh token sweep skipped, another process holds the lock')
+                return None
+
+            try:
+                return await self._purge(connection)
+            finally:
+                await connection.execute(select(func.pg_advisory_unlock(SWEEPER_LOCK_KEY)))
+                await connection.commit()
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:  # noqa: B902
+                logger.exception('Refresh token sweep failed')
+            await asyncio.sleep(self.interval)
+
+    async def _purge(self, connection: AsyncConnection) -> int:
+        started_at = time.monotonic()
+        purged = 0
+        async with AsyncSession(bind=connection) as session:
+            repository = AuthRepository(unit_of_work=UnitOfWork(session=session))
+            while True:
+                batch_purged = await repository.purge_expired_refresh_tokens(limit=self.batch_size)
+                await session.commit()
+                purged += batch_purged
+                if batch_purged < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_pause)
+
+            while await repository.purge_expired_rotated_refresh_tokens(limit=self.batch_size) == self.batch_size:
+                await session.commit()
+                await asyncio.sleep(self.batch_pause)
+            await session.commit()
+
+            while await repository.purge_expired_opaque_access_tokens(limit=self.batch_size) == self.batch_size:
+                await session.commit()
+                await asyncio.sleep(self.batch_pause)
+            await session.commit()
+
+            # Revocations live no longer than one access token lifetime, so a single statement stays small.
+            await repository.purge_expired_revoked_access_tokens()
+            await session.commit()
+
+        self.runs += 1
+        self.last_run_purged = purged
+        self.total_purged += purged
+        logger.info('Purged %s expired refresh tokens in %.2fs', purged, time.monotonic() - started_at)
+        return purged
+
+
+refresh_token_sweeper = RefreshTokenSweeper(
+    engine=async_engine,
+    batch_size=settings.refresh_token_sweeper_batch_size,
+    batch_pause=settings.refresh_token_sweeper_batch_pause,
+    interval=settings.refresh_token_sweeper_interval,
+)
+
+registry.register(
+    Counter('refresh_token_sweeper_runs_total', 'Completed sweeper runs.', callback=lambda: refresh_token_sweeper.runs)
+)
+registry.register(
+    Counter(
+        'refresh_token_sweeper_purged_total',
+        'Expired refresh tokens purged by the sweeper.',
+        callback=lambda: refresh_token_sweeper.total_purged,
+    )
+)
+registry.register(
+    Gauge(
+        'refresh_token_sweeper_last_run_purged',
+        'Expired refresh tokens purged by the last sweeper run.',
+        callback=lambda: refresh_token_sweeper.last_run_purged,
+    )
+)
@@ -0,0 +1,124 @@
+"""
+Provide implementation of the batched session last-used recorder.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+)
+
+from auth_service.core.config import settings
+from auth_service.core.database import (
+    UnitOfWork,
+    async_engine,
+)
+from auth_service.core.metrics import (
+    Counter,
+    Gauge,
+    registry,
+)
+from auth_service.repositories.auth_repository import AuthRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SessionActivityRecorder:
+    """
+    Remember when each session was last used and write it to `refresh_tokens.last_used_at` in the background.
+
+    Authenticated requests only update an in-memory dict; every `flush_interval` seconds the whole buffer goes out in a
+    single UPDATE. At most `max_pending` sessions are buffered between flushes, and a failed flush is dropped, since
+    `last_used_at` is informational.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        flush_interval: float,
+        max_pending: int,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._timer = timer
+        self._pending: dict[uuid.UUID, float] = {}
+        self.flushed = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def touch(self, session_id: uuid.UUID) -> None:
+        if session_id not in self._pending and len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending[session_id] = self._timer()
+
+    async def flush(self) -> int:
+        """
+        Write the buffered activity.
+
+        Returns:
+            The number of updated sessions.
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        async with AsyncSession(self.engine) as session:
+            updated = await AuthRepository(unit_of_work=UnitOfWork(session=session)).update_sessions_last_used(pending)
+            await session.commit()
+        self.flushed += updated
+        return updated
+
+    async def run_forever(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                try:
+                    await self.flush()
+                except Exception:  # noqa: B902
+                    logger.exception('Session activity flush failed')
+        finally:
+            # Write what was buffered since the last flush when the application shuts down.
+            try:
+                await self.flush()
+            except Exception:  # noqa: B902
+                logger.exception('Session activity flush failed')
+
+
+session_activity = SessionActivityRecorder(
+    engine=async_engine,
+    flush_interval=settings.session_activity_flush_interval,
+    max_pending=settings.session_activity_max_pending,
+)
+
+registry.register(
+    Gauge(
+        'session_activity_pending',
+        'Sessions whose last use is buffered for the next flush.',
+        callback=lambda: session_activity.pending,
+    )
+)
+registry.register(
+    Counter(
+        'session_activity_flushed_total',
+        'Session last-used timestamps written to the database.',
+        callback=lambda: session_activity.flushed,
+    )
+)
+registry.register(
+    Counter(
+        'session_activity_dropped_total',
+        'Session uses not recorded because the buffer was full.',
+        callback=lambda: session_activity.dropped,
+    )
+)
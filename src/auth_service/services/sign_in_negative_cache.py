@@ -0,0 +1,65 @@
+"""
+Provide implementation of the negative cache of phones that failed to sign in as unknown.
+"""
+
+from typing import Any
+
+from auth_service.core.cache import (
+    CacheBackend,
+    InMemoryCacheBackend,
+)
+from auth_service.core.config import settings
+
+
+class SignInNegativeCache:
+    """
+    Remember phones that have no user, so repeated sign-in attempts for them skip the database lookup.
+
+    A phone is forgotten when a user signs up with it. The in-memory backend only sees sign-ups of its own process, so
+    with several workers a fresh user could be rejected by another worker for up to `ttl`. That is why the cache is off
+    by default with more than one worker; a shared backend avoids the problem.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int, enabled: bool = True) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+
+    async def contains(self, phone: str) -> bool:
+        if not self.enabled:
+            return False
+        return await self.backend.get(self._key(phone)) is not None
+
+    async def add(self, phone: str) -> None:
+        if self.enabled:
+            await self.backend.set(self._key(phone), b'1', ttl=self.ttl)
+
+    async def discard(self, phone: str) -> None:
+        await self.backend.delete(self._key(phone))
+
+    def discard_on_commit(self, phone: str):
+        """Build a commit hook that forgets the phone once the user that owns it is committed."""
+
+        async def hook(changed_instances: list[Any]) -> None:
+            await self.discard(phone)
+
+        return hook
+
+    @staticmethod
+    def _key(phone: str) -> str:
+        return f'sign-in-miss:{phone}'
+
+
+sign_in_negative_cache = SignInNegativeCache(
+    backend=InMemoryCacheBackend(maxsize=settings.sign_in_negative_cache_size),
+    ttl=settings.sign_in_negative_cache_ttl,
+    enabled=(
+        settings.sign_in_negative_cache_enabled
+        if settings.sign_in_negative_cache_enabled is not None
+        else settings.server_workers == 1
+    ),
+)
+
+
+def get_sign_in_negative_cache() -> SignInNegativeCache:
+    return sign_in_negative_cache
@@ -0,0 +1,86 @@
+"""
+Provide implementation of sign-in rate limiting and lockout.
+"""
+
+from auth_service.core.config import settings
+from auth_service.core.errors import TooManyRequestsError
+from auth_service.core.metrics import (
+    Counter,
+    registry,
+)
+from auth_service.core.rate_limit import (
+    CounterStore,
+    InMemoryCounterStore,
+    Lockout,
+    SlidingWindowLimiter,
+)
+
+SIGN_IN_THROTTLED = registry.register(
+    Counter('sign_in_throttled_total', 'Sign-in attempts rejected before any credential check.', ['reason'])
+)
+
+
+class SignInThrottle:
+    """
+    Reject sign-in attempts over the per-IP and per-phone rate limits, or for phones locked out after repeated
+    failures, before the service touches the database or the password hash.
+    """
+
+    def __init__(self, store: CounterStore, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.ip_limiter = SlidingWindowLimiter(
+            store=store,
+            name='sign-in-ip',
+            limit=settings.sign_in_ip_rate_limit,
+            window=settings.sign_in_ip_rate_window,
+        )
+        self.phone_limiter = SlidingWindowLimiter(
+            store=store,
+            name='sign-in-phone',
+            limit=settings.sign_in_phone_rate_limit,
+            window=settings.sign_in_phone_rate_window,
+        )
+        self.lockout = Lockout(
+            store=store,
+            name='sign-in',
+            threshold=settings.sign_in_lockout_threshold,
+            base_duration=settings.sign_in_lockout_base_duration,
+            max_duration=settings.sign_in_lockout_max_duration,
+            reset_after=settings.sign_in_lockout_reset_after,
+        )
+
+    async def check(self, phone: str, client_ip: str | None) -> None:
+        """
+        Raises:
+            TooManyRequestsError: The attempt is over a limit or the phone is locked out.
+        """
+        if not self.enabled:
+            return
+
+        if client_ip is not None and (retry_after := await self.ip_limiter.hit(client_ip)) is not None:
+            SIGN_IN_THROTTLED.inc(reason='ip_rate_limit')
+            raise TooManyRequestsError(retry_after=retry_after)
+        if (retry_after := await self.lockout.retry_after(phone)) is not None:
+            SIGN_IN_THROTTLED.inc(reason='lockout')
+            raise TooManyRequestsError(message='Too many failed sign-in attempts', retry_after=retry_after)
+        if (retry_after := await self.phone_limiter.hit(phone)) is not None:
+            SIGN_IN_THROTTLED.inc(reason='phone_rate_limit')
+            raise TooManyRequestsError(retry_after=retry_after)
+
+    async def record_failure(self, phone: str) -> None:
+        if self.enabled:
+            await self.lockout.record_failure(phone)
+
+    async def record_success(self, phone: str) -> None:
+        if self.enabled:
+            await self.lockout.reset(phone)
+
+
+sign_in_throttle = SignInThrottle(
+    store=InMemoryCounterStore(shards=settings.rate_limit_store_shards, maxsize=settings.rate_limit_store_size),
+    enabled=settings.sign_in_throttle_enabled,
+)
+
+
+def get_sign_in_throttle() -> SignInThrottle:
+    return sign_in_throttle
@@ -0,0 +1,253 @@
+"""
+Provide implementation of the bulk user import.
+"""
+
+import asyncio
+import codecs
+import csv
+import itertools
+import json
+import logging
+import math
+from typing import (
+    IO,
+    Annotated,
+    AsyncIterable,
+    AsyncIterator,
+)
+
+from fastapi import Depends
+from pydantic import ValidationError
+
+from auth_service.core.config import settings
+from auth_service.core.executors import BoundedProcessExecutor
+from auth_service.core.security import hash_passwords
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.schemas.dto.users import UserCreateData
+from auth_service.schemas.http.users import (
+    UserImportErrorSchema,
+    UserImportReportSchema,
+    UserImportRowSchema,
+)
+from auth_service.services.phone_filter import (
+    PhoneFilter,
+    get_phone_filter,
+)
+from auth_service.services.sign_in_negative_cache import (
+    SignInNegativeCache,
+    get_sign_in_negative_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+
+# Separate from the sign-in executor, so an import never queues sign-ins behind thousands of hashes. Concurrent imports
+# wait for each other's hashes instead of failing halfway through.
+user_import_hash_executor = BoundedProcessExecutor(workers=settings.user_import_hash_workers, queue_size=0, wait=True)
+
+UserImportItem = UserImportErrorSchema | UserImportReportSchema
+
+
+async def read_chunks(file: IO[bytes], chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode a stream of UTF-8 byte chunks into lines, dropping a leading byte order mark."""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ''
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            yield line
+    buffer += decoder.decode(b'', final=True)
+    if buffer:
+        yield buffer
+
+
+async def parse_rows(lines: AsyncIterable[str], file_format: str) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """
+    Parse CSV (with a header line; quoted values must not span lines) or JSONL input.
+
+    Yields:
+        The line number and either the raw row or the reason it could not be parsed.
+    """
+    header: list[str] | None = None
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        line = line.rstrip('\r')
+        if not line.strip():
+            continue
+
+        if file_format == 'jsonl':
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, None, 'Invalid JSON'
+                continue
+            if isinstance(row, dict):
+                yield line_number, row, None
+            else:
+                yield line_number, None, 'Expected a JSON object'
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_number, None, f'Expected {len(header)} columns, got {len(values)}'
+            continue
+        yield line_number, {name: value for name, value in zip(header, values) if value != ''}, None
+
+
+def _validation_error_message(exc: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(map(str, error["loc"]))}: {error["msg"]}' if error['loc'] else error['msg']
+        for error in exc.errors()
+    )
+
+
+class UserImportService:
+    """
+    Import users in chunks: validate each row like a sign-up, hash plain passwords across worker processes, then COPY
+    the chunk and commit it. Rows that fail are reported instead of aborting the run.
+    """
+
+    def __init__(
+        self,
+        auth_repository: Annotated[AuthRepository, Depends()],
+        phone_filter: Annotated[PhoneFilter, Depends(get_phone_filter)],
+        negative_cache: Annotated[SignInNegativeCache, Depends(get_sign_in_negative_cache)],
+    ):
+        self.repo = auth_repository
+        self.phone_filter = phone_filter
+        self.negative_cache = negative_cache
+
+    async def import_users(
+        self,
+        lines: AsyncIterable[str],
+        file_format: str,
+        hash_executor: BoundedProcessExecutor = user_import_hash_executor,
+        chunk_size: int = settings.user_import_chunk_size,
+    ) -> AsyncIterator[UserImportItem]:
+        """
+        Yields:
+            Every failed row as soon as it is known to fail, and the running totals after every committed chunk. The
+            last item is the final report, so a run that breaks off still has the report of what it committed.
+        """
+        report = UserImportReportSchema()
+        seen_phones: set[str] = set()
+        chunk: list[tuple[int, UserImportRowSchema]] = []
+
+        async for line_number, raw_row, error in parse_rows(lines, file_format):
+            row = self._validate_row(report, line_number, raw_row, error, seen_phones)
+            if isinstance(row, UserImportErrorSchema):
+                yield row
+                continue
+
+            chunk.append((line_number, row))
+            if len(chunk) >= chunk_size:
+                for item in await self._import_chunk(chunk, report, hash_executor):
+                    yield item
+                yield report.model_copy()
+                chunk = []
+
+        if chunk:
+            for item in await self._import_chunk(chunk, report, hash_executor):
+                yield item
+
+        logger.info('Imported %s users, %s rows failed', report.imported, report.failed)
+        yield report
+
+    def _validate_row(
+        self,
+        report: UserImportReportSchema,
+        line_number: int,
+        raw_row: dict | None,
+        error: str | None,
+        seen_phones: set[str],
+    ) -> UserImportRowSchema | UserImportErrorSchema:
+        if raw_row is None:
+            return self._error(report, line_number, None, error)
+
+        try:
+            row = UserImportRowSchema.model_validate(raw_row)
+        except ValidationError as exc:
+            return self._error(report, line_number, raw_row.get('phone'), _validation_error_message(exc))
+
+        if row.phone in seen_phones:
+            return self._error(report, line_number, row.phone, 'Duplicate phone in the input')
+        seen_phones.add(row.phone)
+        return row
+
+    async def _import_chunk(
+        self,
+        chunk: list[tuple[int, UserImportRowSchema]],
+        report: UserImportReportSchema,
+        hash_executor: BoundedProcessExecutor,
+    ) -> list[UserImportErrorSchema]:
+        # Skip phones that are already registered before spending any hashing on them.
+        registered_phones = await self.repo.get_registered_phones([row.phone for _, row in chunk])
+        errors = []
+        new_rows = []
+        for line_number, row in chunk:
+            if row.phone in registered_phones:
+                errors.append(self._error(report, line_number, row.phone, 'Phone is already registered'))
+            else:
+                new_rows.append((line_number, row))
+        if not new_rows:
+            return errors
+
+        hashed_passwords = iter(
+            await self._hash_passwords(
+                [row.password for _, row in new_rows if row.hashed_password is None],
+                hash_executor,
+            )
+        )
+        users = [
+            UserCreateData(
+                first_name=row.first_name,
+                last_name=row.last_name,
+                phone=row.phone,
+                hashed_password=row.hashed_password or next(hashed_passwords),
+            )
+            for _, row in new_rows
+        ]
+        inserted_phones = await self.repo.copy_users(users)
+        await self.repo.unit_of_work.commit()
+
+        for line_number, row in new_rows:
+            if row.phone not in inserted_phones:  # registered concurrently since the check above
+                errors.append(self._error(report, line_number, row.phone, 'Phone is already registered'))
+                continue
+            report.imported += 1
+            self.phone_filter.add(row.phone)
+            await self.negative_cache.discard(row.phone)
+        return errors
+
+    @staticmethod
+    async def _hash_passwords(passwords: list[str], hash_executor: BoundedProcessExecutor) -> list[str]:
+        """Split the passwords into one contiguous batch per worker and hash the batches in parallel."""
+        if not passwords:
+            return []
+
+        batch_size = math.ceil(len(passwords) / hash_executor.workers)
+        batches = await asyncio.gather(
+            *(hash_executor.run(hash_passwords, list(batch)) for batch in itertools.batched(passwords, batch_size))
+        )
+        return [hashed_password for batch in batches for hashed_password in batch]
+
+    @staticmethod
+    def _error(
+        report: UserImportReportSchema,
+        line_number: int,
+        phone: str | None,
+        error: str,
+    ) -> UserImportErrorSchema:
+        report.failed += 1
+        return UserImportErrorSchema(line=line_number, phone=phone, error=error)
@@ -0,0 +1,64 @@
+"""
+Provide implementation of the cache-aside layer for user profiles.
+"""
+
+import uuid
+from typing import Any
+
+from auth_service.core.cache import (
+    CacheBackend,
+    InMemoryCacheBackend,
+)
+from auth_service.core.config import settings
+from auth_service.core.metrics import (
+    Counter,
+    registry,
+)
+from auth_service.models import User
+from auth_service.schemas.http.users import UserSchema
+
+USER_PROFILE_CACHE_REQUESTS = registry.register(
+    Counter('user_profile_cache_requests_total', 'User profile cache lookups by result.', ['result'])
+)
+
+
+class UserProfileCache:
+    """
+    Cache user profiles as serialized `UserSchema` JSON, so a hit skips both the database and pydantic.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    async def get(self, user_id: uuid.UUID) -> bytes | None:
+        profile = await self.backend.get(self._key(user_id))
+        USER_PROFILE_CACHE_REQUESTS.inc(result='miss' if profile is None else 'hit')
+        return profile
+
+    async def set(self, user: User) -> bytes:
+        profile = UserSchema.model_validate(user).model_dump_json().encode()
+        await self.backend.set(self._key(user.id), profile, ttl=self.ttl)
+        return profile
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        await self.backend.delete(self._key(user_id))
+
+    async def invalidate_changed(self, changed_instances: list[Any]) -> None:
+        for instance in changed_instances:
+            if isinstance(instance, User):
+                await self.invalidate(instance.id)
+
+    @staticmethod
+    def _key(user_id: uuid.UUID) -> str:
+        return f'user-profile:{user_id}'
+
+
+user_profile_cache = UserProfileCache(
+    backend=InMemoryCacheBackend(maxsize=settings.user_profile_cache_size),
+    ttl=settings.user_profile_cache_ttl,
+)
+
+
+def get_user_profile_cache() -> UserProfileCache:
+    return user_profile_cache
@@ -0,0 +1,35 @@
+import json
+
+from fastapi import status
+
+
+async def test_import_users(client, mock_user):
+    body = (
+        'first_name,last_name,phone,password\n'
+        'Anna,Smith,481112223331,Pwd12345!\n'
+        f'Bob,Smith,{mock_user.phone},Pwd12345!\n'
+    )
+
+    response = await client.post(
+        '/api/admin/v1/users/import',
+        params={'file_format': 'csv'},
+        content=body,
+        headers={'Authorization': 'Bearer admin-token'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {'line': 3, 'phone': mock_user.phone, 'error': 'Phone is already registered'},
+        {'imported': 1, 'failed': 1},
+    ]
+
+
+async def test_import_users_requires_admin_token(client):
+    response = await client.post(
+        '/api/admin/v1/users/import',
+        content='',
+        headers={'Authorization': 'Bearer wrong'},
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
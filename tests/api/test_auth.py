@@ -1,8 +1,30 @@
 import time
 import uuid
+from datetime import (
+    datetime,
+    timedelta,
+)
 
 import pytest
 from fastapi import status
+from passlib.context import CryptContext
+from sqlalchemy import (
+    func,
+    select,
+    update,
+)
+
+from auth_service.core.config import settings
+from auth_service.core.metrics import (
+    DB_QUERY_DURATION,
+    PASSWORD_HASH_DURATION,
+)
+from auth_service.models import (
+    RevokedAccessToken,
+    RotatedRefreshToken,
+)
+from auth_service.services.auth_service import REFRESH_TOKEN_REUSES
+from auth_service.services.opaque_access_tokens import OPAQUE_ACCESS_TOKEN_PREFIX
 
 
 async def test_sign_up(client):
@@ -32,6 +54,26 @@ async def test_sign_up_when_another_phone_user_exists(client, mock_user):
     assert response.json()['detail'] == 'User already exists'
 
 
+async def test_sign_up_skips_pre_check_for_phones_missing_from_filter(client, mock_user, phone_filter):
+    phone_filter.ready = True  # built empty, so it has never seen mock_user's phone
+    pre_checks = DB_QUERY_DURATION.count(method='AuthRepository.get_user_by_phone')
+    request_data = {
+        'first_name': 'John',
+        'last_name': 'Wilson',
+        'password': 'Pwd12345!',
+    }
+
+    response = await client.post('/api/v1/sign-up', json={**request_data, 'phone': '48547475447'})
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert phone_filter.might_contain('48547475447')
+
+    response = await client.post('/api/v1/sign-up', json={**request_data, 'phone': mock_user.phone})
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert DB_QUERY_DURATION.count(method='AuthRepository.get_user_by_phone') == pre_checks
+
+
 @pytest.mark.parametrize(
     'mock_user',
     [
@@ -56,6 +98,28 @@ async def test_sign_in(client, mock_user):
     assert data['token_type']
 
 
+@pytest.mark.parametrize(
+    'mock_user',
+    [
+        {'hashed_password': CryptContext(schemes=['bcrypt'], bcrypt__rounds=4).hash('Pwd12345!')},
+    ],
+    indirect=True,
+)
+async def test_sign_in_upgrades_outdated_password_hash(client, session, mock_user):
+    outdated_hashed_password = mock_user.hashed_password
+    request_data = {
+        'phone': mock_user.phone,
+        'password': 'Pwd12345!',
+    }
+
+    response = await client.post('/api/v1/sign-in', json=request_data)
+
+    assert response.status_code == status.HTTP_200_OK
+    await session.refresh(mock_user)
+    assert mock_user.hashed_password != outdated_hashed_password
+    assert mock_user.hashed_password.startswith('$2b$12$')
+
+
 @pytest.mark.parametrize(
     'mock_user',
     [
@@ -75,6 +139,41 @@ async def test_sign_in_with_another_phone(client, mock_user):
     assert response.json()['detail'] == 'Invalid credentials'
 
 
+async def test_sign_in_with_unknown_phone_is_not_cached_when_disabled(client, negative_cache):
+    negative_cache.enabled = False
+
+    response = await client.post('/api/v1/sign-in', json={'phone': '48547475447', 'password': 'Pwd12345!'})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert negative_cache.backend.values == {}
+
+
+async def test_sign_in_with_unknown_phone_is_cached_until_sign_up(client, negative_cache):
+    request_data = {
+        'phone': '48547475447',
+        'password': 'Pwd12345!',
+    }
+    verifies = PASSWORD_HASH_DURATION.count(operation='verify')
+
+    response = await client.post('/api/v1/sign-in', json=request_data)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert await negative_cache.contains(request_data['phone'])
+    assert PASSWORD_HASH_DURATION.count(operation='verify') == verifies + 1
+
+    response = await client.post(
+        '/api/v1/sign-up',
+        json={**request_data, 'first_name': 'John', 'last_name': 'Wilson'},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert not await negative_cache.contains(request_data['phone'])
+
+    response = await client.post('/api/v1/sign-in', json=request_data)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
 @pytest.mark.parametrize(
     'mock_user',
     [
@@ -94,6 +193,30 @@ async def test_sign_in_with_invalid_password(client, mock_user):
     assert response.json()['detail'] == 'Invalid credentials'
 
 
+@pytest.mark.parametrize(
+    'mock_user',
+    [
+        {'password': 'Pwd12345!'},
+    ],
+    indirect=True,
+)
+async def test_sign_in_locks_out_phone_after_repeated_failures(client, mock_user):
+    request_data = {
+        'phone': mock_user.phone,
+        'password': 'pWd12345!',
+    }
+
+    for _ in range(settings.sign_in_lockout_threshold):
+        response = await client.post('/api/v1/sign-in', json=request_data)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await client.post('/api/v1/sign-in', json={**request_data, 'password': 'Pwd12345!'})
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response.json()['error_code'] == 'too_many_requests'
+    assert int(response.headers['Retry-After']) == settings.sign_in_lockout_base_duration
+
+
 async def test_get_profile(client, auth_client, mock_user):
     client = auth_client(
         client,
@@ -111,6 +234,19 @@ async def test_get_profile(client, auth_client, mock_user):
     assert data['phone'] == mock_user.phone
 
 
+async def test_get_profile_is_served_from_cache(client, auth_client, mock_user, profile_cache):
+    client = auth_client(
+        client,
+        user_id=mock_user.id,
+    )
+    first_response = await client.get('/api/v1/me')
+    second_response = await client.get('/api/v1/me')
+
+    assert second_response.status_code == status.HTTP_200_OK
+    assert second_response.json() == first_response.json()
+    assert profile_cache.backend.hits == 1
+
+
 async def test_get_profile_when_token_missed(client, mock_user):
     response = await client.get('/api/v1/me')
 
@@ -140,3 +276,160 @@ async def test_get_profile_when_user_not_found(client, auth_client, mock_user):
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.json()['detail'] == 'Invalid credentials'
+
+
+async def test_refresh(client, mock_refresh_token):
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()
+
+    assert data['access_token']
+    assert data['refresh_token'] != mock_refresh_token
+    assert data['token_type']
+
+
+@pytest.mark.skipif(not settings.refresh_token_legacy_digest, reason='`hashed_token` is mapped only with the flag on')
+@pytest.mark.parametrize(
+    'mock_refresh_token',
+    [
+        {'legacy': True},
+    ],
+    indirect=True,
+)
+async def test_refresh_with_legacy_hex_digest(client, mock_refresh_token):
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+async def test_refresh_when_token_reused(client, mock_refresh_token):
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()['detail'] == 'Invalid or expired refresh token'
+
+
+async def age_tombstones(session, seconds: int) -> None:
+    await session.execute(
+        update(RotatedRefreshToken).values(rotated_at=RotatedRefreshToken.rotated_at - timedelta(seconds=seconds))
+    )
+
+
+async def test_refresh_token_reuse_revokes_family(client, mock_refresh_token, session):
+    reuse_checks = DB_QUERY_DURATION.count(method='AuthRepository.revoke_rotated_refresh_token_family')
+    reuses = REFRESH_TOKEN_REUSES.value()
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+    rotated_token = response.json()['refresh_token']
+    response = await client.post('/api/v1/refresh', json={'refresh_token': rotated_token})
+    latest_token = response.json()['refresh_token']
+    assert DB_QUERY_DURATION.count(method='AuthRepository.revoke_rotated_refresh_token_family') == reuse_checks
+    await age_tombstones(session, seconds=settings.refresh_token_reuse_grace_period + 1)
+
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert REFRESH_TOKEN_REUSES.value() == reuses + 1
+    response = await client.post('/api/v1/refresh', json={'refresh_token': latest_token})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_refresh_token_reuse_within_grace_period_keeps_family(client, mock_refresh_token):
+    reuses = REFRESH_TOKEN_REUSES.value()
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+    latest_token = response.json()['refresh_token']
+
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert REFRESH_TOKEN_REUSES.value() == reuses
+    response = await client.post('/api/v1/refresh', json={'refresh_token': latest_token})
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.parametrize(
+    'mock_refresh_token',
+    [
+        {'created_at': datetime.now() - timedelta(seconds=settings.refresh_token_life_time, days=1)},
+    ],
+    indirect=True,
+)
+async def test_refresh_when_token_expired(client, mock_refresh_token):
+    response = await client.post('/api/v1/refresh', json={'refresh_token': mock_refresh_token})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()['detail'] == 'Invalid or expired refresh token'
+
+
+@pytest.mark.parametrize(
+    'mock_user',
+    [
+        {'password': 'Pwd12345!'},
+    ],
+    indirect=True,
+)
+async def test_refresh_token_issued_on_sign_in(client, mock_user):
+    response = await client.post('/api/v1/sign-in', json={'phone': mock_user.phone, 'password': 'Pwd12345!'})
+    refresh_token = response.json()['refresh_token']
+
+    response = await client.post('/api/v1/refresh', json={'refresh_token': refresh_token})
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+async def test_logout_revokes_access_token(client, auth_client, mock_user, mock_refresh_token, session):
+    client = auth_client(
+        client,
+        user_id=mock_user.id,
+    )
+    assert (await client.get('/api/v1/me')).status_code == status.HTTP_200_OK
+
+    response = await client.post('/api/v1/logout', json={'refresh_token': mock_refresh_token})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.get('/api/v1/me')
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert await session.scalar(select(func.count()).select_from(RevokedAccessToken)) == 1
+
+
+async def test_opaque_access_token(client, mock_user, opaque_token_store):
+    opaque_token_store.enabled = True
+    response = await client.post('/api/v1/sign-in', json={'phone': mock_user.phone, 'password': 'Password123!'})
+    access_token = response.json()['access_token']
+    assert access_token.startswith(OPAQUE_ACCESS_TOKEN_PREFIX)
+    client.headers['Authorization'] = f'Bearer {access_token}'
+    lookups = DB_QUERY_DURATION.count(method='AuthRepository.get_opaque_access_token')
+
+    assert (await client.get('/api/v1/me')).status_code == status.HTTP_200_OK
+    assert DB_QUERY_DURATION.count(method='AuthRepository.get_opaque_access_token') == lookups
+
+    opaque_token_store.clear()  # as if another process had issued the token
+    assert (await client.get('/api/v1/me')).status_code == status.HTTP_200_OK
+    assert (await client.get('/api/v1/me')).status_code == status.HTTP_200_OK
+    assert DB_QUERY_DURATION.count(method='AuthRepository.get_opaque_access_token') == lookups + 1
+
+    client.headers['Authorization'] = f'Bearer {OPAQUE_ACCESS_TOKEN_PREFIX}unknown'
+    for _ in range(2):
+        response = await client.get('/api/v1/me')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()['detail'] == 'Invalid token'
+    # The unknown token is remembered, so only the first attempt looks it up.
+    assert DB_QUERY_DURATION.count(method='AuthRepository.get_opaque_access_token') == lookups + 2
+
+
+async def test_logout_revokes_opaque_access_token(client, mock_user, opaque_token_store):
+    opaque_token_store.enabled = True
+    response = await client.post('/api/v1/sign-in', json={'phone': mock_user.phone, 'password': 'Password123!'})
+    token_pair = response.json()
+    client.headers['Authorization'] = f'Bearer {token_pair["access_token"]}'
+
+    response = await client.post('/api/v1/logout', json={'refresh_token': token_pair['refresh_token']})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.get('/api/v1/me')
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
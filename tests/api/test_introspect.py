@@ -0,0 +1,98 @@
+import time
+import uuid
+
+from fastapi import status
+
+from auth_service.core.config import settings
+from auth_service.core.metrics import DB_QUERY_DURATION
+from auth_service.core.security import (
+    create_access_token,
+    decode_access_token,
+    revoke_access_token,
+)
+from auth_service.services.opaque_access_tokens import OPAQUE_ACCESS_TOKEN_PREFIX
+
+HEADERS = {'Authorization': 'Bearer introspection-token'}
+
+
+async def test_introspect(client, mock_user):
+    active_token = create_access_token(user_id=mock_user.id)
+    revoked_token = create_access_token(user_id=mock_user.id)
+    revoked = decode_access_token(revoked_token)
+    revoke_access_token(jti=revoked.jti, exp=revoked.exp)
+
+    response = await client.post(
+        '/api/v1/introspect',
+        json={'tokens': [active_token, 'garbage', revoked_token]},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    active, invalid, revoked_result = response.json()['tokens']
+    assert active['active'] is True
+    assert active['sub'] == str(mock_user.id)
+    assert active['exp'] > time.time()
+    assert active['user_active'] is None
+    assert invalid == {
+        'active': False,
+        'revoked': False,
+        'sub': None,
+        'exp': None,
+        'user_active': None,
+        'user_phone_verified': None,
+    }
+    assert revoked_result['active'] is False
+    assert revoked_result['revoked'] is True
+    assert revoked_result['sub'] == str(mock_user.id)
+
+
+async def test_introspect_with_user_flags(client, mock_user):
+    tokens = [create_access_token(user_id=mock_user.id), create_access_token(user_id=uuid.uuid4())]
+
+    response = await client.post('/api/v1/introspect', json={'tokens': tokens, 'include_user': True}, headers=HEADERS)
+
+    assert response.status_code == status.HTTP_200_OK
+    known_user, deleted_user = response.json()['tokens']
+    assert known_user['user_active'] is mock_user.is_active
+    assert known_user['user_phone_verified'] is mock_user.is_phone_verified
+    assert deleted_user['active'] is True
+    assert deleted_user['user_active'] is None
+
+
+async def test_introspect_rejects_too_many_tokens(client):
+    tokens = ['token'] * (settings.introspect_max_tokens + 1)
+
+    response = await client.post('/api/v1/introspect', json={'tokens': tokens}, headers=HEADERS)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+async def test_introspect_opaque_tokens_in_one_query(client, mock_user, opaque_token_store):
+    opaque_token_store.enabled = True
+    tokens = []
+    for _ in range(2):
+        response = await client.post('/api/v1/sign-in', json={'phone': mock_user.phone, 'password': 'Password123!'})
+        tokens.append(response.json()['access_token'])
+    opaque_token_store.clear()
+    lookups = DB_QUERY_DURATION.count(method='AuthRepository.get_opaque_access_tokens')
+
+    tokens.append(f'{OPAQUE_ACCESS_TOKEN_PREFIX}unknown')
+    response = await client.post('/api/v1/introspect', json={'tokens': tokens}, headers=HEADERS)
+
+    assert response.status_code == status.HTTP_200_OK
+    first, second, unknown = response.json()['tokens']
+    assert first['active'] is second['active'] is True
+    assert first['sub'] == second['sub'] == str(mock_user.id)
+    assert unknown['active'] is False
+    assert DB_QUERY_DURATION.count(method='AuthRepository.get_opaque_access_tokens') == lookups + 1
+
+
+async def test_introspect_requires_introspection_token(client, mock_user):
+    tokens = [create_access_token(user_id=mock_user.id)]
+
+    response = await client.post('/api/v1/introspect', json={'tokens': tokens})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    client.headers['Authorization'] = f'Bearer {tokens[0]}'
+    response = await client.post('/api/v1/introspect', json={'tokens': tokens})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
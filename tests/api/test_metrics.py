@@ -0,0 +1,11 @@
+async def test_metrics(client):
+    await client.get('/health')
+    await client.get('/unknown')
+
+    response = await client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"}' in response.text
+    assert 'db_pool_size ' in response.text
@@ -0,0 +1,113 @@
+from datetime import datetime
+
+import pytest
+from fastapi import status
+from uuid6 import uuid7
+
+from auth_service.models import RefreshToken
+
+PASSWORD = 'Pwd12345!'
+
+
+async def sign_in(client, phone: str, user_agent: str) -> dict:
+    response = await client.post(
+        '/api/v1/sign-in',
+        json={'phone': phone, 'password': PASSWORD},
+        headers={'User-Agent': user_agent},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+@pytest.mark.parametrize('mock_user', [{'password': PASSWORD}], indirect=True)
+async def test_get_sessions(client, mock_user):
+    await sign_in(client, mock_user.phone, user_agent='laptop')
+    tokens = await sign_in(client, mock_user.phone, user_agent='phone')
+
+    response = await client.get(
+        '/api/v1/sessions',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [(s['user_agent'], s['current']) for s in data['sessions']] == [('phone', True), ('laptop', False)]
+    assert data['sessions'][0]['ip_address']
+    assert data['next_cursor'] is None
+
+
+async def test_get_sessions_is_paginated(client, auth_client, mock_user, session):
+    session.add_all([RefreshToken(id=uuid7(), user_id=mock_user.id, token_digest=bytes([i])) for i in range(3)])
+    await session.commit()
+    client = auth_client(client, user_id=mock_user.id)
+
+    first_page = (await client.get('/api/v1/sessions', params={'limit': 2})).json()
+    second_page = (await client.get('/api/v1/sessions', params={'limit': 2, 'after': first_page['next_cursor']})).json()
+
+    assert len(first_page['sessions']) == 2
+    assert first_page['next_cursor'] == first_page['sessions'][-1]['id']
+    assert len(second_page['sessions']) == 1
+    assert second_page['next_cursor'] is None
+    ids = [s['id'] for s in first_page['sessions'] + second_page['sessions']]
+    assert ids == sorted(ids, reverse=True)
+
+
+@pytest.mark.parametrize('mock_user', [{'password': PASSWORD}], indirect=True)
+async def test_refresh_updates_session_metadata(client, mock_user):
+    tokens = await sign_in(client, mock_user.phone, user_agent='laptop')
+
+    response = await client.post(
+        '/api/v1/refresh',
+        json={'refresh_token': tokens['refresh_token']},
+        headers={'User-Agent': 'laptop/2'},
+    )
+    tokens = response.json()
+    response = await client.get(
+        '/api/v1/sessions',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+    )
+
+    (current_session,) = response.json()['sessions']
+    assert current_session['user_agent'] == 'laptop/2'
+    assert current_session['ip_address']
+    assert current_session['current'] is True
+    assert datetime.fromisoformat(current_session['last_used_at'])
+
+
+@pytest.mark.parametrize('mock_user', [{'password': PASSWORD}], indirect=True)
+async def test_delete_sessions(client, mock_user):
+    await sign_in(client, mock_user.phone, user_agent='laptop')
+    await sign_in(client, mock_user.phone, user_agent='tablet')
+    tokens = await sign_in(client, mock_user.phone, user_agent='phone')
+    client.headers['Authorization'] = f'Bearer {tokens["access_token"]}'
+
+    response = await client.delete('/api/v1/sessions', params={'keep_current': True})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['revoked'] == 2
+    assert [s['user_agent'] for s in (await client.get('/api/v1/sessions')).json()['sessions']] == ['phone']
+
+    response = await client.delete('/api/v1/sessions')
+
+    assert response.json()['revoked'] == 1
+    assert (await client.get('/api/v1/sessions')).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.parametrize('mock_user', [{'password': PASSWORD}], indirect=True)
+async def test_session_keeps_its_id_and_start_through_rotations(client, mock_user):
+    tokens = await sign_in(client, mock_user.phone, user_agent='laptop')
+    await sign_in(client, mock_user.phone, user_agent='phone')
+    client.headers['Authorization'] = f'Bearer {tokens["access_token"]}'
+    phone, laptop = (await client.get('/api/v1/sessions')).json()['sessions']
+    first_page = (await client.get('/api/v1/sessions', params={'limit': 1})).json()
+
+    # The laptop's token is rotated while the client pages through the sessions.
+    tokens = (await client.post('/api/v1/refresh', json={'refresh_token': tokens['refresh_token']})).json()
+    client.headers['Authorization'] = f'Bearer {tokens["access_token"]}'
+    second_page = (await client.get('/api/v1/sessions', params={'limit': 1, 'after': first_page['next_cursor']})).json()
+
+    assert first_page['sessions'][0]['id'] == phone['id']
+    (rotated,) = second_page['sessions']
+    assert rotated['id'] == laptop['id']
+    assert rotated['created_at'] == laptop['created_at']
+    assert rotated['current'] is True
@@ -0,0 +1,11 @@
+async def test_jwks(client):
+    response = await client.get('/.well-known/jwks.json')
+
+    assert response.status_code == 200
+    assert response.json() == {'keys': []}
+    assert response.headers['cache-control'] == 'public, max-age=300'
+
+    response = await client.get('/.well-known/jwks.json', headers={'If-None-Match': response.headers['etag']})
+
+    assert response.status_code == 304
+    assert response.content == b''
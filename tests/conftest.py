@@ -25,9 +25,19 @@ from auth_service.core.database import (
     get_database_session,
 )
 from auth_service.main import create_application
+from auth_service.services.opaque_access_tokens import get_opaque_access_token_store
+from auth_service.services.phone_filter import get_phone_filter
+from auth_service.services.refresh_token_batcher import get_refresh_token_insert_batcher
+from auth_service.services.sign_in_negative_cache import get_sign_in_negative_cache
+from auth_service.services.sign_in_throttle import get_sign_in_throttle
+from auth_service.services.user_profile_cache import get_user_profile_cache
 
 pytest_plugins = [
+    'tests.fixtures.cache',
     'tests.fixtures.dependencies',
+    'tests.fixtures.rate_limit',
+    'tests.fixtures.timer',
+    'tests.fixtures.tokens',
     'tests.fixtures.users',
 ]
 
@@ -80,10 +90,24 @@ async def create_test_db() -> AsyncGenerator[None]:
 
 
 @pytest.fixture
-def app(session: AsyncSession) -> FastAPI:
+def app(
+    session: AsyncSession,
+    profile_cache,
+    sign_in_throttle,
+    negative_cache,
+    phone_filter,
+    opaque_token_store,
+    token_batcher,
+) -> FastAPI:
     _app = create_application()
 
     _app.dependency_overrides[get_database_session] = lambda: session
+    _app.dependency_overrides[get_user_profile_cache] = lambda: profile_cache
+    _app.dependency_overrides[get_sign_in_throttle] = lambda: sign_in_throttle
+    _app.dependency_overrides[get_sign_in_negative_cache] = lambda: negative_cache
+    _app.dependency_overrides[get_phone_filter] = lambda: phone_filter
+    _app.dependency_overrides[get_opaque_access_token_store] = lambda: opaque_token_store
+    _app.dependency_overrides[get_refresh_token_insert_batcher] = lambda: token_batcher
     return _app
 
 
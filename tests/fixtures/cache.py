@@ -0,0 +1,33 @@
+import pytest
+
+from auth_service.core.cache import CacheBackend
+from auth_service.services.sign_in_negative_cache import SignInNegativeCache
+from auth_service.services.user_profile_cache import UserProfileCache
+
+
+class FakeCacheBackend(CacheBackend):
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.hits = 0
+
+    async def get(self, key: str) -> bytes | None:
+        value = self.values.get(key)
+        if value is not None:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.values[key] = value
+
+    async def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def profile_cache() -> UserProfileCache:
+    return UserProfileCache(backend=FakeCacheBackend(), ttl=60)
+
+
+@pytest.fixture
+def negative_cache() -> SignInNegativeCache:
+    return SignInNegativeCache(backend=FakeCacheBackend(), ttl=60)
@@ -0,0 +1,29 @@
+import pytest
+
+from auth_service.core.rate_limit import CounterStore
+from auth_service.services.sign_in_throttle import SignInThrottle
+
+
+class FakeCounterStore(CounterStore):
+    """Counters that never expire; tests that need expiry use `InMemoryCounterStore` with a fake timer."""
+
+    def __init__(self):
+        self.values: dict[str, int] = {}
+
+    async def increment(self, key: str, ttl: float) -> int:
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def get(self, key: str) -> int:
+        return self.values.get(key, 0)
+
+    async def set(self, key: str, value: int, ttl: float) -> None:
+        self.values[key] = value
+
+    async def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def sign_in_throttle() -> SignInThrottle:
+    return SignInThrottle(store=FakeCounterStore())
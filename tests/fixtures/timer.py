@@ -0,0 +1,16 @@
+import pytest
+
+
+class FakeTimer:
+    """Clock for code that takes a `timer`; tests move it forward by setting `now`."""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def timer(request) -> FakeTimer:
+    return FakeTimer(now=getattr(request, 'param', 1000.0))
@@ -0,0 +1,38 @@
+from typing import AsyncGenerator
+
+import pytest
+
+from auth_service.core.security import (
+    create_hash,
+    create_refresh_token,
+)
+from auth_service.models import RefreshToken
+from auth_service.services.opaque_access_tokens import OpaqueAccessTokenStore
+from auth_service.services.refresh_token_batcher import RefreshTokenInsertBatcher
+
+
+@pytest.fixture
+async def mock_refresh_token(session, mock_user, request) -> AsyncGenerator[str]:
+    params: dict = getattr(request, 'param', {}) or {}
+    refresh_token = create_refresh_token()
+    token = RefreshToken(user_id=mock_user.id)
+    if params.get('legacy'):
+        token.legacy_hashed_token = create_hash(refresh_token).hex()
+    else:
+        token.token_digest = create_hash(refresh_token)
+    if 'created_at' in params:
+        token.created_at = params['created_at']
+    session.add(token)
+    await session.commit()
+
+    yield refresh_token
+
+
+@pytest.fixture
+def opaque_token_store() -> OpaqueAccessTokenStore:
+    return OpaqueAccessTokenStore(enabled=False, shards=4, maxsize=100)
+
+
+@pytest.fixture
+async def token_batcher(session) -> RefreshTokenInsertBatcher:
+    return RefreshTokenInsertBatcher(bind=await session.connection(), enabled=False, max_batch_size=100, linger=0.01)
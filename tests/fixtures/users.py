@@ -4,6 +4,7 @@ import pytest
 
 from auth_service.core.security import hash_password
 from auth_service.models import User
+from auth_service.services.phone_filter import PhoneFilter
 
 
 @pytest.fixture
@@ -13,10 +14,15 @@ async def mock_user(session, request) -> AsyncGenerator[User]:
         first_name='John',
         last_name='Wilson',
         phone=params.get('phone', '48547475446'),
-        hashed_password=hash_password(params.get('password', 'Password123!')),
+        hashed_password=params.get('hashed_password') or hash_password(params.get('password', 'Password123!')),
     )
     session.add(user)
     await session.commit()
     await session.refresh(user)
 
     yield user
+
+
+@pytest.fixture
+def phone_filter() -> PhoneFilter:
+    return PhoneFilter(capacity=1000, error_rate=0.01)
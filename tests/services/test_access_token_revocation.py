@@ -0,0 +1,31 @@
+import time
+import uuid
+
+from sqlalchemy import (
+    delete,
+    insert,
+)
+
+from auth_service.core.security import revoked_access_tokens
+from auth_service.models import RevokedAccessToken
+from auth_service.services.access_token_revocation import AccessTokenRevocationSync
+
+
+async def test_poll_loads_unexpired_revocations(test_engine):
+    now = int(time.time())
+    active, expired = uuid.uuid4(), uuid.uuid4()
+    async with test_engine.begin() as connection:
+        await connection.execute(
+            insert(RevokedAccessToken),
+            [{'jti': active, 'exp': now + 60}, {'jti': expired, 'exp': now - 60}],
+        )
+    sync = AccessTokenRevocationSync(engine=test_engine, dsn='', listen=False, poll_interval=0)
+
+    try:
+        assert await sync.poll() == 1
+        assert active in revoked_access_tokens
+        assert expired not in revoked_access_tokens
+        assert await sync.poll() == 1  # only the overlap window is re-read
+    finally:
+        async with test_engine.begin() as connection:
+            await connection.execute(delete(RevokedAccessToken).where(RevokedAccessToken.jti.in_([active, expired])))
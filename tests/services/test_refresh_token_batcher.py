@@ -0,0 +1,133 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from auth_service.core.config import settings
+from auth_service.core.database import UnitOfWork
+from auth_service.core.security import hash_password
+from auth_service.models import (
+    RefreshToken,
+    User,
+)
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.services.auth_service import AuthService
+from auth_service.services.refresh_token_batcher import RefreshTokenInsertBatcher
+
+
+async def test_concurrent_inserts_are_written_in_one_batch(session, mock_user, token_batcher):
+    token_batcher.max_batch_size = 3
+    token_batcher.linger = 60
+
+    token_ids = await asyncio.gather(
+        *(token_batcher.insert(user_id=mock_user.id, token_digest=bytes([i]) * 32, user_agent='app') for i in range(3))
+    )
+
+    assert token_batcher.batches == 1
+    assert token_batcher.inserted == 3
+    tokens = (await session.scalars(select(RefreshToken).where(RefreshToken.user_id == mock_user.id))).all()
+    assert {token.id for token in tokens} == set(token_ids)
+    assert all(token.family_id == token.id for token in tokens)
+
+
+async def test_partial_batch_is_written_after_linger(mock_user, token_batcher):
+    await asyncio.gather(
+        token_batcher.insert(user_id=mock_user.id, token_digest=b'a' * 32),
+        token_batcher.insert(user_id=mock_user.id, token_digest=b'b' * 32),
+    )
+
+    assert token_batcher.batches == 1
+    assert token_batcher.inserted == 2
+    assert token_batcher.pending == 0
+
+
+async def test_conflicting_row_fails_only_its_own_insert(session, mock_user, token_batcher):
+    first, duplicate, other = await asyncio.gather(
+        token_batcher.insert(user_id=mock_user.id, token_digest=b'a' * 32),
+        token_batcher.insert(user_id=mock_user.id, token_digest=b'a' * 32),
+        token_batcher.insert(user_id=mock_user.id, token_digest=b'b' * 32),
+        return_exceptions=True,
+    )
+
+    assert isinstance(duplicate, IntegrityError)
+    assert token_batcher.inserted == 2
+    assert token_batcher.failed == 1
+    token_ids = await session.scalars(select(RefreshToken.id).where(RefreshToken.user_id == mock_user.id))
+    assert set(token_ids) == {first, other}
+
+
+@pytest.mark.parametrize(
+    'mock_user',
+    [
+        {'password': 'Pwd12345!'},
+    ],
+    indirect=True,
+)
+async def test_sign_in_with_batched_refresh_token(client, mock_user, token_batcher):
+    token_batcher.enabled = True
+
+    response = await client.post('/api/v1/sign-in', json={'phone': mock_user.phone, 'password': 'Pwd12345!'})
+    assert response.status_code == 200
+    assert token_batcher.inserted == 1
+
+    response = await client.post('/api/v1/refresh', json={'refresh_token': response.json()['refresh_token']})
+    assert response.status_code == 200
+
+
+@pytest.fixture
+async def single_connection_engine() -> AsyncGenerator[AsyncEngine]:
+    engine = create_async_engine(settings.async_database_url, pool_size=1, max_overflow=0, pool_timeout=1)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def committed_user(single_connection_engine) -> AsyncGenerator[User]:
+    async with AsyncSession(single_connection_engine, expire_on_commit=False) as session:
+        user = User(
+            first_name='John',
+            last_name='Wilson',
+            phone='48547475448',
+            hashed_password=hash_password('Password123!'),
+        )
+        session.add(user)
+        await session.commit()
+
+        yield user
+
+        await session.delete(user)
+        await session.commit()
+
+
+async def test_batched_sign_in_releases_its_connection_while_waiting(
+    single_connection_engine,
+    committed_user,
+    profile_cache,
+    sign_in_throttle,
+    negative_cache,
+    phone_filter,
+    opaque_token_store,
+):
+    batcher = RefreshTokenInsertBatcher(bind=single_connection_engine, enabled=True, max_batch_size=1, linger=0)
+    async with AsyncSession(single_connection_engine, expire_on_commit=False) as session:
+        service = AuthService(
+            auth_repository=AuthRepository(unit_of_work=UnitOfWork(session=session)),
+            profile_cache=profile_cache,
+            sign_in_throttle=sign_in_throttle,
+            negative_cache=negative_cache,
+            phone_filter=phone_filter,
+            token_store=opaque_token_store,
+            token_batcher=batcher,
+        )
+
+        # The user lookup took the pool's only connection; the batch can only be written once it is released.
+        await service.issue_token_pair(phone=committed_user.phone, password='Password123!')
+
+    assert batcher.inserted == 1
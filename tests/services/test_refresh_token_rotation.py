@@ -0,0 +1,86 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import (
+    delete,
+    func,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth_service.core.database import UnitOfWork
+from auth_service.core.security import (
+    create_hash,
+    create_refresh_token,
+)
+from auth_service.models import (
+    RefreshToken,
+    RotatedRefreshToken,
+    User,
+)
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.services.auth_service import (
+    REFRESH_TOKEN_REUSES,
+    AuthService,
+)
+
+
+@pytest.fixture
+async def committed_refresh_token(test_engine) -> AsyncGenerator[tuple[str, RefreshToken]]:
+    async with AsyncSession(test_engine, expire_on_commit=False) as session:
+        user = User(first_name='John', last_name='Wilson', phone='48547475449', hashed_password='hash')
+        session.add(user)
+        await session.flush()
+        refresh_token = create_refresh_token()
+        repository = AuthRepository(unit_of_work=UnitOfWork(session=session))
+        family_id = await repository.create_refresh_token(user_id=user.id, token_digest=create_hash(refresh_token))
+        await session.commit()
+
+        yield refresh_token, family_id
+
+        await session.execute(delete(RotatedRefreshToken).where(RotatedRefreshToken.family_id == family_id))
+        await session.delete(user)
+        await session.commit()
+
+
+async def test_concurrent_refreshes_with_one_token_keep_the_family(
+    test_engine,
+    committed_refresh_token,
+    profile_cache,
+    sign_in_throttle,
+    negative_cache,
+    phone_filter,
+    opaque_token_store,
+    token_batcher,
+):
+    refresh_token, family_id = committed_refresh_token
+    reuses = REFRESH_TOKEN_REUSES.value()
+
+    async def refresh() -> str | HTTPException:
+        async with AsyncSession(test_engine) as session:
+            service = AuthService(
+                auth_repository=AuthRepository(unit_of_work=UnitOfWork(session=session)),
+                profile_cache=profile_cache,
+                sign_in_throttle=sign_in_throttle,
+                negative_cache=negative_cache,
+                phone_filter=phone_filter,
+                token_store=opaque_token_store,
+                token_batcher=token_batcher,
+            )
+            try:
+                token_pair = await service.refresh_tokens(refresh_token=refresh_token)
+            except HTTPException as exc:
+                return exc
+            await service.repo.unit_of_work.commit()
+            return token_pair.refresh_token
+
+    # The loser waits on the winner's row lock, then finds the token gone and its fresh tombstone.
+    winner, loser = sorted(await asyncio.gather(refresh(), refresh()), key=lambda result: isinstance(result, Exception))
+
+    assert isinstance(winner, str)
+    assert loser.status_code == 401
+    assert REFRESH_TOKEN_REUSES.value() == reuses
+    async with AsyncSession(test_engine) as session:
+        assert await session.scalar(select(func.count()).where(RefreshToken.family_id == family_id)) == 1
@@ -0,0 +1,85 @@
+import time
+import uuid
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+from sqlalchemy import (
+    func,
+    select,
+)
+
+from auth_service.core.config import settings
+from auth_service.core.database import UnitOfWork
+from auth_service.models import (
+    OpaqueAccessToken,
+    RefreshToken,
+    RotatedRefreshToken,
+)
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.services.refresh_token_sweeper import (
+    SWEEPER_LOCK_KEY,
+    RefreshTokenSweeper,
+)
+
+
+async def test_purge_expired_refresh_tokens(session, mock_user):
+    expired_at = datetime.now() - timedelta(seconds=settings.refresh_token_life_time, days=1)
+    session.add_all(
+        [RefreshToken(user_id=mock_user.id, token_digest=bytes([i]), created_at=expired_at) for i in range(3)],
+    )
+    session.add(RefreshToken(user_id=mock_user.id, token_digest=b'active'))
+    await session.commit()
+    repository = AuthRepository(unit_of_work=UnitOfWork(session=session))
+
+    assert await repository.purge_expired_refresh_tokens(limit=2) == 2
+    assert await repository.purge_expired_refresh_tokens(limit=2) == 1
+    assert await repository.purge_expired_refresh_tokens(limit=2) == 0
+
+    token_digests = await session.scalars(select(RefreshToken.token_digest).where(RefreshToken.user_id == mock_user.id))
+    assert token_digests.all() == [b'active']
+
+
+async def test_sweeper_skips_run_when_lock_is_held(test_engine):
+    sweeper = RefreshTokenSweeper(engine=test_engine, batch_size=10, batch_pause=0, interval=0)
+
+    async with test_engine.connect() as connection:
+        await connection.scalar(select(func.pg_advisory_lock(SWEEPER_LOCK_KEY)))
+        assert await sweeper.run_once() is None
+        await connection.scalar(select(func.pg_advisory_unlock(SWEEPER_LOCK_KEY)))
+
+    assert await sweeper.run_once() == 0
+    assert sweeper.runs == 1
+
+
+async def test_purge_expired_rotated_refresh_tokens(session):
+    rotated_at = datetime.now() - timedelta(seconds=settings.refresh_token_life_time, days=1)
+    session.add_all(
+        [RotatedRefreshToken(digest_prefix=i, family_id=uuid.uuid4(), rotated_at=rotated_at) for i in range(3)],
+    )
+    session.add(RotatedRefreshToken(digest_prefix=3, family_id=uuid.uuid4()))
+    await session.commit()
+    repository = AuthRepository(unit_of_work=UnitOfWork(session=session))
+
+    assert await repository.purge_expired_rotated_refresh_tokens(limit=2) == 2
+    assert await repository.purge_expired_rotated_refresh_tokens(limit=2) == 1
+
+    assert (await session.scalars(select(RotatedRefreshToken.digest_prefix))).all() == [3]
+
+
+async def test_purge_expired_opaque_access_tokens(session, mock_user):
+    now = int(time.time())
+    session.add_all(
+        [
+            OpaqueAccessToken(token_digest=bytes([i]), jti=uuid.uuid4(), user_id=mock_user.id, iat=now, exp=exp)
+            for i, exp in enumerate([now - 2, now - 1, now - 1, now + 60])
+        ],
+    )
+    await session.commit()
+    repository = AuthRepository(unit_of_work=UnitOfWork(session=session))
+
+    assert await repository.purge_expired_opaque_access_tokens(limit=2) == 2
+    assert await repository.purge_expired_opaque_access_tokens(limit=2) == 1
+
+    assert (await session.scalars(select(OpaqueAccessToken.token_digest))).all() == [bytes([3])]
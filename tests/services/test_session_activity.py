@@ -0,0 +1,40 @@
+import time
+import uuid
+
+from sqlalchemy import select
+
+from auth_service.core.database import UnitOfWork
+from auth_service.models import RefreshToken
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.services.session_activity import SessionActivityRecorder
+
+
+def test_touch_buffers_the_latest_use_per_session():
+    now = [1000.0]
+    recorder = SessionActivityRecorder(engine=None, flush_interval=60, max_pending=2, timer=lambda: now[0])
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    recorder.touch(first)
+    recorder.touch(second)
+    now[0] = 1001.0
+    recorder.touch(first)
+    recorder.touch(third)
+
+    assert recorder.pending == 2
+    assert recorder.dropped == 1
+
+
+async def test_update_sessions_last_used(session, mock_user):
+    token = RefreshToken(user_id=mock_user.id, token_digest=b'session')
+    rotated_token = RefreshToken(user_id=mock_user.id, token_digest=b'rotated', family_id=uuid.uuid4())
+    session.add_all([token, rotated_token])
+    await session.commit()
+    repository = AuthRepository(unit_of_work=UnitOfWork(session=session))
+    used_at = time.time()
+
+    sessions = {token.id: used_at, rotated_token.family_id: used_at, uuid.uuid4(): used_at}
+    assert await repository.update_sessions_last_used(sessions) == 2
+    assert await repository.update_sessions_last_used({token.id: used_at - 60}) == 0
+
+    last_used_at = await session.scalar(select(RefreshToken.last_used_at).where(RefreshToken.id == token.id))
+    assert abs(last_used_at.timestamp() - used_at) < 1
@@ -0,0 +1,77 @@
+import json
+
+from sqlalchemy import select
+
+from auth_service.core.database import UnitOfWork
+from auth_service.core.executors import BoundedProcessExecutor
+from auth_service.core.security import (
+    hash_password,
+    verify_password,
+)
+from auth_service.models import User
+from auth_service.repositories.auth_repository import AuthRepository
+from auth_service.schemas.http.users import UserImportReportSchema
+from auth_service.services.user_import import (
+    UserImportService,
+    iter_lines,
+)
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_import_users_reports_failed_rows(session, mock_user, phone_filter, negative_cache):
+    hashed_password = hash_password('Pwd12345!')
+    rows = [
+        {'first_name': 'Anna', 'last_name': 'Smith', 'phone': '+48 111 222 3331', 'password': 'Pwd12345!'},
+        {'first_name': 'Bob', 'last_name': 'Smith', 'phone': '48111222333-2', 'hashed_password': hashed_password},
+        {'first_name': 'Carl', 'last_name': 'Smith', 'phone': mock_user.phone, 'hashed_password': hashed_password},
+        {'first_name': 'Dan', 'last_name': 'Smith', 'phone': '481112223331', 'hashed_password': hashed_password},
+        {'first_name': 'Eve1', 'last_name': 'Smith', 'phone': '481112223334', 'hashed_password': hashed_password},
+        {'first_name': 'Fay', 'last_name': 'Smith', 'phone': '481112223335', 'hashed_password': 'plain'},
+        {'first_name': 'Gus', 'last_name': 'Smith', 'phone': '481112223336'},
+        {'first_name': 'Hal', 'last_name': 'Smith', 'phone': '481112223337', 'hashed_password': hashed_password},
+    ]
+    body = '\n'.join(map(json.dumps, rows)).encode() + b'\nnot json\n'
+    service = UserImportService(
+        auth_repository=AuthRepository(unit_of_work=UnitOfWork(session=session)),
+        phone_filter=phone_filter,
+        negative_cache=negative_cache,
+    )
+    executor = BoundedProcessExecutor(workers=1, queue_size=0)
+    try:
+        # Split mid-line to exercise the line decoder, and use tiny chunks to commit several times.
+        items = [
+            item
+            async for item in service.import_users(
+                lines=iter_lines(stream(body[:50], body[50:])),
+                file_format='jsonl',
+                hash_executor=executor,
+                chunk_size=2,
+            )
+        ]
+    finally:
+        executor.shutdown()
+
+    reports = [item for item in items if isinstance(item, UserImportReportSchema)]
+    errors = sorted((item for item in items if not isinstance(item, UserImportReportSchema)), key=lambda e: e.line)
+    # The running totals after each committed chunk of two rows, then the final report.
+    assert [(report.imported, report.failed) for report in reports] == [(2, 0), (3, 5), (3, 6)]
+    assert [(error.line, error.phone) for error in errors] == [
+        (3, mock_user.phone),
+        (4, '481112223331'),
+        (5, '481112223334'),
+        (6, '481112223335'),
+        (7, '481112223336'),
+        (9, None),
+    ]
+    assert errors[1].error == 'Duplicate phone in the input'
+    assert errors[4].error.startswith('Value error, Exactly one of password and hashed_password')
+
+    users = {user.phone: user for user in await session.scalars(select(User).where(User.last_name == 'Smith'))}
+    assert set(users) == {'481112223331', '481112223332', '481112223337'}
+    assert verify_password('Pwd12345!', users['481112223331'].hashed_password)
+    assert users['481112223332'].hashed_password == hashed_password
+    assert users['481112223337'].is_active
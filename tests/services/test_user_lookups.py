@@ -0,0 +1,74 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+)
+
+from auth_service.core.database import (
+    AsyncSessionLocal,
+    UnitOfWork,
+    replica_set,
+)
+from auth_service.models import User
+from auth_service.repositories.auth_repository import (
+    AuthRepository,
+    user_by_id_lookups,
+)
+
+
+@pytest.fixture
+async def committed_user(test_engine) -> AsyncGenerator[User]:
+    async with AsyncSession(test_engine, expire_on_commit=False) as session:
+        user = User(first_name='John', last_name='Wilson', phone='48547475447', hashed_password='hash')
+        session.add(user)
+        await session.commit()
+
+        yield user
+
+        await session.delete(user)
+        await session.commit()
+
+
+@pytest.fixture
+def replica(monkeypatch, test_engine) -> AsyncEngine:
+    monkeypatch.setattr(replica_set, 'choose', lambda: test_engine)
+    return test_engine
+
+
+async def test_concurrent_user_lookups_share_one_replica_query(replica, committed_user):
+    coalesced = user_by_id_lookups.coalesced
+    async with AsyncSessionLocal() as session, AsyncSessionLocal() as other_session:
+        leader = AuthRepository(unit_of_work=UnitOfWork(session=session))
+        waiter = AuthRepository(unit_of_work=UnitOfWork(session=other_session))
+
+        first, second = await asyncio.gather(
+            leader.get_user_by_id(user_id=committed_user.id),
+            waiter.get_user_by_id(user_id=committed_user.id),
+        )
+
+        assert user_by_id_lookups.coalesced == coalesced + 1
+        assert first.phone == second.phone == committed_user.phone
+        # Every caller gets an instance of its own session, which it can modify and flush as usual.
+        assert first in session and second in other_session
+
+
+async def test_user_lookups_after_writes_are_not_shared(replica, committed_user):
+    coalesced = user_by_id_lookups.coalesced
+    async with AsyncSessionLocal() as session, AsyncSessionLocal() as other_session:
+        writer = AuthRepository(unit_of_work=UnitOfWork(session=session))
+        reader = AuthRepository(unit_of_work=UnitOfWork(session=other_session))
+        user = await writer.get_user_by_id(user_id=committed_user.id)
+        await writer.update_user_password(user=user, hashed_password='new-hash')
+        await writer.flush()
+
+        own, other = await asyncio.gather(
+            writer.get_user_by_id(user_id=committed_user.id),
+            reader.get_user_by_id(user_id=committed_user.id),
+        )
+
+        assert user_by_id_lookups.coalesced == coalesced
+        assert own.hashed_password == 'new-hash'
+        assert other.hashed_password == 'hash'
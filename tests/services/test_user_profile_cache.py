@@ -0,0 +1,26 @@
+from auth_service.core.database import UnitOfWork
+
+
+async def test_profile_is_invalidated_when_user_changes(session, mock_user, profile_cache):
+    await profile_cache.set(mock_user)
+    unit_of_work = UnitOfWork(session=session)
+    unit_of_work.on_commit(profile_cache.invalidate_changed)
+
+    mock_user.first_name = 'Jack'
+    await unit_of_work.flush()
+    await unit_of_work.commit()
+
+    assert await profile_cache.get(mock_user.id) is None
+
+
+async def test_profile_is_kept_on_rollback(session, mock_user, profile_cache):
+    user_id = mock_user.id
+    await profile_cache.set(mock_user)
+    unit_of_work = UnitOfWork(session=session)
+    unit_of_work.on_commit(profile_cache.invalidate_changed)
+
+    mock_user.first_name = 'Jack'
+    await unit_of_work.flush()
+    await unit_of_work.rollback()
+
+    assert await profile_cache.get(user_id) is not None
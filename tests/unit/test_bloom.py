@@ -0,0 +1,15 @@
+from auth_service.core.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom_filter = BloomFilter(capacity=10_000, error_rate=0.01)
+    phones = [f'4854{i:07d}' for i in range(10_000)]
+    for phone in phones:
+        bloom_filter.add(phone)
+
+    false_positives = sum(f'3854{i:07d}' in bloom_filter for i in range(10_000))
+
+    assert all(phone in bloom_filter for phone in phones)
+    assert false_positives < 200
+    assert bloom_filter.hash_count == 7
+    assert bloom_filter.nbytes == 11_982
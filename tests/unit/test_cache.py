@@ -0,0 +1,36 @@
+from auth_service.core.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_ttl_cache_expires_entries_no_later_than_deadline(timer):
+    cache = TTLCache(maxsize=10, ttl=60, timer=timer)
+    cache.set('short', 1, expires_at=timer.now + 5)
+    cache.set('long', 2, expires_at=timer.now + 600)
+
+    timer.now += 5
+    assert cache.get('short') is None
+    assert cache.get('long') == 2
+
+    timer.now += 55
+    assert cache.get('long') is None
+
+
+def test_ttl_cache_stats():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
@@ -0,0 +1,35 @@
+from sqlalchemy import (
+    insert,
+    select,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from auth_service.core.config import settings
+from auth_service.core.database import (
+    RoutingSession,
+    async_engine,
+    replica_set,
+)
+from auth_service.models import User
+
+
+def test_routing_session(monkeypatch):
+    replica = create_async_engine(settings.async_database_url)
+    monkeypatch.setattr(replica_set, 'choose', lambda: replica)
+    session = RoutingSession()
+
+    assert session.get_bind(clause=select(User)) is async_engine.sync_engine
+    assert session.get_bind(clause=select(User).execution_options(use_replica=True)) is replica.sync_engine
+    assert session.replica_bind(select(User).execution_options(use_replica=True)) is replica.sync_engine
+    assert session.get_bind(clause=select(User), bind=replica.sync_engine) is replica.sync_engine
+
+    assert session.get_bind(clause=insert(User)) is async_engine.sync_engine
+    assert session.get_bind(clause=select(User).execution_options(use_replica=True)) is async_engine.sync_engine
+    assert session.replica_bind(select(User).execution_options(use_replica=True)) is None
+
+
+def test_routing_session_falls_back_to_primary_without_healthy_replicas(monkeypatch):
+    monkeypatch.setattr(replica_set, 'choose', lambda: None)
+    session = RoutingSession()
+
+    assert session.get_bind(clause=select(User).execution_options(use_replica=True)) is async_engine.sync_engine
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+from auth_service.core.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsDirectory,
+    MetricsRegistry,
+    timed,
+)
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.register(Counter('requests_total', 'Requests.', ['status']))
+    registry.register(Gauge('pool_size', 'Pool size.', callback=lambda: 5))
+    latency = registry.register(Histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0)))
+
+    requests.inc(status=200)
+    requests.inc(status=200)
+    latency.observe(0.1)
+    latency.observe(0.5)
+    latency.observe(2)
+
+    assert registry.render().splitlines() == [
+        '# HELP requests_total Requests.',
+        '# TYPE requests_total counter',
+        'requests_total{status="200"} 2.0',
+        '# HELP pool_size Pool size.',
+        '# TYPE pool_size gauge',
+        'pool_size 5.0',
+        '# HELP latency_seconds Latency.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        'latency_seconds_sum 2.6',
+        'latency_seconds_count 3',
+    ]
+
+
+def test_timed_observes_sync_and_async_functions():
+    histogram = Histogram('duration_seconds', 'Duration.', ['operation'])
+
+    @timed(histogram, operation='sync')
+    def sync_func():
+        return 1
+
+    @timed(histogram, operation='async')
+    async def async_func():
+        return 2
+
+    assert sync_func() == 1
+    assert asyncio.run(async_func()) == 2
+    assert histogram.count(operation='sync') == 1
+    assert histogram.count(operation='async') == 1
+
+
+def test_metrics_directory_renders_all_live_workers(tmp_path):
+    registry = MetricsRegistry()
+    requests = registry.register(Counter('requests_total', 'Requests.', ['status']))
+    requests.inc(status=200)
+    directory = MetricsDirectory(registry, path=str(tmp_path), interval=1)
+    other_worker = os.getppid()
+    (tmp_path / f'{other_worker}.json').write_text(
+        json.dumps({'requests_total': [f'requests_total{{status="200",worker="{other_worker}"}} 3.0']})
+    )
+    exited_worker = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'], capture_output=True)
+    (tmp_path / f'{int(exited_worker.stdout)}.json').write_text(json.dumps({'requests_total': ['stale 1.0']}))
+
+    lines = directory.render().splitlines()
+
+    assert lines[:2] == ['# HELP requests_total Requests.', '# TYPE requests_total counter']
+    assert sorted(lines[2:]) == sorted(
+        [
+            f'requests_total{{status="200",worker="{os.getpid()}"}} 1.0',
+            f'requests_total{{status="200",worker="{other_worker}"}} 3.0',
+        ]
+    )
+    assert sorted(file.name for file in tmp_path.iterdir()) == sorted([f'{os.getpid()}.json', f'{other_worker}.json'])
@@ -0,0 +1,62 @@
+import pytest
+
+from auth_service.core.rate_limit import (
+    InMemoryCounterStore,
+    Lockout,
+    SlidingWindowLimiter,
+)
+
+
+@pytest.mark.parametrize('timer', [6000.0], indirect=True)
+async def test_sliding_window_limiter_weights_previous_window(timer):
+    store = InMemoryCounterStore(shards=4, maxsize=100, timer=timer)
+    limiter = SlidingWindowLimiter(store=store, name='test', limit=4, window=60, timer=timer)
+
+    assert [await limiter.hit('key') for _ in range(4)] == [None] * 4
+    assert await limiter.hit('key') == 60
+    assert await limiter.hit('other-key') is None
+
+    # Half of the previous window's 5 hits still counts: 2.5 + 1 is allowed, 2.5 + 2 is not.
+    timer.now += 90
+    assert await limiter.hit('key') is None
+    assert await limiter.hit('key') == 30
+
+
+@pytest.mark.parametrize('timer', [6000.0], indirect=True)
+async def test_lockout_doubles_after_threshold_and_resets(timer):
+    store = InMemoryCounterStore(shards=4, maxsize=100, timer=timer)
+    lockout = Lockout(
+        store=store,
+        name='test',
+        threshold=2,
+        base_duration=10,
+        max_duration=25,
+        reset_after=3600,
+        timer=timer,
+    )
+
+    await lockout.record_failure('key')
+    assert await lockout.retry_after('key') is None
+
+    await lockout.record_failure('key')
+    assert await lockout.retry_after('key') == 10
+    await lockout.record_failure('key')
+    assert await lockout.retry_after('key') == 20
+    await lockout.record_failure('key')
+    assert await lockout.retry_after('key') == 25
+
+    timer.now += 25
+    assert await lockout.retry_after('key') is None
+
+    await lockout.reset('key')
+    await lockout.record_failure('key')
+    assert await lockout.retry_after('key') is None
+
+
+async def test_in_memory_counter_store_is_bounded_per_shard():
+    store = InMemoryCounterStore(shards=2, maxsize=4)
+
+    for i in range(100):
+        await store.increment(f'key-{i}', ttl=60)
+
+    assert sum(len(shard) for shard in store._shards) <= 4
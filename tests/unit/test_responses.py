@@ -0,0 +1,37 @@
+import json
+import uuid
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+
+from auth_service.core.responses import PydanticJSONResponse
+from auth_service.schemas.http.auth import TokenPairSchema
+from auth_service.schemas.http.users import UserSchema
+
+
+def test_pydantic_json_response_matches_json_response():
+    content = {'details': 'Телефон уже зареєстрований', 'error_code': None, 'count': 1}
+
+    assert PydanticJSONResponse(content).body == JSONResponse(content).body
+
+
+def test_pydantic_json_response_renders_models():
+    now = datetime(2026, 1, 2, 3, 4, 5)
+    user = UserSchema(
+        id=uuid.uuid4(),
+        phone='48547475446',
+        first_name='John',
+        last_name='Wilson',
+        is_active=True,
+        is_phone_verified=False,
+        created_at=now,
+        updated_at=now,
+    )
+    token_pair = TokenPairSchema.model_construct(access_token='access', refresh_token='refresh')
+
+    assert json.loads(PydanticJSONResponse(user).body) == user.model_dump(mode='json')
+    assert json.loads(PydanticJSONResponse(token_pair).body) == {
+        'access_token': 'access',
+        'refresh_token': 'refresh',
+        'token_type': 'bearer',
+    }
@@ -0,0 +1,34 @@
+import uuid
+
+from auth_service.core.revocation import RevokedJtiSet
+
+
+def test_revoked_jti_set_contains_added_jtis(timer):
+    revoked = RevokedJtiSet(timer=timer)
+    jti = uuid.uuid4()
+
+    revoked.add(jti, exp=1100)
+
+    assert jti in revoked
+    assert uuid.uuid4() not in revoked
+
+
+def test_revoked_jti_set_drops_jtis_after_their_tokens_expire(timer):
+    revoked = RevokedJtiSet(bucket_seconds=10, timer=timer)
+    short_lived, long_lived = uuid.uuid4(), uuid.uuid4()
+    revoked.add(short_lived, exp=1015)
+    revoked.add(long_lived, exp=1300)
+
+    timer.now = 1030
+
+    assert short_lived not in revoked
+    assert long_lived in revoked
+    assert len(revoked) == 1
+
+
+def test_revoked_jti_set_ignores_already_expired_tokens(timer):
+    revoked = RevokedJtiSet(bucket_seconds=10, timer=timer)
+
+    revoked.add(uuid.uuid4(), exp=900)
+
+    assert len(revoked) == 0
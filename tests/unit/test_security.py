@@ -0,0 +1,106 @@
+import asyncio
+import time
+import uuid
+
+import jwt
+import pytest
+
+from auth_service.core.errors import ServiceOverloadedError
+from auth_service.core.executors import BoundedProcessExecutor
+from auth_service.core.security import (
+    access_token_cache,
+    create_access_token,
+    decode_access_token,
+    evict_access_token,
+    hash_password_async,
+    make_password_context,
+    revoke_access_token,
+    verify_and_update_password,
+    verify_password_async,
+)
+
+
+async def test_hash_and_verify_password_async():
+    hashed_password = await hash_password_async('Pwd12345!')
+
+    assert await verify_password_async('Pwd12345!', hashed_password)
+    assert not await verify_password_async('pWd12345!', hashed_password)
+
+
+def test_verify_and_update_password_rehashes_outdated_hashes():
+    pytest.importorskip('argon2')
+    bcrypt_context = make_password_context(
+        scheme='bcrypt', bcrypt_rounds=4, argon2_time_cost=1, argon2_memory_cost=1024, argon2_parallelism=1
+    )
+    argon2_context = make_password_context(
+        scheme='argon2', bcrypt_rounds=4, argon2_time_cost=1, argon2_memory_cost=1024, argon2_parallelism=1
+    )
+    bcrypt_hash = bcrypt_context.hash('Pwd12345!')
+
+    verified, new_hash = argon2_context.verify_and_update('Pwd12345!', bcrypt_hash)
+
+    assert verified
+    assert new_hash.startswith('$argon2id$')
+    assert argon2_context.verify_and_update('Pwd12345!', new_hash) == (True, None)
+    assert verify_and_update_password('Pwd12345!', bcrypt_hash)[1].startswith('$2b$12$')
+    assert verify_and_update_password('pWd12345!', bcrypt_hash) == (False, None)
+
+
+async def test_bounded_process_executor_rejects_when_backlog_is_full():
+    executor = BoundedProcessExecutor(workers=1, queue_size=0, retry_after=3)
+    try:
+        task = asyncio.create_task(executor.run(time.sleep, 0.5))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            await executor.run(time.sleep, 0)
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {'Retry-After': '3'}
+        await task
+    finally:
+        executor.shutdown()
+
+
+async def test_bounded_process_executor_waits_for_a_free_slot():
+    executor = BoundedProcessExecutor(workers=1, queue_size=0, wait=True)
+    try:
+        first = asyncio.create_task(executor.run(time.sleep, 0.2))
+        await asyncio.sleep(0)
+
+        await executor.run(time.sleep, 0)
+
+        assert first.done()
+    finally:
+        executor.shutdown()
+
+
+def test_decode_access_token_is_served_from_cache():
+    user_id = uuid.uuid4()
+    token = create_access_token(user_id=user_id)
+    hits = access_token_cache.hits
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first.sub == second.sub == user_id
+    assert access_token_cache.hits == hits + 1
+
+
+def test_evict_access_token_drops_cached_token():
+    token = create_access_token(user_id=uuid.uuid4())
+    jwt_token = decode_access_token(token)
+
+    evict_access_token(jwt_token.jti)
+
+    assert access_token_cache.get(token) is None
+
+
+def test_decode_access_token_rejects_revoked_tokens():
+    token = create_access_token(user_id=uuid.uuid4())
+    payload = decode_access_token(token)
+
+    revoke_access_token(jti=payload.jti, exp=payload.exp)
+
+    with pytest.raises(jwt.InvalidTokenError):
+        decode_access_token(token)
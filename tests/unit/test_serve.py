@@ -0,0 +1,13 @@
+from auth_service.serve import (
+    build_config,
+    parse_args,
+)
+
+
+def test_client_address_is_taken_from_trusted_proxies_only(monkeypatch):
+    monkeypatch.setattr('sys.argv', ['serve', '--forwarded-allow-ips', '10.0.0.0/8,192.168.1.1'])
+
+    config = build_config(parse_args())
+
+    assert config.proxy_headers
+    assert config.forwarded_allow_ips == ['10.0.0.0/8', '192.168.1.1']
@@ -0,0 +1,79 @@
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import (
+    ec,
+    ed25519,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+
+from auth_service.core.signing_keys import JwtKeySet
+
+
+def make_private_key_pem(private_key) -> str:
+    return private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()).decode()
+
+
+def make_public_key_pem(private_key) -> str:
+    return private_key.public_key().public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo).decode()
+
+
+@pytest.mark.parametrize(
+    'private_key, algorithm',
+    [
+        (ed25519.Ed25519PrivateKey.generate(), 'EdDSA'),
+        (ec.generate_private_key(ec.SECP256R1()), 'ES256'),
+    ],
+)
+def test_signed_token_verifies_offline_against_jwks(private_key, algorithm):
+    key_set = JwtKeySet(secret='secret', signing_key=make_private_key_pem(private_key))
+
+    token = key_set.sign({'sub': 'user'})
+
+    assert jwt.get_unverified_header(token) == {'alg': algorithm, 'kid': key_set.kid, 'typ': 'JWT'}
+    jwk_set = jwt.PyJWKSet.from_json(key_set.jwks_json.decode())
+    signing_key = jwk_set[key_set.kid]
+    assert jwt.decode(token, signing_key.key, algorithms=[signing_key.algorithm_name]) == {'sub': 'user'}
+
+
+def test_rotated_key_stays_valid_while_published():
+    old_key = ed25519.Ed25519PrivateKey.generate()
+    old_key_set = JwtKeySet(secret='secret', signing_key=make_private_key_pem(old_key))
+    old_token = old_key_set.sign({'sub': 'user'})
+
+    key_set = JwtKeySet(
+        secret='secret',
+        signing_key=make_private_key_pem(ed25519.Ed25519PrivateKey.generate()),
+        public_keys=[make_public_key_pem(old_key)],
+    )
+
+    assert key_set.verification_key(old_token).kid == old_key_set.kid
+    assert {key['kid'] for key in json.loads(key_set.jwks_json)['keys']} == {key_set.kid, old_key_set.kid}
+    assert key_set.jwks_etag != old_key_set.jwks_etag
+
+
+def test_verification_rejects_unknown_and_secret_keys():
+    key_set = JwtKeySet(secret='secret', signing_key=make_private_key_pem(ed25519.Ed25519PrivateKey.generate()))
+    unknown_key_set = JwtKeySet(
+        secret='secret',
+        signing_key=make_private_key_pem(ed25519.Ed25519PrivateKey.generate()),
+    )
+
+    with pytest.raises(jwt.InvalidTokenError):
+        key_set.verification_key(unknown_key_set.sign({'sub': 'user'}))
+    with pytest.raises(jwt.InvalidTokenError):
+        key_set.verification_key(JwtKeySet(secret='secret').sign({'sub': 'user'}))
+
+
+def test_secret_key_set_publishes_nothing():
+    key_set = JwtKeySet(secret='secret')
+    token = key_set.sign({'sub': 'user'})
+
+    assert json.loads(key_set.jwks_json) == {'keys': []}
+    assert key_set.verification_key(token).algorithm == 'HS256'
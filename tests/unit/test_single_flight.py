@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from auth_service.core.single_flight import SingleFlight
+
+
+async def test_single_flight_shares_concurrent_calls():
+    single_flight = SingleFlight(timeout=1)
+    calls = 0
+
+    async def func() -> int:
+        nonlocal calls
+        calls += 1
+        call = calls
+        await asyncio.sleep(0.01)
+        return call
+
+    results = await asyncio.gather(*(single_flight.do('key', func) for _ in range(5)), single_flight.do('other', func))
+
+    assert results == [1, 1, 1, 1, 1, 2]
+    assert single_flight.coalesced == 4
+    assert len(single_flight) == 0
+
+
+async def test_single_flight_waiter_runs_own_call_after_timeout():
+    single_flight = SingleFlight(timeout=0.01)
+    release = asyncio.Event()
+
+    async def slow() -> str:
+        await release.wait()
+        return 'slow'
+
+    async def fast() -> str:
+        return 'fast'
+
+    leader = asyncio.create_task(single_flight.do('key', slow))
+    await asyncio.sleep(0)
+
+    assert await single_flight.do('key', fast) == 'fast'
+    assert single_flight.timeouts == 1
+    release.set()
+    assert await leader == 'slow'
+
+
+async def test_single_flight_waiters_retry_when_leader_fails():
+    single_flight = SingleFlight(timeout=1)
+
+    async def failing() -> str:
+        await asyncio.sleep(0.01)
+        raise RuntimeError('connection lost')
+
+    async def succeeding() -> str:
+        return 'ok'
+
+    leader = asyncio.create_task(single_flight.do('key', failing))
+    await asyncio.sleep(0)
+
+    assert await single_flight.do('key', succeeding) == 'ok'
+    with pytest.raises(RuntimeError):
+        await leader
+    assert single_flight.coalesced == 0